@@ -65,21 +65,13 @@ NET_MESSAGE_ON_RECEIVED             41
 CONSOLE_ON_COMMAND                  42
 ]]
 
-local callback_constants = {
-    "ON_LOAD", "POST_LOAD", "ON_STEP", "PRE_STEP", "POST_STEP",
-    "ON_DRAW", "PRE_HUD_DRAW", "ON_HUD_DRAW", "POST_HUD_DRAW", "CAMERA_ON_VIEW_CAMERA_UPDATE",
-    "ON_SCREEN_REFRESH", "ON_GAME_START", "ON_GAME_END", "ON_DIRECTOR_POPULATE_SPAWN_ARRAYS",
-    "ON_STAGE_START", "ON_SECOND", "ON_MINUTE", "ON_ATTACK_CREATE", "ON_ATTACK_HIT", "ON_ATTACK_HANDLE_START",
-    "ON_ATTACK_HANDLE_END", "ON_DAMAGE_BLOCKED", "ON_ENEMY_INIT", "ON_ELITE_INIT", "ON_DEATH", "ON_PLAYER_INIT", "ON_PLAYER_STEP",
-    "PRE_PLAYER_HUD_DRAW", "ON_PLAYER_HUD_DRAW", "ON_PLAYER_INVENTORY_UPDATE", "ON_PLAYER_DEATH",
-    "ON_CHECKPOINT_RESPAWN", "ON_INPUT_PLAYER_DEVICE_UPDATE", "ON_PICKUP_COLLECTED", "ON_PICKUP_ROLL", "ON_EQUIPMENT_USE", "POST_EQUIPMENT_USE", "ON_INTERACTABLE_ACTIVATE",
-    "ON_HIT_PROC", "ON_DAMAGED_PROC", "ON_KILL_PROC",
-    "NET_MESSAGE_ON_RECEIVED", "CONSOLE_ON_COMMAND"
-}
+-- (Compiled from "core/data/callback_constants.txt" with `tools/compile_data.py`)
+local data = require(PATH.."core/data/compiled.lua")
+local callback_constants = data.callback_constants
 
 -- Add to Callback directly (e.g., Callback.ON_DEATH)
-for i, v in ipairs(callback_constants) do
-    Callback[v] = i - 1
+for name, id in pairs(data.callback_ids) do
+    Callback[name] = id
 end
 
 
@@ -101,16 +93,6 @@ ON_SHIELD_RESTORE   10002
 ON_SKILL_ACTIVATE   10003
 ON_EQUIPMENT_SWAP   10004
 ]]
-local custom_callbacks = {
-    "ON_HEAL",
-    "ON_SHIELD_BREAK",
-    "ON_SHIELD_RESTORE",
-    "ON_SKILL_ACTIVATE",
-    "ON_EQUIPMENT_SWAP",
-}
-for i, v in ipairs(custom_callbacks) do
-    Callback[v] = Callback.CUSTOM_START + i - 1
-end
 
 
 
@@ -159,7 +141,7 @@ Property | Type | Description
 Callback.internal.populate = function()
     local class_callback = Global.class_callback
 
-    for num_id, name in ipairs(callback_constants) do
+    for num_id, _ in ipairs(callback_constants) do
         -- Generate list of argument types for each callback
         local arg_types = class_callback:get(num_id - 1):get(2)
         callback_arg_types[num_id - 1] = {}
@@ -168,20 +150,12 @@ Callback.internal.populate = function()
         end
 
         -- Populate find cache with vanilla callbacks
-        local identifier = name:lower()
-        while true do
-            local pos = identifier:find("_")
-            if not pos then break end
-
-            -- E.g., ON_STAGE_START -> onStageStart
-            identifier = identifier:sub(1, pos - 1)..identifier:sub(pos + 1, pos + 1):upper()..identifier:sub(pos + 2, -1)
-        end
-
+        -- E.g., ON_STAGE_START -> onStageStart
         __callback_find_cache:set(
             {
                 wrapper = Callback.wrap_type(num_id - 1),
             },
-            identifier,
+            data.callback_identifiers[num_id],
             "ror",
             num_id - 1
         )
@@ -3,6 +3,17 @@
 --[[
 Allows for accessing content class arrays via `Class.<class>`.
 (E.g., `Class.Item`)
+
+---
+
+`find_all` of a content class scans every element when filtering by a non-namespace property.
+If a property is filtered by often, `<class>.index_property(property)` makes `find_all`
+look it up in an index instead (e.g., `Item.index_property(Item.Property.TIER)`).
+
+An index is only refreshed when that property is set through a wrapper (e.g., `item.tier = ...`)
+or new content of the class is added, so only index properties that are not changed in other ways
+(e.g., through `item.array`, `Global.class_*` arrays, or by the game itself, like `Achievement.Property.PROGRESS`).
+`<class>.index_property(property, false)` goes back to scanning.
 ]]
 
 Class = new_class()
@@ -13,14 +24,11 @@ Class = new_class()
 
 -- Mappings for RAPI class name
 -- to global name and vice versa
-local file = toml.decodeFromFile(path.combine(PATH, "core/data/class_name_mapping.txt"))
+-- (Compiled from "core/data" with `tools/compile_data.py`)
+local data = require(PATH.."core/data/compiled.lua")
 
-local class_name_r2g = file.mapping   -- RAPI   -> Global
-local class_name_g2r = {}             -- Global -> RAPI
-
-for name_rapi, name_global in pairs(class_name_r2g) do
-    class_name_g2r[name_global] = name_rapi
-end
+local class_name_r2g = data.class_name_r2g    -- RAPI   -> Global
+local class_name_g2r = data.class_name_g2r    -- Global -> RAPI
 
 
 
@@ -71,6 +79,29 @@ run_once(function()
 end)
 
 
+-- Opt-in secondary indexes for `find_all` with a non-namespace property
+-- (see `index_property`)
+-- indexed_properties[name_global][property] = true
+-- property_indexes[name_global][property] = { [value] = {wrapper, ...} }
+-- Each is built on the first query of an indexed property, and
+-- dropped when the property is set through a wrapper or new content is added
+-- (writes to the class arrays themselves are not tracked, which is why indexing is opt-in)
+local indexed_properties = {}
+local property_indexes = {}
+
+for name_global, _ in pairs(class_name_g2r) do
+    indexed_properties[name_global] = {}
+    property_indexes[name_global] = {}
+end
+
+-- Filter values that can be used as index keys
+local indexable = {
+    number  = true,
+    string  = true,
+    boolean = true
+}
+
+
 -- Detect if new content is added and add to find cache
 -- All vanilla content is added through these as well
 local hooks = {
@@ -115,6 +146,9 @@ for _, hook in ipairs(hooks) do
                 namespace,
                 id
             )
+
+            -- Existing indexes do not include the new content
+            property_indexes[name_global] = {}
         end
     end)
 end
@@ -139,11 +173,6 @@ end
 -- Additionally, modify `methods_class[<RAPI name>]` for instance methods
 
 
--- Load property names from data
-local file = toml.decodeFromFile(PATH.."core/data/class_array.txt")
-local properties = file.array
-
-
 -- Create new class table for every content class
 methods_content_class = {}
 
@@ -156,13 +185,14 @@ for name_rapi, name_global in pairs(class_name_r2g) do
     local metatable_name = "metatable_"..name_rapi
 
 
-    -- Create enum `Property` from "class_array.txt"
-    local enum = {}
-    for k, v in pairs(properties[name_global]) do
-        enum[k:upper()] = v -- e.g., Item.Property.NAMESPACE = 0
-        enum[v] = k         -- e.g., Item.Property[0] = "namespace"; don't capitalize property name here
-    end
-    class_table.Property = enum
+    -- Enum `Property` from "class_array.txt"
+    -- e.g., Item.Property.NAMESPACE = 0
+    --       Item.Property[0] = "namespace"; property name is not capitalized here
+    class_table.Property = data.class_properties[name_global]
+
+    -- Lowercase property name -> array index (e.g., name = 2)
+    -- Used by the getter and setter, which fall back to `Property` for other casings
+    local accessors = data.class_accessors[name_global]
 
 
     -- `new` (placeholder)
@@ -192,21 +222,56 @@ for name_rapi, name_global in pairs(class_name_r2g) do
         end
 
 
-        -- Other filter (very slow!)
+        -- Other filter
         local elements = {}
         local find_cache = __class_find_caches[name_global]
 
-        for id = 0, #find_cache - 1 do
-            local element_table = find_cache:get(id)
-            if element_table.array:get(property) == filter then
-                table.insert(elements, element_table.wrapper)
+        -- Scan every element unless the property is indexed
+        -- and the filter can be an index key (e.g., not nil or a table)
+        if not (indexed_properties[name_global][property] and indexable[type(filter)]) then
+            for id = 0, #find_cache - 1 do
+                local element_table = find_cache:get(id)
+                if element_table.array:get(property) == filter then
+                    table.insert(elements, element_table.wrapper)
+                end
             end
+            return elements
+        end
+
+        -- Build index of the property if it does not exist
+        local indexes = property_indexes[name_global]
+        local index = indexes[property]
+        if not index then
+            index = {}
+            for id = 0, #find_cache - 1 do
+                local element_table = find_cache:get(id)
+                local value = element_table.array:get(property)
+                if indexable[type(value)] and value == value then   -- NaN cannot be a key
+                    index[value] = index[value] or {}
+                    table.insert(index[value], element_table.wrapper)
+                end
+            end
+            indexes[property] = index
+        end
+
+        -- Copy so that the caller can modify the table
+        for i, wrapper in ipairs(index[filter] or {}) do
+            elements[i] = wrapper
         end
 
         return elements
     end
 
 
+    -- `index_property`
+    class_table.index_property = function(property, enabled)
+        if type(property) ~= "number" then log.error(name_rapi..".index_property: property should be a number (e.g., "..name_rapi..".Property.NAME)", 2) end
+        if enabled == nil then enabled = true end
+        indexed_properties[name_global][property] = enabled or nil
+        property_indexes[name_global][property] = nil
+    end
+
+
     -- `wrap`
     class_table.wrap = function(value)
         -- Input:   number
@@ -245,7 +310,7 @@ for name_rapi, name_global in pairs(class_name_r2g) do
 
             -- Getter
             if type(k) == "string" then
-                local index = class_table.Property[k:upper()]
+                local index = accessors[k] or class_table.Property[k:upper()]
                 if index then
                     return proxy.array:get(index)
                 end
@@ -264,9 +329,10 @@ for name_rapi, name_global in pairs(class_name_r2g) do
             
             -- Setter
             if type(k) == "string" then
-                local index = class_table.Property[k:upper()]
+                local index = accessors[k] or class_table.Property[k:upper()]
                 if index then
                     proxy.array:set(index, v)
+                    property_indexes[name_global][index] = nil
                     return
                 end
             end
@@ -53,15 +53,15 @@ table.insert(_rapi_initialize, function()
 
 
     -- Command chat logging sync
+    -- (Serializers compiled from "core/data/packets.txt" with `tools/compile_packets.py`)
+    local schema = require(PATH.."core/data/packets.lua").syncConsole
+
     packet_syncConsole = Packet.new(RAPI_NAMESPACE, "syncConsole")
     packet_syncConsole:set_serializers(
-        function(buffer, name, input)
-            buffer:write_string(name)
-            buffer:write_string(input)
-        end,
+        schema.serialize,
 
         function(buffer, player)
-            log_command_locally(buffer:read_string(), buffer:read_string())
+            log_command_locally(schema.deserialize(buffer))
         end
     )
 end)
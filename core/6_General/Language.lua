@@ -7,6 +7,12 @@ Lua files that will automatically be loaded in with the base language file.
 A file should return a translation token table,
 and should either be named `<language>.lua` or in a folder/subfolder `<language>`.
 
+Large folders can be compiled ahead of time with `tools/compile_language.py <folder>`,
+which writes one flat token table per language to `<folder>_compiled`
+(and reports tokens that are defined more than once);
+if that folder exists, it is loaded instead of the `language` folder,
+so it has to be compiled again after every change.
+
 Example:
 ```lua
 -- Example paths:
@@ -104,6 +110,20 @@ local function load_from_folder(folder_path)
     local language = gm._mod_language_getLanguageName()
     local language_map = Map.wrap(Global._language_map)
 
+    -- Load the flat token tables from `tools/compile_language.py` instead if they exist
+    -- (`<folder>_compiled/<language>.lua`, falling back to English like below)
+    local compiled_path = folder_path.."_compiled"
+    if path.exists(compiled_path) then
+        local file = path.combine(compiled_path, language..".lua")
+        if not path.exists(file) then file = path.combine(compiled_path, "english.lua") end
+        if path.exists(file) then
+            for token, text in pairs(require(file)) do
+                language_map:set(token, text)
+            end
+        end
+        return
+    end
+
     local eng_tables = {}
     local found = false
 
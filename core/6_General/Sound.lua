@@ -46,26 +46,18 @@ Sound.internal.initialize = function()
     end
     
     -- `play_synced`
+    -- (Serializers compiled from "core/data/packets.txt" with `tools/compile_packets.py`)
+    local schema = require(PATH.."core/data/packets.lua").syncSound
+
     packet_syncSound = Packet.new(RAPI_NAMESPACE, "syncSound")
     packet_syncSound:set_serializers(
-        function(buffer, identifier, namespace, x, y, volume, pitch)
-            buffer:write_string(identifier)
-            buffer:write_string(namespace)
-            buffer:write_int(x)
-            buffer:write_int(y)
-            buffer:write_half(volume)
-            buffer:write_half(pitch)
-        end,
+        schema.serialize,
 
         function(buffer, player)
-            local sound = Sound.find(buffer:read_string(), buffer:read_string(), true)
+            local identifier, namespace, x, y, volume, pitch = schema.deserialize(buffer)
+            local sound = Sound.find(identifier, namespace, true)
             if sound then
-                sound:play(
-                    buffer:read_int(),
-                    buffer:read_int(),
-                    buffer:read_half(),
-                    buffer:read_half()
-                )
+                sound:play(x, y, volume, pitch)
             end
         end
     )
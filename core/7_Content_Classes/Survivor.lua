@@ -509,6 +509,8 @@ Util.table_append(methods_content_class["Survivor"], {
 
     **Vanilla skins**
     The modified vanilla palettes that ReturnsAPI uses can be found in `ReturnsAPI-ReturnsAPI/core/sprites`.
+    E.g., the loadout palette of Commando (one column per skin):
+    @image sprites/loadout_palettes/commandoPaletteLoadout.png
     ]]
     add_skin = function(self, identifiers, palette, palette_portrait, palette_loadout, paint_color)
         Initialize.internal.check_if_started("add_skin")
@@ -99,18 +99,15 @@ local explosion_mask_height = gm.sprite_get_height(explosion_mask)
 
 
 table.insert(_rapi_initialize, function()
+    -- (Serializers compiled from "core/data/packets.txt" with `tools/compile_packets.py`)
+    local schema = require(PATH.."core/data/packets.lua").syncBuffStack
+
     packet_syncBuffStack = Packet.new(RAPI_NAMESPACE, "syncBuffStack")
     packet_syncBuffStack:set_serializers(
-        function(buffer, actor, buff, count)
-            buffer:write_instance(actor)
-            buffer:write_ushort(buff)
-            buffer:write_ushort(count)
-        end,
+        schema.serialize,
 
         function(buffer, player)
-            local actor = buffer:read_instance()
-            local buff  = buffer:read_ushort()
-            local count = buffer:read_ushort()
+            local actor, buff, count = schema.deserialize(buffer)
 
             actor.buff_stack:set(buff, count)
             actor:queue_recalculate_stats()
@@ -0,0 +1,1159 @@
+-- ReturnsAPI compiled data
+-- Generated by tools/compile_data.py from core/data; do not edit
+-- sources: b4f0750ce40f176b6fc30eb1b5103a78b406b46eb6b8f27672a20d9d2eaeabe2
+
+return {
+    class_name_r2g = {
+        Achievement = "class_achievement",
+        ActorSkin = "class_actor_skin",
+        ActorState = "class_actor_state",
+        Artifact = "class_artifact",
+        Buff = "class_buff",
+        Difficulty = "class_difficulty",
+        Elite = "class_elite",
+        EndingType = "class_ending_type",
+        EnvironmentLog = "class_environment_log",
+        Equipment = "class_equipment",
+        GameMode = "class_game_mode",
+        InteractableCard = "class_interactable_card",
+        Item = "class_item",
+        ItemLog = "class_item_log",
+        MonsterCard = "class_monster_card",
+        MonsterLog = "class_monster_log",
+        Skill = "class_skill",
+        Stage = "class_stage",
+        Survivor = "class_survivor",
+        SurvivorLog = "class_survivor_log",
+    },
+    class_name_g2r = {
+        class_achievement = "Achievement",
+        class_actor_skin = "ActorSkin",
+        class_actor_state = "ActorState",
+        class_artifact = "Artifact",
+        class_buff = "Buff",
+        class_difficulty = "Difficulty",
+        class_elite = "Elite",
+        class_ending_type = "EndingType",
+        class_environment_log = "EnvironmentLog",
+        class_equipment = "Equipment",
+        class_game_mode = "GameMode",
+        class_interactable_card = "InteractableCard",
+        class_item = "Item",
+        class_item_log = "ItemLog",
+        class_monster_card = "MonsterCard",
+        class_monster_log = "MonsterLog",
+        class_skill = "Skill",
+        class_stage = "Stage",
+        class_survivor = "Survivor",
+        class_survivor_log = "SurvivorLog",
+    },
+    class_properties = {
+        class_achievement = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_DESC = 3,
+            TOKEN_DESC2 = 4,
+            TOKEN_UNLOCK_NAME = 5,
+            UNLOCK_KIND = 6,
+            UNLOCK_ID = 7,
+            SPRITE_ID = 8,
+            SPRITE_SUBIMAGE = 9,
+            SPRITE_SCALE = 10,
+            SPRITE_SCALE_INGAME = 11,
+            IS_HIDDEN = 12,
+            IS_TRIAL = 13,
+            IS_SERVER_AUTHORATIVE = 14,
+            MILESTONE_ALT_UNLOCK = 15,
+            MILESTONE_SURVIVOR = 16,
+            PROGRESS = 17,
+            UNLOCKED = 18,
+            PARENT_ID = 19,
+            PROGRESS_NEEDED = 20,
+            DEATH_RESET = 21,
+            GROUP = 22,
+            ON_COMPLETED = 23,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_desc",
+            [4] = "token_desc2",
+            [5] = "token_unlock_name",
+            [6] = "unlock_kind",
+            [7] = "unlock_id",
+            [8] = "sprite_id",
+            [9] = "sprite_subimage",
+            [10] = "sprite_scale",
+            [11] = "sprite_scale_ingame",
+            [12] = "is_hidden",
+            [13] = "is_trial",
+            [14] = "is_server_authorative",
+            [15] = "milestone_alt_unlock",
+            [16] = "milestone_survivor",
+            [17] = "progress",
+            [18] = "unlocked",
+            [19] = "parent_id",
+            [20] = "progress_needed",
+            [21] = "death_reset",
+            [22] = "group",
+            [23] = "on_completed",
+        },
+        class_actor_skin = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            EFFECT_DISPLAY = 2,
+            DRAW_LOADOUT_PREVIEW = 3,
+            GET_SKIN_SPRITE = 4,
+            DRAW_SKINNABLE_INSTANCE = 5,
+            SKIN_TYPE_INDEX = 6,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "effect_display",
+            [3] = "draw_loadout_preview",
+            [4] = "get_skin_sprite",
+            [5] = "draw_skinnable_instance",
+            [6] = "skin_type_index",
+        },
+        class_actor_state = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            ON_ENTER = 2,
+            ON_EXIT = 3,
+            ON_STEP = 4,
+            ON_GET_INTERRUPT_PRIORITY = 5,
+            CALLABLE_SERIALIZE = 6,
+            CALLABLE_DESERIALIZE = 7,
+            IS_SKILL_STATE = 8,
+            IS_CLIMB_STATE = 9,
+            ACTIVITY_FLAGS = 10,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "on_enter",
+            [3] = "on_exit",
+            [4] = "on_step",
+            [5] = "on_get_interrupt_priority",
+            [6] = "callable_serialize",
+            [7] = "callable_deserialize",
+            [8] = "is_skill_state",
+            [9] = "is_climb_state",
+            [10] = "activity_flags",
+        },
+        class_artifact = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_PICKUP_NAME = 3,
+            TOKEN_DESCRIPTION = 4,
+            SPRITE_LOADOUT_ID = 5,
+            SPRITE_PICKUP_ID = 6,
+            ON_SET_ACTIVE = 7,
+            ACTIVE = 8,
+            ACHIEVEMENT_ID = 9,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_pickup_name",
+            [4] = "token_description",
+            [5] = "sprite_loadout_id",
+            [6] = "sprite_pickup_id",
+            [7] = "on_set_active",
+            [8] = "active",
+            [9] = "achievement_id",
+        },
+        class_buff = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            SHOW_ICON = 2,
+            ICON_SPRITE = 3,
+            ICON_SUBIMAGE = 4,
+            ICON_FRAME_SPEED = 5,
+            ICON_STACK_SUBIMAGE = 6,
+            DRAW_STACK_NUMBER = 7,
+            STACK_NUMBER_COL = 8,
+            MAX_STACK = 9,
+            ON_APPLY = 10,
+            ON_REMOVE = 11,
+            ON_STEP = 12,
+            IS_TIMED = 13,
+            IS_DEBUFF = 14,
+            CLIENT_HANDLES_REMOVAL = 15,
+            EFFECT_DISPLAY = 16,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "show_icon",
+            [3] = "icon_sprite",
+            [4] = "icon_subimage",
+            [5] = "icon_frame_speed",
+            [6] = "icon_stack_subimage",
+            [7] = "draw_stack_number",
+            [8] = "stack_number_col",
+            [9] = "max_stack",
+            [10] = "on_apply",
+            [11] = "on_remove",
+            [12] = "on_step",
+            [13] = "is_timed",
+            [14] = "is_debuff",
+            [15] = "client_handles_removal",
+            [16] = "effect_display",
+        },
+        class_difficulty = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_DESCRIPTION = 3,
+            SPRITE_ID = 4,
+            SPRITE_LOADOUT_ID = 5,
+            PRIMARY_COLOR = 6,
+            SOUND_ID = 7,
+            DIFF_SCALE = 8,
+            GENERAL_SCALE = 9,
+            POINT_SCALE = 10,
+            IS_MONSOON_OR_HIGHER = 11,
+            ALLOW_BLIGHT_SPAWNS = 12,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_description",
+            [4] = "sprite_id",
+            [5] = "sprite_loadout_id",
+            [6] = "primary_color",
+            [7] = "sound_id",
+            [8] = "diff_scale",
+            [9] = "general_scale",
+            [10] = "point_scale",
+            [11] = "is_monsoon_or_higher",
+            [12] = "allow_blight_spawns",
+        },
+        class_elite = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            PALETTE = 3,
+            BLEND_COL = 4,
+            HEALTHBAR_ICON = 5,
+            EFFECT_DISPLAY = 6,
+            ON_APPLY = 7,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "palette",
+            [4] = "blend_col",
+            [5] = "healthbar_icon",
+            [6] = "effect_display",
+            [7] = "on_apply",
+        },
+        class_ending_type = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            PRIMARY_COLOR = 2,
+            IS_VICTORY = 3,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "primary_color",
+            [3] = "is_victory",
+        },
+        class_environment_log = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_STORY = 3,
+            STAGE_ID = 4,
+            DISPLAY_ROOM_IDS = 5,
+            INITIAL_CAM_X_1080 = 6,
+            INITIAL_CAM_Y_1080 = 7,
+            INITIAL_CAM_X_720 = 8,
+            INITIAL_CAM_Y_720 = 9,
+            INITIAL_CAM_ALT_X_1080 = 10,
+            INITIAL_CAM_ALT_Y_1080 = 11,
+            INITIAL_CAM_ALT_X_720 = 12,
+            INITIAL_CAM_ALT_Y_720 = 13,
+            IS_SECRET = 14,
+            SPR_ICON = 15,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_story",
+            [4] = "stage_id",
+            [5] = "display_room_ids",
+            [6] = "initial_cam_x_1080",
+            [7] = "initial_cam_y_1080",
+            [8] = "initial_cam_x_720",
+            [9] = "initial_cam_y_720",
+            [10] = "initial_cam_alt_x_1080",
+            [11] = "initial_cam_alt_y_1080",
+            [12] = "initial_cam_alt_x_720",
+            [13] = "initial_cam_alt_y_720",
+            [14] = "is_secret",
+            [15] = "spr_icon",
+        },
+        class_equipment = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_TEXT = 3,
+            ON_USE = 4,
+            COOLDOWN = 5,
+            TIER = 6,
+            SPRITE_ID = 7,
+            OBJECT_ID = 8,
+            ITEM_LOG_ID = 9,
+            ACHIEVEMENT_ID = 10,
+            EFFECT_DISPLAY = 11,
+            LOOT_TAGS = 12,
+            IS_NEW_EQUIPMENT = 13,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_text",
+            [4] = "on_use",
+            [5] = "cooldown",
+            [6] = "tier",
+            [7] = "sprite_id",
+            [8] = "object_id",
+            [9] = "item_log_id",
+            [10] = "achievement_id",
+            [11] = "effect_display",
+            [12] = "loot_tags",
+            [13] = "is_new_equipment",
+        },
+        class_game_mode = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            COUNT_NORMAL_UNLOCKS = 2,
+            COUNT_TOWARDS_GAMES_PLAYED = 3,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "count_normal_unlocks",
+            [3] = "count_towards_games_played",
+        },
+        class_interactable_card = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            SPAWN_COST = 2,
+            SPAWN_WEIGHT = 3,
+            OBJECT_ID = 4,
+            REQUIRED_TILE_SPACE = 5,
+            SPAWN_WITH_SACRIFICE = 6,
+            IS_NEW_INTERACTABLE = 7,
+            DEFAULT_SPAWN_RARITY_OVERRIDE = 8,
+            DECREASE_WEIGHT_ON_SPAWN = 9,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "spawn_cost",
+            [3] = "spawn_weight",
+            [4] = "object_id",
+            [5] = "required_tile_space",
+            [6] = "spawn_with_sacrifice",
+            [7] = "is_new_interactable",
+            [8] = "default_spawn_rarity_override",
+            [9] = "decrease_weight_on_spawn",
+        },
+        class_item = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_TEXT = 3,
+            ON_ACQUIRED = 4,
+            ON_REMOVED = 5,
+            TIER = 6,
+            SPRITE_ID = 7,
+            OBJECT_ID = 8,
+            ITEM_LOG_ID = 9,
+            ACHIEVEMENT_ID = 10,
+            IS_HIDDEN = 11,
+            EFFECT_DISPLAY = 12,
+            ACTOR_COMPONENT = 13,
+            LOOT_TAGS = 14,
+            IS_NEW_ITEM = 15,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_text",
+            [4] = "on_acquired",
+            [5] = "on_removed",
+            [6] = "tier",
+            [7] = "sprite_id",
+            [8] = "object_id",
+            [9] = "item_log_id",
+            [10] = "achievement_id",
+            [11] = "is_hidden",
+            [12] = "effect_display",
+            [13] = "actor_component",
+            [14] = "loot_tags",
+            [15] = "is_new_item",
+        },
+        class_item_log = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_DESCRIPTION = 3,
+            TOKEN_STORY = 4,
+            TOKEN_DATE = 5,
+            TOKEN_DESTINATION = 6,
+            TOKEN_PRIORITY = 7,
+            PICKUP_OBJECT_ID = 8,
+            SPRITE_ID = 9,
+            GROUP = 10,
+            ACHIEVEMENT_ID = 11,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_description",
+            [4] = "token_story",
+            [5] = "token_date",
+            [6] = "token_destination",
+            [7] = "token_priority",
+            [8] = "pickup_object_id",
+            [9] = "sprite_id",
+            [10] = "group",
+            [11] = "achievement_id",
+        },
+        class_monster_card = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            SPAWN_TYPE = 2,
+            SPAWN_COST = 3,
+            OBJECT_ID = 4,
+            IS_BOSS = 5,
+            IS_NEW_ENEMY = 6,
+            ELITE_LIST = 7,
+            CAN_BE_BLIGHTED = 8,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "spawn_type",
+            [3] = "spawn_cost",
+            [4] = "object_id",
+            [5] = "is_boss",
+            [6] = "is_new_enemy",
+            [7] = "elite_list",
+            [8] = "can_be_blighted",
+        },
+        class_monster_log = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_STORY = 3,
+            SPRITE_ID = 4,
+            PORTRAIT_ID = 5,
+            PORTRAIT_INDEX = 6,
+            SPRITE_OFFSET_X = 7,
+            SPRITE_OFFSET_Y = 8,
+            SPRITE_FORCE_HORIZONTAL_ALIGN = 9,
+            SPRITE_HEIGHT_OFFSET = 10,
+            STAT_HP = 11,
+            STAT_DAMAGE = 12,
+            STAT_SPEED = 13,
+            LOG_BACKDROP_INDEX = 14,
+            OBJECT_ID = 15,
+            ENEMY_OBJECT_IDS_KILLS = 16,
+            ENEMY_OBJECT_IDS_DEATHS = 17,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_story",
+            [4] = "sprite_id",
+            [5] = "portrait_id",
+            [6] = "portrait_index",
+            [7] = "sprite_offset_x",
+            [8] = "sprite_offset_y",
+            [9] = "sprite_force_horizontal_align",
+            [10] = "sprite_height_offset",
+            [11] = "stat_hp",
+            [12] = "stat_damage",
+            [13] = "stat_speed",
+            [14] = "log_backdrop_index",
+            [15] = "object_id",
+            [16] = "enemy_object_ids_kills",
+            [17] = "enemy_object_ids_deaths",
+        },
+        class_skill = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_DESCRIPTION = 3,
+            SPRITE = 4,
+            SUBIMAGE = 5,
+            COOLDOWN = 6,
+            DAMAGE = 7,
+            MAX_STOCK = 8,
+            START_WITH_STOCK = 9,
+            AUTO_RESTOCK = 10,
+            REQUIRED_STOCK = 11,
+            REQUIRE_KEY_PRESS = 12,
+            ALLOW_BUFFERED_INPUT = 13,
+            USE_DELAY = 14,
+            ANIMATION = 15,
+            IS_UTILITY = 16,
+            IS_PRIMARY = 17,
+            REQUIRED_INTERRUPT_PRIORITY = 18,
+            HOLD_FACING_DIRECTION = 19,
+            OVERRIDE_STRAFE_DIRECTION = 20,
+            IGNORE_AIM_DIRECTION = 21,
+            DISABLE_AIM_STALL = 22,
+            DOES_CHANGE_ACTIVITY_STATE = 23,
+            ON_CAN_ACTIVATE = 24,
+            ON_ACTIVATE = 25,
+            ON_STEP = 26,
+            ON_EQUIPPED = 27,
+            ON_UNEQUIPPED = 28,
+            UPGRADE_SKILL = 29,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_description",
+            [4] = "sprite",
+            [5] = "subimage",
+            [6] = "cooldown",
+            [7] = "damage",
+            [8] = "max_stock",
+            [9] = "start_with_stock",
+            [10] = "auto_restock",
+            [11] = "required_stock",
+            [12] = "require_key_press",
+            [13] = "allow_buffered_input",
+            [14] = "use_delay",
+            [15] = "animation",
+            [16] = "is_utility",
+            [17] = "is_primary",
+            [18] = "required_interrupt_priority",
+            [19] = "hold_facing_direction",
+            [20] = "override_strafe_direction",
+            [21] = "ignore_aim_direction",
+            [22] = "disable_aim_stall",
+            [23] = "does_change_activity_state",
+            [24] = "on_can_activate",
+            [25] = "on_activate",
+            [26] = "on_step",
+            [27] = "on_equipped",
+            [28] = "on_unequipped",
+            [29] = "upgrade_skill",
+        },
+        class_stage = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_SUBNAME = 3,
+            SPAWN_ENEMIES = 4,
+            SPAWN_ENEMIES_LOOP = 5,
+            SPAWN_INTERACTABLES = 6,
+            SPAWN_INTERACTABLES_LOOP = 7,
+            SPAWN_INTERACTABLE_RARITY = 8,
+            INTERACTABLE_SPAWN_POINTS = 9,
+            ALLOW_MOUNTAIN_SHRINE_SPAWN = 10,
+            CLASSIC_VARIANT_COUNT = 11,
+            IS_NEW_STAGE = 12,
+            ROOM_LIST = 13,
+            MUSIC_ID = 14,
+            TELEPORTER_INDEX = 15,
+            POPULATE_BIOME_PROPERTIES = 16,
+            LOG_ID = 17,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_subname",
+            [4] = "spawn_enemies",
+            [5] = "spawn_enemies_loop",
+            [6] = "spawn_interactables",
+            [7] = "spawn_interactables_loop",
+            [8] = "spawn_interactable_rarity",
+            [9] = "interactable_spawn_points",
+            [10] = "allow_mountain_shrine_spawn",
+            [11] = "classic_variant_count",
+            [12] = "is_new_stage",
+            [13] = "room_list",
+            [14] = "music_id",
+            [15] = "teleporter_index",
+            [16] = "populate_biome_properties",
+            [17] = "log_id",
+        },
+        class_survivor = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_NAME_UPPER = 3,
+            TOKEN_DESCRIPTION = 4,
+            TOKEN_END_QUOTE = 5,
+            SKILL_FAMILY_Z = 6,
+            SKILL_FAMILY_X = 7,
+            SKILL_FAMILY_C = 8,
+            SKILL_FAMILY_V = 9,
+            SKIN_FAMILY = 10,
+            ALL_LOADOUT_FAMILIES = 11,
+            ALL_SKILL_FAMILIES = 12,
+            SPRITE_LOADOUT = 13,
+            SPRITE_TITLE = 14,
+            SPRITE_IDLE = 15,
+            SPRITE_PORTRAIT = 16,
+            SPRITE_PORTRAIT_SMALL = 17,
+            SPRITE_PALETTE = 18,
+            SPRITE_PORTRAIT_PALETTE = 19,
+            SPRITE_LOADOUT_PALETTE = 20,
+            SPRITE_CREDITS = 21,
+            PRIMARY_COLOR = 22,
+            SELECT_SOUND_ID = 23,
+            LOG_ID = 24,
+            ACHIEVEMENT_ID = 25,
+            MILESTONE_KILLS_1 = 26,
+            MILESTONE_ITEMS_1 = 27,
+            MILESTONE_STAGES_1 = 28,
+            ON_INIT = 29,
+            ON_STEP = 30,
+            ON_REMOVE = 31,
+            IS_SECRET = 32,
+            CAPE_OFFSET = 33,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_name_upper",
+            [4] = "token_description",
+            [5] = "token_end_quote",
+            [6] = "skill_family_z",
+            [7] = "skill_family_x",
+            [8] = "skill_family_c",
+            [9] = "skill_family_v",
+            [10] = "skin_family",
+            [11] = "all_loadout_families",
+            [12] = "all_skill_families",
+            [13] = "sprite_loadout",
+            [14] = "sprite_title",
+            [15] = "sprite_idle",
+            [16] = "sprite_portrait",
+            [17] = "sprite_portrait_small",
+            [18] = "sprite_palette",
+            [19] = "sprite_portrait_palette",
+            [20] = "sprite_loadout_palette",
+            [21] = "sprite_credits",
+            [22] = "primary_color",
+            [23] = "select_sound_id",
+            [24] = "log_id",
+            [25] = "achievement_id",
+            [26] = "milestone_kills_1",
+            [27] = "milestone_items_1",
+            [28] = "milestone_stages_1",
+            [29] = "on_init",
+            [30] = "on_step",
+            [31] = "on_remove",
+            [32] = "is_secret",
+            [33] = "cape_offset",
+        },
+        class_survivor_log = {
+            NAMESPACE = 0,
+            IDENTIFIER = 1,
+            TOKEN_NAME = 2,
+            TOKEN_STORY = 3,
+            TOKEN_ID = 4,
+            TOKEN_DEPARTED = 5,
+            TOKEN_ARRIVAL = 6,
+            SPRITE_ICON_ID = 7,
+            SPRITE_ID = 8,
+            PORTRAIT_ID = 9,
+            PORTRAIT_INDEX = 10,
+            STAT_HP_BASE = 11,
+            STAT_HP_LEVEL = 12,
+            STAT_DAMAGE_BASE = 13,
+            STAT_DAMAGE_LEVEL = 14,
+            STAT_REGEN_BASE = 15,
+            STAT_REGEN_LEVEL = 16,
+            STAT_ARMOR_BASE = 17,
+            STAT_ARMOR_LEVEL = 18,
+            SURVIVOR_ID = 19,
+            [0] = "namespace",
+            [1] = "identifier",
+            [2] = "token_name",
+            [3] = "token_story",
+            [4] = "token_id",
+            [5] = "token_departed",
+            [6] = "token_arrival",
+            [7] = "sprite_icon_id",
+            [8] = "sprite_id",
+            [9] = "portrait_id",
+            [10] = "portrait_index",
+            [11] = "stat_hp_base",
+            [12] = "stat_hp_level",
+            [13] = "stat_damage_base",
+            [14] = "stat_damage_level",
+            [15] = "stat_regen_base",
+            [16] = "stat_regen_level",
+            [17] = "stat_armor_base",
+            [18] = "stat_armor_level",
+            [19] = "survivor_id",
+        },
+    },
+    class_accessors = {
+        class_achievement = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_desc = 3,
+            token_desc2 = 4,
+            token_unlock_name = 5,
+            unlock_kind = 6,
+            unlock_id = 7,
+            sprite_id = 8,
+            sprite_subimage = 9,
+            sprite_scale = 10,
+            sprite_scale_ingame = 11,
+            is_hidden = 12,
+            is_trial = 13,
+            is_server_authorative = 14,
+            milestone_alt_unlock = 15,
+            milestone_survivor = 16,
+            progress = 17,
+            unlocked = 18,
+            parent_id = 19,
+            progress_needed = 20,
+            death_reset = 21,
+            group = 22,
+            on_completed = 23,
+        },
+        class_actor_skin = {
+            namespace = 0,
+            identifier = 1,
+            effect_display = 2,
+            draw_loadout_preview = 3,
+            get_skin_sprite = 4,
+            draw_skinnable_instance = 5,
+            skin_type_index = 6,
+        },
+        class_actor_state = {
+            namespace = 0,
+            identifier = 1,
+            on_enter = 2,
+            on_exit = 3,
+            on_step = 4,
+            on_get_interrupt_priority = 5,
+            callable_serialize = 6,
+            callable_deserialize = 7,
+            is_skill_state = 8,
+            is_climb_state = 9,
+            activity_flags = 10,
+        },
+        class_artifact = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_pickup_name = 3,
+            token_description = 4,
+            sprite_loadout_id = 5,
+            sprite_pickup_id = 6,
+            on_set_active = 7,
+            active = 8,
+            achievement_id = 9,
+        },
+        class_buff = {
+            namespace = 0,
+            identifier = 1,
+            show_icon = 2,
+            icon_sprite = 3,
+            icon_subimage = 4,
+            icon_frame_speed = 5,
+            icon_stack_subimage = 6,
+            draw_stack_number = 7,
+            stack_number_col = 8,
+            max_stack = 9,
+            on_apply = 10,
+            on_remove = 11,
+            on_step = 12,
+            is_timed = 13,
+            is_debuff = 14,
+            client_handles_removal = 15,
+            effect_display = 16,
+        },
+        class_difficulty = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_description = 3,
+            sprite_id = 4,
+            sprite_loadout_id = 5,
+            primary_color = 6,
+            sound_id = 7,
+            diff_scale = 8,
+            general_scale = 9,
+            point_scale = 10,
+            is_monsoon_or_higher = 11,
+            allow_blight_spawns = 12,
+        },
+        class_elite = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            palette = 3,
+            blend_col = 4,
+            healthbar_icon = 5,
+            effect_display = 6,
+            on_apply = 7,
+        },
+        class_ending_type = {
+            namespace = 0,
+            identifier = 1,
+            primary_color = 2,
+            is_victory = 3,
+        },
+        class_environment_log = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_story = 3,
+            stage_id = 4,
+            display_room_ids = 5,
+            initial_cam_x_1080 = 6,
+            initial_cam_y_1080 = 7,
+            initial_cam_x_720 = 8,
+            initial_cam_y_720 = 9,
+            initial_cam_alt_x_1080 = 10,
+            initial_cam_alt_y_1080 = 11,
+            initial_cam_alt_x_720 = 12,
+            initial_cam_alt_y_720 = 13,
+            is_secret = 14,
+            spr_icon = 15,
+        },
+        class_equipment = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_text = 3,
+            on_use = 4,
+            cooldown = 5,
+            tier = 6,
+            sprite_id = 7,
+            object_id = 8,
+            item_log_id = 9,
+            achievement_id = 10,
+            effect_display = 11,
+            loot_tags = 12,
+            is_new_equipment = 13,
+        },
+        class_game_mode = {
+            namespace = 0,
+            identifier = 1,
+            count_normal_unlocks = 2,
+            count_towards_games_played = 3,
+        },
+        class_interactable_card = {
+            namespace = 0,
+            identifier = 1,
+            spawn_cost = 2,
+            spawn_weight = 3,
+            object_id = 4,
+            required_tile_space = 5,
+            spawn_with_sacrifice = 6,
+            is_new_interactable = 7,
+            default_spawn_rarity_override = 8,
+            decrease_weight_on_spawn = 9,
+        },
+        class_item = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_text = 3,
+            on_acquired = 4,
+            on_removed = 5,
+            tier = 6,
+            sprite_id = 7,
+            object_id = 8,
+            item_log_id = 9,
+            achievement_id = 10,
+            is_hidden = 11,
+            effect_display = 12,
+            actor_component = 13,
+            loot_tags = 14,
+            is_new_item = 15,
+        },
+        class_item_log = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_description = 3,
+            token_story = 4,
+            token_date = 5,
+            token_destination = 6,
+            token_priority = 7,
+            pickup_object_id = 8,
+            sprite_id = 9,
+            group = 10,
+            achievement_id = 11,
+        },
+        class_monster_card = {
+            namespace = 0,
+            identifier = 1,
+            spawn_type = 2,
+            spawn_cost = 3,
+            object_id = 4,
+            is_boss = 5,
+            is_new_enemy = 6,
+            elite_list = 7,
+            can_be_blighted = 8,
+        },
+        class_monster_log = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_story = 3,
+            sprite_id = 4,
+            portrait_id = 5,
+            portrait_index = 6,
+            sprite_offset_x = 7,
+            sprite_offset_y = 8,
+            sprite_force_horizontal_align = 9,
+            sprite_height_offset = 10,
+            stat_hp = 11,
+            stat_damage = 12,
+            stat_speed = 13,
+            log_backdrop_index = 14,
+            object_id = 15,
+            enemy_object_ids_kills = 16,
+            enemy_object_ids_deaths = 17,
+        },
+        class_skill = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_description = 3,
+            sprite = 4,
+            subimage = 5,
+            cooldown = 6,
+            damage = 7,
+            max_stock = 8,
+            start_with_stock = 9,
+            auto_restock = 10,
+            required_stock = 11,
+            require_key_press = 12,
+            allow_buffered_input = 13,
+            use_delay = 14,
+            animation = 15,
+            is_utility = 16,
+            is_primary = 17,
+            required_interrupt_priority = 18,
+            hold_facing_direction = 19,
+            override_strafe_direction = 20,
+            ignore_aim_direction = 21,
+            disable_aim_stall = 22,
+            does_change_activity_state = 23,
+            on_can_activate = 24,
+            on_activate = 25,
+            on_step = 26,
+            on_equipped = 27,
+            on_unequipped = 28,
+            upgrade_skill = 29,
+        },
+        class_stage = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_subname = 3,
+            spawn_enemies = 4,
+            spawn_enemies_loop = 5,
+            spawn_interactables = 6,
+            spawn_interactables_loop = 7,
+            spawn_interactable_rarity = 8,
+            interactable_spawn_points = 9,
+            allow_mountain_shrine_spawn = 10,
+            classic_variant_count = 11,
+            is_new_stage = 12,
+            room_list = 13,
+            music_id = 14,
+            teleporter_index = 15,
+            populate_biome_properties = 16,
+            log_id = 17,
+        },
+        class_survivor = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_name_upper = 3,
+            token_description = 4,
+            token_end_quote = 5,
+            skill_family_z = 6,
+            skill_family_x = 7,
+            skill_family_c = 8,
+            skill_family_v = 9,
+            skin_family = 10,
+            all_loadout_families = 11,
+            all_skill_families = 12,
+            sprite_loadout = 13,
+            sprite_title = 14,
+            sprite_idle = 15,
+            sprite_portrait = 16,
+            sprite_portrait_small = 17,
+            sprite_palette = 18,
+            sprite_portrait_palette = 19,
+            sprite_loadout_palette = 20,
+            sprite_credits = 21,
+            primary_color = 22,
+            select_sound_id = 23,
+            log_id = 24,
+            achievement_id = 25,
+            milestone_kills_1 = 26,
+            milestone_items_1 = 27,
+            milestone_stages_1 = 28,
+            on_init = 29,
+            on_step = 30,
+            on_remove = 31,
+            is_secret = 32,
+            cape_offset = 33,
+        },
+        class_survivor_log = {
+            namespace = 0,
+            identifier = 1,
+            token_name = 2,
+            token_story = 3,
+            token_id = 4,
+            token_departed = 5,
+            token_arrival = 6,
+            sprite_icon_id = 7,
+            sprite_id = 8,
+            portrait_id = 9,
+            portrait_index = 10,
+            stat_hp_base = 11,
+            stat_hp_level = 12,
+            stat_damage_base = 13,
+            stat_damage_level = 14,
+            stat_regen_base = 15,
+            stat_regen_level = 16,
+            stat_armor_base = 17,
+            stat_armor_level = 18,
+            survivor_id = 19,
+        },
+    },
+    callback_constants = {
+        "ON_LOAD",
+        "POST_LOAD",
+        "ON_STEP",
+        "PRE_STEP",
+        "POST_STEP",
+        "ON_DRAW",
+        "PRE_HUD_DRAW",
+        "ON_HUD_DRAW",
+        "POST_HUD_DRAW",
+        "CAMERA_ON_VIEW_CAMERA_UPDATE",
+        "ON_SCREEN_REFRESH",
+        "ON_GAME_START",
+        "ON_GAME_END",
+        "ON_DIRECTOR_POPULATE_SPAWN_ARRAYS",
+        "ON_STAGE_START",
+        "ON_SECOND",
+        "ON_MINUTE",
+        "ON_ATTACK_CREATE",
+        "ON_ATTACK_HIT",
+        "ON_ATTACK_HANDLE_START",
+        "ON_ATTACK_HANDLE_END",
+        "ON_DAMAGE_BLOCKED",
+        "ON_ENEMY_INIT",
+        "ON_ELITE_INIT",
+        "ON_DEATH",
+        "ON_PLAYER_INIT",
+        "ON_PLAYER_STEP",
+        "PRE_PLAYER_HUD_DRAW",
+        "ON_PLAYER_HUD_DRAW",
+        "ON_PLAYER_INVENTORY_UPDATE",
+        "ON_PLAYER_DEATH",
+        "ON_CHECKPOINT_RESPAWN",
+        "ON_INPUT_PLAYER_DEVICE_UPDATE",
+        "ON_PICKUP_COLLECTED",
+        "ON_PICKUP_ROLL",
+        "ON_EQUIPMENT_USE",
+        "POST_EQUIPMENT_USE",
+        "ON_INTERACTABLE_ACTIVATE",
+        "ON_HIT_PROC",
+        "ON_DAMAGED_PROC",
+        "ON_KILL_PROC",
+        "NET_MESSAGE_ON_RECEIVED",
+        "CONSOLE_ON_COMMAND",
+    },
+    callback_identifiers = {
+        "onLoad",
+        "postLoad",
+        "onStep",
+        "preStep",
+        "postStep",
+        "onDraw",
+        "preHudDraw",
+        "onHudDraw",
+        "postHudDraw",
+        "cameraOnViewCameraUpdate",
+        "onScreenRefresh",
+        "onGameStart",
+        "onGameEnd",
+        "onDirectorPopulateSpawnArrays",
+        "onStageStart",
+        "onSecond",
+        "onMinute",
+        "onAttackCreate",
+        "onAttackHit",
+        "onAttackHandleStart",
+        "onAttackHandleEnd",
+        "onDamageBlocked",
+        "onEnemyInit",
+        "onEliteInit",
+        "onDeath",
+        "onPlayerInit",
+        "onPlayerStep",
+        "prePlayerHudDraw",
+        "onPlayerHudDraw",
+        "onPlayerInventoryUpdate",
+        "onPlayerDeath",
+        "onCheckpointRespawn",
+        "onInputPlayerDeviceUpdate",
+        "onPickupCollected",
+        "onPickupRoll",
+        "onEquipmentUse",
+        "postEquipmentUse",
+        "onInteractableActivate",
+        "onHitProc",
+        "onDamagedProc",
+        "onKillProc",
+        "netMessageOnReceived",
+        "consoleOnCommand",
+    },
+    callback_ids = {
+        ON_LOAD = 0,
+        POST_LOAD = 1,
+        ON_STEP = 2,
+        PRE_STEP = 3,
+        POST_STEP = 4,
+        ON_DRAW = 5,
+        PRE_HUD_DRAW = 6,
+        ON_HUD_DRAW = 7,
+        POST_HUD_DRAW = 8,
+        CAMERA_ON_VIEW_CAMERA_UPDATE = 9,
+        ON_SCREEN_REFRESH = 10,
+        ON_GAME_START = 11,
+        ON_GAME_END = 12,
+        ON_DIRECTOR_POPULATE_SPAWN_ARRAYS = 13,
+        ON_STAGE_START = 14,
+        ON_SECOND = 15,
+        ON_MINUTE = 16,
+        ON_ATTACK_CREATE = 17,
+        ON_ATTACK_HIT = 18,
+        ON_ATTACK_HANDLE_START = 19,
+        ON_ATTACK_HANDLE_END = 20,
+        ON_DAMAGE_BLOCKED = 21,
+        ON_ENEMY_INIT = 22,
+        ON_ELITE_INIT = 23,
+        ON_DEATH = 24,
+        ON_PLAYER_INIT = 25,
+        ON_PLAYER_STEP = 26,
+        PRE_PLAYER_HUD_DRAW = 27,
+        ON_PLAYER_HUD_DRAW = 28,
+        ON_PLAYER_INVENTORY_UPDATE = 29,
+        ON_PLAYER_DEATH = 30,
+        ON_CHECKPOINT_RESPAWN = 31,
+        ON_INPUT_PLAYER_DEVICE_UPDATE = 32,
+        ON_PICKUP_COLLECTED = 33,
+        ON_PICKUP_ROLL = 34,
+        ON_EQUIPMENT_USE = 35,
+        POST_EQUIPMENT_USE = 36,
+        ON_INTERACTABLE_ACTIVATE = 37,
+        ON_HIT_PROC = 38,
+        ON_DAMAGED_PROC = 39,
+        ON_KILL_PROC = 40,
+        NET_MESSAGE_ON_RECEIVED = 41,
+        CONSOLE_ON_COMMAND = 42,
+        ON_HEAL = 10000,
+        ON_SHIELD_BREAK = 10001,
+        ON_SHIELD_RESTORE = 10002,
+        ON_SKILL_ACTIVATE = 10003,
+        ON_EQUIPMENT_SWAP = 10004,
+    },
+}
@@ -0,0 +1,68 @@
+-- ReturnsAPI packet serializers
+-- Generated by tools/compile_packets.py from core/data/packets.txt; do not edit
+-- sources: 0c629fa11cc0c732a525f8341b5108195db88a34d5642d1fee343a94024837e2
+
+-- `serialize(buffer, <fields>)` and `deserialize(buffer) -> <fields>` for each packet
+-- `max_size` is the worst-case size of the fields in bytes (`nil` if unbounded or not known);
+-- `serialize` raises an error for strings longer than their `max_length`
+
+return {
+    syncBuffStack = {
+        -- actor: instance, buff: ushort, count: ushort
+        max_size = nil,
+        serialize = function(buffer, actor, buff, count)
+            local buffer_id = buffer.value
+            gm.write_instance_direct(buffer_id, Wrap.unwrap(actor))
+            gm.writeushort_direct(buffer_id, Wrap.unwrap(buff))
+            gm.writeushort_direct(buffer_id, Wrap.unwrap(count))
+        end,
+        deserialize = function(buffer)
+            local buffer_id = buffer.value
+            local actor = Instance.wrap(gm.read_instance_direct(buffer_id))
+            local buff = Wrap.wrap(gm.readushort_direct(buffer_id))
+            local count = Wrap.wrap(gm.readushort_direct(buffer_id))
+            return actor, buff, count
+        end,
+    },
+    syncConsole = {
+        -- name: string, input: string
+        max_size = nil,
+        serialize = function(buffer, name, input)
+            if #name > 64 then log.error("syncConsole: 'name' is longer than 64 bytes") end
+            local buffer_id = buffer.value
+            gm.writestring_direct(buffer_id, Wrap.unwrap(name))
+            gm.writestring_direct(buffer_id, Wrap.unwrap(input))
+        end,
+        deserialize = function(buffer)
+            local buffer_id = buffer.value
+            local name = Wrap.wrap(gm.readstring_direct(buffer_id))
+            local input = Wrap.wrap(gm.readstring_direct(buffer_id))
+            return name, input
+        end,
+    },
+    syncSound = {
+        -- identifier: string, namespace: string, x: int, y: int, volume: half, pitch: half
+        max_size = 270,
+        serialize = function(buffer, identifier, namespace, x, y, volume, pitch)
+            if #identifier > 128 then log.error("syncSound: 'identifier' is longer than 128 bytes") end
+            if #namespace > 128 then log.error("syncSound: 'namespace' is longer than 128 bytes") end
+            local buffer_id = buffer.value
+            gm.writestring_direct(buffer_id, Wrap.unwrap(identifier))
+            gm.writestring_direct(buffer_id, Wrap.unwrap(namespace))
+            gm.writeint_direct(buffer_id, Wrap.unwrap(x))
+            gm.writeint_direct(buffer_id, Wrap.unwrap(y))
+            gm.writehalf_direct(buffer_id, Wrap.unwrap(volume))
+            gm.writehalf_direct(buffer_id, Wrap.unwrap(pitch))
+        end,
+        deserialize = function(buffer)
+            local buffer_id = buffer.value
+            local identifier = Wrap.wrap(gm.readstring_direct(buffer_id))
+            local namespace = Wrap.wrap(gm.readstring_direct(buffer_id))
+            local x = Wrap.wrap(gm.readint_direct(buffer_id))
+            local y = Wrap.wrap(gm.readint_direct(buffer_id))
+            local volume = Wrap.wrap(gm.readhalf_direct(buffer_id))
+            local pitch = Wrap.wrap(gm.readhalf_direct(buffer_id))
+            return identifier, namespace, x, y, volume, pitch
+        end,
+    },
+}
@@ -0,0 +1,92 @@
+--[[
+Palette Strips
+Exports the baked-in survivor sprites (default, `_PAL<n>`, and `_PROV`)
+as strips of their subimages, saved to AppData/Roaming/Risk_of_Rain_Returns;
+the palettes in `core/sprites/*_palettes` are built from these offline
+with `tools/palettes.py build <directory of strips>`
+
+Replaces `palette_generator.lua`, which built the palettes in-game
+by reading every pixel with `gm.surface_getpixel` (VERY slow)
+]]
+
+local function export(name)
+    local spr = gm.constants[name]
+    if not spr then return false end
+
+    local sprite = Sprite.wrap(spr)
+    local w      = sprite.width
+    local h      = sprite.height
+    local imgs   = sprite.subimages
+
+    -- Draw every subimage side by side
+    local surf = gm.surface_create(w * imgs, h)
+    gm.surface_set_target(surf)
+    gm.draw_clear_alpha(0, 0)
+    for img = 0, imgs - 1 do
+        gm.draw_sprite(spr, img, w * img, 0)
+    end
+    gm.surface_reset_target()
+
+    gm.surface_save(surf, name..".png")
+    gm.surface_free(surf)
+    return true
+end
+
+local function export_all(resource, chars)
+    for _, char in ipairs(chars) do
+        local name = resource:gsub("%$", char)
+        if not export(name) then
+            print("'"..name.."' not found")
+        else
+            -- Every alt, including unused ones (`tools/palettes.py` skips those)
+            local count = 1
+            while export(name.."_PAL"..count) do count = count + 1 end
+            export(name.."_PROV")
+            print("Exported "..name.." ("..(count - 1).." alts)")
+        end
+    end
+end
+
+gui.add_to_menu_bar(function()
+    if ImGui.Button("Export loadout strips") then
+        export_all("sSelect$", {
+            "Commando",
+            "Huntress",
+            "Enforcer",
+            "Bandit",
+            "HAND",
+            "Engi",
+            "Miner",
+            "Sniper",
+            "Acrid",
+            "Mercenary",
+            "Loader",
+            "Chef",
+            "Pilot",
+            "Arti",
+            -- "Drifter",   -- Drifter is weird here; done manually
+            "Robomando",
+        })
+    end
+
+    if ImGui.Button("Export portrait strips") then
+        export_all("s$Portrait", {
+            "Commando",
+            "Huntress",
+            "Enforcer",
+            "Bandit",
+            "HAND",
+            "Engi",
+            "Miner",
+            "Sniper",
+            "Acrid",
+            "Merc",
+            "Loader",
+            "Chef",
+            "Pilot",
+            "Arti",
+            "Drifter",
+            "Robomando",
+        })
+    end
+end)
@@ -1,9 +1,19 @@
 -- Profiler
-
-local calls = {}
-local from = {}
-local call_index = 0
-local avg_of_n_frames = 30
+-- Counts `gm` calls per frame by script and calling file,
+-- and appends every frame to a dump file (analyze with `tools/profile_report.py`)
+--
+-- Dump format (one record per line):
+--     rapi-profile 1                   Header
+--     k <id> <script> <file>           New call site (`gm.<script>` called from <file>)
+--     <frame> <id>:<count> ...         Calls made during a frame (call sites without calls are left out)
+
+local dump_path = path.combine(paths.plugins_data(), "rapi_profile_"..os.time()..".txt")
+local flush_every = 60      -- Frames to buffer before writing to the dump
+
+local sites = {}            -- "<script> <file>" -> call site ID
+local counts = {}           -- Call site ID -> calls this frame
+local frame = 0
+local buffer = {"rapi-profile 1"}
 
 __real_gm = __real_gm or gm
 
@@ -12,73 +22,53 @@ gm = setmetatable({}, {
         if k == "constants"             then return __real_gm.constants end
         if k == "constant_types"        then return __real_gm.constant_types end
         if k == "constants_type_sorted" then return __real_gm.constants_type_sorted end
-
-        if not calls[k] then
-            calls[k] = {}
-            for i = 0, avg_of_n_frames - 1 do
-                calls[k][i] = 0
-            end
-        end
+        if k == "CInstance"             then return __real_gm.CInstance end
 
         local info = debug.getinfo(2, "S")
         local filename = path.filename(info.short_src)
-        if not from[filename] then
-            from[filename] = {}
-            for i = 0, avg_of_n_frames - 1 do
-                from[filename][i] = 0
-            end
-        end
 
-        local call = calls[k]
-        local fr = from[filename]
+        -- Store call site if not encountered before
+        local site = k.." "..filename
+        local id = sites[site]
+        if not id then
+            id = #counts + 1
+            sites[site] = id
+            counts[id] = 0
+            table.insert(buffer, "k "..id.." "..site)
+        end
 
         return function(...)
-            call[call_index] = call[call_index] + 1
-            fr[call_index]   = fr[call_index] + 1
-
+            counts[id] = counts[id] + 1
             return __real_gm[k](...)
         end
     end
 })
 
-gm.post_script_hook(gm.constants.__input_system_tick, function()
-    call_index = (call_index + 1) % avg_of_n_frames
-
-    for _, call in pairs(calls) do
-        call[call_index] = 0
-    end
-
-    for _, fr in pairs(from) do
-        fr[call_index] = 0
+local flush = function()
+    local file = io.open(dump_path, "a")
+    if not file then
+        log.warning("Profiler could not open "..dump_path)
+        return
     end
-end)
-
-local get_avg = function(k)
-    local call = calls[k]
-    if not call then return end
-    
-    local n = 0
-    for i = 0, avg_of_n_frames - 1 do
-        n = n + call[i]
-    end
-
-    return n / avg_of_n_frames
+    file:write(table.concat(buffer, "\n"), "\n")
+    file:close()
+    buffer = {}
 end
 
-local get_avg_from = function(k)
-    local fr = from[k]
-    if not fr then return end
-    
-    local n = 0
-    for i = 0, avg_of_n_frames - 1 do
-        n = n + fr[i]
+gm.post_script_hook(gm.constants.__input_system_tick, function()
+    -- Record calls of the frame that just ended
+    local record = {frame}
+    for id = 1, #counts do
+        local n = counts[id]
+        if n > 0 then
+            table.insert(record, id..":"..n)
+            counts[id] = 0
+        end
     end
+    table.insert(buffer, table.concat(record, " "))
 
-    return n / avg_of_n_frames
-end
+    frame = frame + 1
+    if frame % flush_every == 0 then flush() end
+end)
 
-gm.post_script_hook(gm.constants.__input_system_tick, function()
-    -- testing
-    print(get_avg("variable_global_get"))
-    print(get_avg_from("Global.lua"))
-end)
\ No newline at end of file
+print("Profiler writing to "..dump_path)
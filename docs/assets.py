@@ -0,0 +1,103 @@
+# Image Assets
+# Copies the images referenced by `@image` into the output,
+# named by content hash and losslessly re-compressed
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+import png
+
+global ASSET_VERSION; ASSET_VERSION = 1     # Bump whenever `process` would give different bytes
+global MAX_IMAGE_SIDE; MAX_IMAGE_SIDE = 1024    # Longer images are downscaled
+
+# `![<alt>](@image/<path relative to core>)`, as written by `parse_line`
+IMAGE_MARKER = "@image/"
+IMAGE_PATTERN = re.compile(r"\]\(" + re.escape(IMAGE_MARKER) + r"([^)\s]+)\)")
+
+
+
+def find_images(docs):
+    """
+    Yields the path of every image referenced in the docs of a source
+    """
+    for section in docs["sections"].values():
+        for element in section:
+            lines = list(element.text or [])
+            for signature in getattr(element, "signatures", ()):
+                lines.extend(p.text for p in signature.params + signature.optional)
+
+            for line in lines:
+                if IMAGE_MARKER in line:
+                    for m in IMAGE_PATTERN.finditer(line):
+                        yield m.group(1)
+
+
+
+def process(data, extension):
+    if extension == ".png":
+        return png.optimize(data, MAX_IMAGE_SIDE)
+    return data
+
+
+
+class AssetStore():
+    """
+    Image assets of the wiki
+
+    Each image is named by the hash of its bytes (so an image referenced
+    from several pages, or under several paths, is stored once), and the
+    processed image is cached under that name, so an unchanged image is
+    never processed again (even after the output directory is cleared)
+    """
+
+    def __init__(self, source_path, out_path, cache_path):
+        self.source_path = source_path
+        self.out_path = out_path
+        self.cache_path = cache_path
+        self.names = {}     # Path relative to `source_path` -> asset name (`None` if missing)
+
+
+    def add(self, path):
+        """
+        Adds the image (if not added already), and returns its asset name,
+        or `None` if there is no such image
+        """
+        if path in self.names:
+            return self.names[path]
+
+        file_path = os.path.join(self.source_path, *path.split("/"))
+        if not os.path.isfile(file_path):
+            self.names[path] = None
+            return None
+
+        with open(file_path, "rb") as f:
+            data = f.read()
+        extension = os.path.splitext(path)[1].lower()
+        name = hashlib.sha256(f"{ASSET_VERSION}\0".encode("utf-8") + data).hexdigest()[:16] + extension
+        self.names[path] = name
+
+        out = os.path.join(self.out_path, name)
+        if not os.path.isfile(out):
+            cached = os.path.join(self.cache_path, name)
+            if not os.path.isfile(cached):
+                write_atomic(cached, process(data, extension))
+            os.makedirs(self.out_path, exist_ok = True)
+            shutil.copyfile(cached, out)
+
+        return name
+
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    fd, temp_path = tempfile.mkstemp(suffix = ".tmp", dir = os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
@@ -0,0 +1,234 @@
+# Docs pipeline benchmark
+# Times each stage of the docs pipeline on synthetic corpora (see `corpus.py`),
+# and compares the results against a baseline
+#
+# Stage times are stored relative to a fixed calibration workload timed in the same run,
+# so that the baseline carries over between machines
+#
+# Usage: python docs/benchmark.py [--scales 10 100 1000] [--update-baseline]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import main as docs_main
+from corpus import DENSITY, write_corpus
+
+global BASELINE_PATH; BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+
+METRICS = ["parse_file", "parse_block", "parse_line", "generate", "peak_memory"]
+TIME_METRICS = ["parse_file", "parse_block", "parse_line", "generate"]
+
+BASELINE_UNITS = "stage times are multiples of the calibration workload (see `calibrate`); peak_memory is in bytes"
+
+
+
+class NullWriter():
+    """
+    Discards everything written to it
+    """
+
+    def write(self, chunk):
+        pass
+
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+
+
+def calibrate(repeat):
+    """
+    Returns the time (in seconds) of a fixed workload of the
+    string and dict operations that the pipeline spends its time on
+    """
+    def workload():
+        counts = {}
+        for i in range(200000):
+            word = f" word{i % 997} ".strip()
+            counts[word] = counts.get(word, 0) + len(word.split("d"))
+
+    return best_time(workload, repeat)
+
+
+
+def normalize(results, calibration):
+    """
+    Returns the results with each stage time divided by the calibration time
+    """
+    return {
+        scale: {metric: (value / calibration if metric in TIME_METRICS else value) for metric, value in metrics.items()}
+        for scale, metrics in results.items()
+    }
+
+
+
+def run(files, repeat = 3, density = None):
+    """
+    Returns the time (in seconds) of each stage and
+    the peak memory (in bytes) of the whole pipeline
+    for a corpus with the given number of files
+    """
+    with tempfile.TemporaryDirectory() as path:
+        sources = []
+        for file_path in write_corpus(path, files, density):
+            with open(file_path, "rb") as f:
+                sources.append((os.path.basename(file_path).split(".")[0], f.read()))
+
+    # Inputs of the individual stages
+    blocks = []
+    for filename, data in sources:
+        blocks.append(list(docs_main.split_blocks(docs_main.split_lines(data))))
+
+    # Record every line passed to `parse_line` while parsing
+    lines = []
+    parse_line = docs_main.parse_line
+    def recording_parse_line(line):
+        lines.append(line)
+        return parse_line(line)
+
+    docs_main.parse_line = recording_parse_line
+    try:
+        parsed = [(filename, docs_main.parse_file(data, filename)) for filename, data in sources]
+    finally:
+        docs_main.parse_line = parse_line
+
+
+    def stage_parse_file():
+        for filename, data in sources:
+            docs_main.parse_file(data, filename)
+
+    def stage_parse_block():
+        for file_blocks in blocks:
+            docs = docs_main.new_docs()
+            for block in file_blocks:
+                docs_main.parse_block(block, docs)
+
+    def stage_parse_line():
+        for line in lines:
+            docs_main.parse_line(line)
+
+    def stage_generate():
+        out = NullWriter()
+        for filename, docs in parsed:
+            docs_main.generate(docs, filename, out)
+
+
+    results = {
+        "parse_file"    : best_time(stage_parse_file, repeat),
+        "parse_block"   : best_time(stage_parse_block, repeat),
+        "parse_line"    : best_time(stage_parse_line, repeat),
+        "generate"      : best_time(stage_generate, repeat),
+    }
+
+    # Peak memory of parsing every file (keeping the docs, like the generator does)
+    # and generating every page; measured separately since tracing slows everything down
+    del parsed
+    tracemalloc.start()
+    kept = []
+    for filename, data in sources:
+        docs = docs_main.parse_file(data, filename)
+        docs_main.generate(docs, filename, NullWriter())
+        kept.append(docs)
+    results["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return results
+
+
+
+def compare(results, calibration, baseline, time_threshold, memory_threshold):
+    """
+    Prints each metric against the baseline (comparing
+    normalized times), and returns the list of regressions
+    """
+    regressions = []
+    relative = normalize(results, calibration)
+
+    for scale, metrics in results.items():
+        print(f"\n{scale} files")
+        for metric in METRICS:
+            value = metrics[metric]
+            base = baseline.get(scale, {}).get(metric)
+            unit = "MB" if metric == "peak_memory" else "ms"
+            scaled = value / 2**20 if metric == "peak_memory" else value * 1000
+
+            if not base:
+                print(f"    {metric:<14}{scaled:>12.2f} {unit}")
+                continue
+
+            threshold = memory_threshold if metric == "peak_memory" else time_threshold
+            change = (relative[scale][metric] / base) - 1
+            status = ""
+            if change > threshold:
+                status = "  REGRESSION"
+                regressions.append(f"{scale} files: {metric} {change:+.0%} (threshold {threshold:.0%})")
+            print(f"    {metric:<14}{scaled:>12.2f} {unit}  {change:+7.1%}{status}")
+
+    return regressions
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark the docs pipeline on synthetic corpora")
+    parser.add_argument("--scales", type = int, nargs = "+", default = [10, 100, 1000], metavar = "FILES", help = "corpus sizes to run (up to 10000)")
+    parser.add_argument("--density", nargs = "+", default = [], metavar = "KEY=VALUE", help = "override corpus densities (e.g., link=1 overload=0.5); the baseline only applies to the default densities")
+    parser.add_argument("--repeat", type = int, default = 3, help = "runs per stage (the best is kept)")
+    parser.add_argument("--baseline", default = BASELINE_PATH, help = "baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action = "store_true", help = "write the results to the baseline instead of comparing")
+    parser.add_argument("--time-threshold", type = float, default = 0.25, help = "allowed slowdown before failing (default: 0.25)")
+    parser.add_argument("--memory-threshold", type = float, default = 0.10, help = "allowed memory increase before failing (default: 0.10)")
+    args = parser.parse_args()
+
+    density = {}
+    for pair in args.density:
+        key, value = pair.split("=", 1)
+        if key not in DENSITY:
+            parser.error(f"unknown density '{key}'")
+        density[key] = float(value)
+
+    calibration = calibrate(args.repeat)
+    print(f"Calibration: {calibration * 1000:.2f} ms")
+
+    results = {}
+    for files in args.scales:
+        print(f"Running {files} files...")
+        results[str(files)] = run(files, args.repeat, density)
+
+    if args.update_baseline:
+        if density:
+            parser.error("the baseline must use the default densities")
+        with open(args.baseline, "w") as f:
+            json.dump({"units": BASELINE_UNITS, **normalize(results, calibration)}, f, indent = 4)
+            f.write("\n")
+        print(f"Wrote baseline to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.isfile(args.baseline) and not density:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    regressions = compare(results, calibration, baseline, args.time_threshold, args.memory_threshold)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print("    " + regression)
+        sys.exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Parsed Docs Cache
+
+import os
+import pickle
+import tempfile
+
+
+
+class DocsCache():
+    """
+    Stores the parsed docs of each source file on disk,
+    keyed by the content hash of the source and the parser version
+
+    This allows pages to be generated again (e.g., after changing
+    the layout in `generate`) without parsing any source files
+    """
+
+    def __init__(self, path, parser_version):
+        self.path = path
+        self.parser_version = parser_version
+
+
+    def file_path(self, key):
+        # e.g., "6_General/Class.lua" -> "6_General__Class.lua.pickle"
+        return os.path.join(self.path, key.replace("/", "__") + ".pickle")
+
+
+    def load(self, key, source_hash):
+        """
+        Returns the cached docs for the source,
+        or `None` if they are missing or out of date
+        """
+        path = self.file_path(key)
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+
+        if (entry.get("parser") != self.parser_version) or (entry.get("source") != source_hash):
+            return None
+        return entry["docs"]
+
+
+    def save(self, key, source_hash, docs):
+        entry = {
+            "parser" : self.parser_version,
+            "source" : source_hash,
+            "docs"   : docs
+        }
+
+        # Write to a temporary file first, so that
+        # a cache file is never left half-written
+        os.makedirs(self.path, exist_ok = True)
+        fd, temp_path = tempfile.mkstemp(suffix = ".tmp", dir = self.path)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.file_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
@@ -0,0 +1,136 @@
+# Synthetic corpus generator
+# Writes a `core`-style tree of Lua files with doc comments,
+# for benchmarking the docs pipeline
+#
+# Usage: python docs/corpus.py <output directory> [--files N] [--seed N]
+
+import argparse
+import os
+import random
+
+
+
+# Default density of each feature
+# (chance per element, or number per file)
+DENSITY = {
+    "methods"   : 20,       # Methods per file
+    "enums"     : 2,        # Enums per file
+    "overload"  : 0.25,     # Chance for a method to have an overload
+    "param"     : 2,        # Average @param count per signature
+    "optional"  : 0.5,      # Average @optional count per signature
+    "link"      : 0.3,      # Chance for a line of text to contain a @link
+    "multiline" : 3,        # Lines in each --[[ ]] block
+}
+
+TYPES = ["number", "string", "bool", "table", "function", "Item", "Actor", "Instance", "Color"]
+WORDS = ["the", "actor", "item", "value", "returns", "given", "instance", "of", "a", "to", "is", "with", "damage", "sprite", "namespace"]
+
+
+
+def write_corpus(path, files, density = None, seed = 0):
+    """
+    Writes `files` Lua files into numbered directories under `path`
+    (like `core`), and returns their paths
+    """
+    density = dict(DENSITY, **(density or {}))
+    rng = random.Random(seed)
+    paths = []
+
+    for i in range(files):
+        dir_path = os.path.join(path, f"{i // 100}_Dir")
+        os.makedirs(dir_path, exist_ok = True)
+
+        file_path = os.path.join(dir_path, f"Class{i}.lua")
+        with open(file_path, "w") as f:
+            f.write(generate_file(f"Class{i}", rng, density))
+        paths.append(file_path)
+
+    return paths
+
+
+
+def generate_file(name, rng, density):
+    out = [f"-- {name}\n\n{name} = new_class()\n\n"]
+
+    # Description
+    out.append(f"--[[\n{text(rng, density)}\n]]\n\n\n")
+
+    # Enums
+    out.append("\n-- ========== Enums ==========\n\n--@section Enums\n\n")
+    for e in range(chance_count(rng, density["enums"])):
+        out.append(f"--@enum\n{name}.Enum{e} = {{\n")
+        for v in range(rng.randint(2, 12)):
+            out.append(f"    VALUE_{v:<8}= {v},\n")
+        out.append("}\n\n\n")
+
+    # Methods
+    for section, keyword in (("Static Methods", "@static"), ("Instance Methods", "@instance")):
+        out.append(f"\n-- ========== {section} ==========\n\n--@section {section}\n\n")
+
+        for m in range(chance_count(rng, density["methods"] / 2)):
+            method = f"method_{keyword[1]}{m}"
+            out.append(f"--{keyword}\n")
+
+            for s in range(1 + (rng.random() < density["overload"])):
+                if s > 0:
+                    out.append("--@overload\n")
+                out.append(f"--@return  {rng.choice(TYPES)}\n")
+                for p in range(chance_count(rng, density["param"])):
+                    out.append(f"--@param   arg{p} | {rng.choice(TYPES)} | {sentence(rng, density)}\n")
+                for p in range(chance_count(rng, density["optional"])):
+                    out.append(f"--@optional opt{p} | {rng.choice(TYPES)} | {sentence(rng, density)}\n")
+
+            out.append(f"--[[\n{text(rng, density)}\n]]\n")
+
+            if keyword == "@static":
+                out.append(f"{name}.{method} = function(a, b)\n    return a\nend\n\n\n")
+            else:
+                out.append(f"methods_{name}.{method} = function(self, a)\n    return self\nend\n\n\n")
+
+    return "".join(out)
+
+
+
+def chance_count(rng, average):
+    """
+    Returns a random count with the given average
+    """
+    count = int(average)
+    if rng.random() < (average - count):
+        count += 1
+    return count
+
+
+
+def sentence(rng, density):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 10))]
+    if rng.random() < density["link"]:
+        words.insert(rng.randint(0, len(words)), f"@link {{{rng.choice(WORDS)} | Class{rng.randint(0, 9)}#method}}")
+    string = " ".join(words)
+    return string[0].upper() + string[1:] + "."
+
+
+
+def text(rng, density):
+    lines = chance_count(rng, density["multiline"])
+    return "\n".join(sentence(rng, density) for _ in range(lines))
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Write a synthetic `core`-style tree of Lua files")
+    parser.add_argument("path", help = "output directory")
+    parser.add_argument("--files", type = int, default = 100, help = "number of files")
+    parser.add_argument("--seed", type = int, default = 0)
+    for key, value in DENSITY.items():
+        parser.add_argument(f"--{key}", type = float, default = value, help = f"density of {key} (default: {value})")
+    args = parser.parse_args()
+
+    density = {key: getattr(args, key) for key in DENSITY}
+    paths = write_corpus(args.path, args.files, density, args.seed)
+    print(f"Wrote {len(paths)} files to {args.path}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,85 @@
 # Element Types
 
+from dataclasses import dataclass, field
+from sys import intern
+
+# Elements use slots instead of per-instance dicts,
+# since the whole parsed API is kept in memory.
+# Names, types, and hrefs repeat a lot, so they are interned
+
+
+
+@dataclass(slots = True)
 class Text():
     """
     Standalone text element
     """
 
-    def __init__(self):
-        self.text = []
+    text: list = field(default_factory = list)
 
 
 
+@dataclass(slots = True)
 class Constants():
     """
     Constants element
     """
 
-    def __init__(self):
-        self.text = []
-        self.values = []
+    text: list = field(default_factory = list)
+    values: list = field(default_factory = list)
 
 
 
+@dataclass(slots = True)
 class Enum():
     """
     Enum element
     """
 
-    def __init__(self):
-        self.name = ""
-        self.href = ""
-        self.text = []
-        self.values = []
+    name: str = ""
+    href: str = ""
+    text: list = field(default_factory = list)
+    values: list = field(default_factory = list)
 
 
 
-class Method():
+@dataclass(slots = True)
+class Signature():
     """
-    Method element
+    Signature of Method element
     """
 
-    def __init__(self):
-        self.is_instance = False    # Affects prefix (`Class`. vs `wrapper:`)
-        self.signatures = [ Signature() ]
-        self.href = ""
-        self.text = []
+    name: str = ""
+    ret: str = "nil"
+    params: list = field(default_factory = list)
+    optional: list = field(default_factory = list)
 
 
 
-class Signature():
+@dataclass(slots = True)
+class Method():
     """
-    Signature of Method element
+    Method element
     """
 
-    def __init__(self):
-        self.name = ""
-        self.ret = "nil"
-        self.params = []
-        self.optional = []
+    is_instance: bool = False   # Affects prefix (`Class`. vs `wrapper:`)
+    signatures: list = field(default_factory = lambda: [ Signature() ])
+    href: str = ""
+    text: list = field(default_factory = list)
 
 
 
+@dataclass(slots = True)
 class Param():
     """
     Parameter of Method element
     (for both required and optional)
     """
 
-    def __init__(self, name = "", type = "", text = ""):
-        self.name = name
-        self.type = type
-        self.text = text
-
-
+    name: str = ""
+    type: str = ""
+    text: str = ""
 
-def typeof(object):
-    return type(object).__name__
\ No newline at end of file
+    def __post_init__(self):
+        self.name = intern(self.name)
+        self.type = intern(self.type)
@@ -0,0 +1,148 @@
+# Page Layout
+# Splits wiki pages that are over a size or element budget into
+# one subpage per section, behind a lightweight index page
+
+import hashlib
+import json
+import re
+
+from assets import IMAGE_MARKER, IMAGE_PATTERN
+from element_types import *
+from links import section_href
+
+global PAGE_BUDGET; PAGE_BUDGET = 10 * 1024     # Bytes of Markdown
+global ELEMENT_BUDGET; ELEMENT_BUDGET = 50
+
+SUBPAGE_PATTERN = re.compile(r"[^A-Za-z0-9_]+")
+
+
+
+def subpage_name(page, section_id):
+    # e.g., ("Actor", "Instance Methods (`fire_*`)") -> "Actor-Instance-Methods-fire"
+    return page + "-" + SUBPAGE_PATTERN.sub("-", section_id).strip("-_")
+
+
+
+class Layout():
+    """
+    The subpage of each section of every split page,
+    the subpage that each anchor of those pages is on,
+    and the asset name of each image
+
+    Links are written against unsplit pages (`Page#anchor`), and images
+    against their source path; both are rewritten as pages are written
+    """
+
+    def __init__(self, wiki, images = None):
+        self.wiki = wiki
+        self.splits = {}    # page -> {section ID: subpage}
+        self.anchors = {}   # page -> {anchor: subpage}
+        self.images = images if images is not None else {}  # Image path -> asset name (see `AssetStore`)
+        self.link_pattern = re.compile(re.escape(wiki) + r"/([^)#\s]+)#([^)\s]+)\)")
+
+
+    def plan(self, page, docs, size):
+        """
+        Splits the page if its unsplit Markdown (`size` bytes) or number of
+        elements is over budget and it has more than one section;
+        returns `True` if the layout of the page changed
+        """
+        sections = [(section_id, section) for section_id, section in docs["sections"].items() if section_id and section]
+        elements = sum(len(section) for _, section in sections)
+
+        splits, anchors = {}, {}
+        if (len(sections) > 1) and ((size > PAGE_BUDGET) or (elements > ELEMENT_BUDGET)):
+            for section_id, section in sections:
+                subpage = subpage_name(page, section_id)
+                if subpage in splits.values():
+                    subpage += f"-{len(splits) + 1}"
+                splits[section_id] = subpage
+                anchors[section_href(section_id)] = subpage
+                for element in section:
+                    if type(element) in (Enum, Method) and element.href:
+                        anchors.setdefault(element.href, subpage)
+
+        changed = (splits != self.splits.get(page, {})) or (anchors != self.anchors.get(page, {}))
+        self.splits.pop(page, None)
+        self.anchors.pop(page, None)
+        if splits:
+            self.splits[page] = splits
+            self.anchors[page] = anchors
+        return changed
+
+
+    def subpages(self, page):
+        """
+        Returns {section ID: subpage} (empty if the page is not split)
+        """
+        return self.splits.get(page, {})
+
+
+    def locate(self, page, anchor):
+        """
+        Returns the page that an anchor of a page is on
+        """
+        anchors = self.anchors.get(page)
+        if (not anchors) or (not anchor):
+            return page
+        # Heading anchors are lowercase, but are matched case-insensitively
+        return anchors.get(anchor) or anchors.get(anchor.lower(), page)
+
+
+    def rewrite(self, chunk):
+        """
+        Points the wiki links in a chunk of Markdown at the subpages
+        of their anchors, and its images at their assets
+        """
+        if self.anchors and (self.wiki in chunk):
+            chunk = self.link_pattern.sub(lambda m: f"{self.wiki}/{self.locate(m.group(1), m.group(2))}#{m.group(2)})", chunk)
+        if IMAGE_MARKER in chunk:
+            chunk = IMAGE_PATTERN.sub(self.image_link, chunk)
+        return chunk
+
+
+    def image_link(self, m):
+        # Missing images keep their marker (and are reported by the build)
+        name = self.images.get(m.group(1))
+        if not name:
+            return m.group()
+        return f"]({self.wiki}/images/{name})"
+
+
+    def hash(self):
+        """
+        Returns a hash of the layout; every page has to be generated again
+        when it changes, since any page can link into a split page or show an image
+        """
+        layout = {"anchors": self.anchors, "images": self.images}
+        return hashlib.sha256(json.dumps(layout, sort_keys = True).encode("utf-8")).hexdigest()[:16]
+
+
+
+class LinkRewriter():
+    """
+    Passes chunks written to it on to `out`,
+    with their links rewritten by the layout
+    """
+
+    def __init__(self, out, layout):
+        self.out = out
+        self.layout = layout
+
+
+    def write(self, chunk):
+        self.out.write(self.layout.rewrite(chunk))
+
+
+
+class SizeCounter():
+    """
+    Counts the bytes written to it
+    """
+
+    def __init__(self):
+        self.size = 0
+
+
+    def write(self, chunk):
+        self.size += len(chunk.encode("utf-8"))
@@ -0,0 +1,105 @@
+# Symbol Index
+
+import json
+import os
+import re
+
+from element_types import *
+
+# `@link {<name> | <url path>}` in a source line
+LINK_PATTERN = re.compile(r"@link\s*\{\s*([^|}]*?)\s*\|\s*([^|}]*?)\s*\}")
+
+
+
+def section_href(section_id):
+    """
+    Returns the anchor of a section heading (e.g., "Static Methods" -> "static-methods")
+    """
+    return "-".join([p.strip("()`").lower() for p in section_id.split()])
+
+
+
+class SymbolIndex():
+    """
+    Index of every generated page and the anchors on it
+    (page -> section anchors and element hrefs)
+
+    Built in one pass over the parsed docs of all sources;
+    link targets are resolved against it in constant time
+    """
+
+    def __init__(self):
+        self.pages = {}
+        self.targets = set()    # "Page" and "Page#anchor"
+
+
+    def add(self, page, docs):
+        sections = {}
+        elements = {}
+
+        for section_id, section in docs["sections"].items():
+            if section_id and section:
+                sections[section_href(section_id)] = section_id
+
+            for element in section:
+                if type(element) in (Enum, Method) and element.href:
+                    elements[element.href] = type(element).__name__
+
+        self.pages[page] = {
+            "sections" : sections,
+            "elements" : elements
+        }
+
+        self.targets.add(page)
+        for anchor in list(sections) + list(elements):
+            self.targets.add(f"{page}#{anchor}")
+
+
+    def resolve(self, target):
+        """
+        Returns `None` if the target exists,
+        or the reason it does not
+        """
+        if target in self.targets:
+            return None
+
+        page, _, anchor = target.partition("#")
+        if page not in self.pages:
+            return "unknown page"
+
+        # Heading anchors are lowercase, but are matched case-insensitively
+        if anchor.lower() in self.pages[page]["sections"]:
+            return None
+        return "unknown anchor"
+
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        with open(path, "w") as f:
+            json.dump(self.pages, f, indent = 4, sort_keys = True)
+
+
+
+def find_broken_links(index, key, text):
+    """
+    Returns every link in the source text whose target
+    does not exist, with the line it is on
+    """
+    broken = []
+
+    for number, line in enumerate(text.splitlines(), 1):
+        if "@link" not in line:
+            continue
+
+        for m in LINK_PATTERN.finditer(line):
+            reason = index.resolve(m.group(2))
+            if reason:
+                broken.append({
+                    "file"   : key,
+                    "line"   : number,
+                    "text"   : m.group(1),
+                    "target" : m.group(2),
+                    "reason" : reason
+                })
+
+    return broken
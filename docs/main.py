@@ -5,7 +5,7 @@ General
 -- @section  <name>                         Sets the current page section; remains this until changed later in the file
 -- @link     {<name> | <url path>}          Link to another section/page of the wiki (e.g., @link {some display text | Item#LootTag})
                                             Can be placed within the text parameters of any other keyword
--- @image    <path>                         (Optional)  Display an image; path is relative to docs/out/images
+-- @image    <path>                         (Optional)  Display an image; path is relative to core (e.g., sprites/palettes/pilotPalette.png)
 --[[ ]]                                     Multiline text, used for method descriptions, etc.
                                             
 Constants
@@ -33,47 +33,501 @@ Methods
 
 # ==================================================
 
+import argparse
+import contextlib
+import cProfile
+import functools
+import json
+import io
+import multiprocessing
 import os
+import re
+import time
 from pprint import pprint
+from sys import intern
 
 from element_types import *
+from assets import IMAGE_MARKER, AssetStore, find_images
+from cache import DocsCache
+from layout import Layout, LinkRewriter, SizeCounter
+from links import SymbolIndex, find_broken_links, section_href
+from search import SearchIndex
+from sources import SourceError, SourceIndex
+import render_html
+import render_json
+from manifest import Manifest, hash_bytes
+from profiling import Profile, print_summary
+from watch import Watcher
+from writer import PageWriter, commit_page
 
 global WIKI; WIKI = "https://github.com/ReturnsAPI/ReturnsAPI/wiki"
 
+global CORE_PATH; CORE_PATH = os.path.join(os.path.dirname(__file__), "../core")
+global MAIN_PATH; MAIN_PATH = os.path.join(os.path.dirname(__file__), "../main.lua")
+global OUT_PATH; OUT_PATH = os.path.join(os.path.dirname(__file__), "out")
+global IMAGES_PATH; IMAGES_PATH = os.path.join(os.path.dirname(__file__), "out/images")
+global JSON_PATH; JSON_PATH = os.path.join(os.path.dirname(__file__), "json")
+global HTML_PATH; HTML_PATH = os.path.join(os.path.dirname(__file__), "html")
+global MANIFEST_PATH; MANIFEST_PATH = os.path.join(os.path.dirname(__file__), ".cache/manifest.json")
+global SOURCE_INDEX_PATH; SOURCE_INDEX_PATH = os.path.join(os.path.dirname(__file__), ".cache/sources.json")
+
+global CACHE_PATH; CACHE_PATH = os.path.join(os.path.dirname(__file__), ".cache/docs")
+global IMAGE_CACHE_PATH; IMAGE_CACHE_PATH = os.path.join(os.path.dirname(__file__), ".cache/images")
+global ARTIFACTS_PATH; ARTIFACTS_PATH = os.path.join(os.path.dirname(__file__), "artifacts")
+global SEARCH_PATH; SEARCH_PATH = os.path.join(os.path.dirname(__file__), "search")
+
+# Per-file and per-phase timings (enabled by `--profile`)
+global PROFILE; PROFILE = Profile()
+
+# Sources to leave out, besides the directories that `main.lua` ignores
+# (globs of paths relative to `core`; add more with `--exclude`)
+global SOURCE_EXCLUDE; SOURCE_EXCLUDE = [
+    "7_Content_Classes/__template.lua",     # Placeholder for new content classes
+]
+global SOURCE_INDEX; SOURCE_INDEX = None
+
+# Bump these whenever a change would change the output for an unchanged source file
+global PARSER_VERSION; PARSER_VERSION = 2   # Parsed docs (also invalidates the docs cache)
+global RENDER_VERSION; RENDER_VERSION = 3   # Generated pages
+
+# Precompiled patterns
+KEYWORD_PATTERN = re.compile(r"\s*(\S+)(?:\s+(\S+))?")   # First token of a block line, and its first argument
+TOKEN_PATTERN   = re.compile(r"[^ ]+")                  # Token of a line that has been normalized to single spaces
+LINK_DELIMITER  = re.compile(r"[|}]")                   # Delimiters of the parts of `@link {<name> | <url path>}`
+
 
 
 def main():
-    core_path = os.path.join(os.path.dirname(__file__), "../core")
-    
-    # Loop through all directories in `core`
-    for dir in os.listdir(core_path):
-        dir_path = os.path.join(core_path, dir)
-        if os.path.isdir(dir_path):
-            
-            # Loop through all Lua files in directory
-            for filename in os.listdir(dir_path):
-                if filename.endswith(".lua"):
-                    file_path = os.path.join(dir_path, filename)
-                    parse_file(file_path, filename.split(".")[0])
+    parser = argparse.ArgumentParser(description = "Generate wiki pages from ReturnsAPI doc comments")
+    parser.add_argument("--full", action = "store_true", help = "ignore the build manifest and rebuild every page")
+    parser.add_argument("--no-cache", action = "store_true", help = "parse every source again instead of loading cached docs")
+    parser.add_argument("--jobs", "-j", type = int, default = 1, metavar = "N", help = "number of worker processes (0 = one per CPU)")
+    parser.add_argument("--formats", nargs = "+", default = ["md"], choices = FORMATS.keys(), help = "output formats to generate (default: md)")
+    parser.add_argument("--strict-links", action = "store_true", help = "fail if any @link points to a page or anchor that does not exist")
+    parser.add_argument("--watch", action = "store_true", help = "after building, keep running and regenerate the page of any source that changes")
+    parser.add_argument("--interval", type = float, default = 0.1, metavar = "SECONDS", help = "how often to check for changes in watch mode (default: 0.1)")
+    parser.add_argument("--exclude", nargs = "+", default = [], metavar = "GLOB", help = "also skip sources whose path relative to core matches a glob")
+    parser.add_argument("--profile", action = "store_true", help = "record the time and memory of each file and phase, and write a summary to artifacts/profile.json")
+    parser.add_argument("--no-trace-memory", action = "store_true", help = "with --profile, only record time (tracing allocations slows the build down)")
+    parser.add_argument("--cprofile", action = "store_true", help = "also write cProfile stats to artifacts/profile.prof (implies --jobs 1)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.profile:
+        PROFILE.enable(trace_memory = not args.no_trace_memory)
+
+    profiler = None
+    if args.cprofile:
+        args.jobs = 1   # cProfile only sees the process it runs in
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    SOURCE_EXCLUDE.extend(args.exclude)
+    try:
+        sources = find_sources()
+    except SourceError as e:
+        print(e)
+        exit(1)
+
+    # Settings of the profile of worker processes (`None` if not profiling)
+    profile = PROFILE.trace_memory if PROFILE.enabled else None
+
+    # Load the cached docs of every source, and parse those
+    # without current docs; results (and their logs) are
+    # handled in source order, so output is identical
+    # to a serial run regardless of the number of jobs
+    read = []
+    docs = {}
+    hashes = {}
+    tasks = []
+    for file_path, filename in sources:
+        with PROFILE.file(source_key(file_path)):
+            with PROFILE.phase("read"):
+                key, source_hash, data = read_source(file_path)
+            read.append((key, source_hash, filename, data))
+            hashes[key] = source_hash
+            docs[key] = None if args.no_cache else load_cached_docs(key, source_hash)
+        if docs[key] is None:
+            tasks.append((key, source_hash, filename, data, profile))
+
+    for (key, *_), (log, docs[key], taken) in zip(tasks, run_tasks(parse_source, tasks, args.jobs)):
+        print(log, end = "")
+        if taken:
+            PROFILE.merge(key, taken)
+
+    loaded = [(key, filename, data, docs[key]) for key, _, filename, data in read]
+
+    # Copy the images referenced by `@image` into the output
+    assets = AssetStore(CORE_PATH, IMAGES_PATH, IMAGE_CACHE_PATH)
+    for key, _, _, page_docs in loaded:
+        with PROFILE.file(key), PROFILE.phase("images"):
+            add_images(assets, key, page_docs)
+
+    manifest = Manifest(MANIFEST_PATH, PARSER_VERSION, None)
+    if args.full:
+        manifest.clear()
+
+    # Split pages that are over budget
+    layout = Layout(WIKI, assets.names)
+    for key, filename, _, page_docs in loaded:
+        with PROFILE.file(key), PROFILE.phase("layout"):
+            layout.plan(filename, page_docs, page_size(manifest, key, hashes[key], page_docs, filename))
+
+    # Every page depends on the layout, since any page can link into a split page
+    manifest.render_version = render_version(layout)
+
+    # Generate the pages of sources that changed since the last build
+    tasks = []
+    for key, source_hash, filename, _ in read:
+        if not manifest.is_current(key, source_hash, page_paths(filename, args.formats, layout)):
+            tasks.append((key, filename, docs[key], args.formats, layout, profile))
+
+    for (key, filename, *_), (log, pages, taken) in zip(tasks, run_tasks(build_page, tasks, args.jobs)):
+        print(log, end = "")
+        if taken:
+            PROFILE.merge(key, taken)
+        with PROFILE.file(key), PROFILE.phase("write"):
+            manifest.update(key, hashes[key], commit_pages(pages))
+
+    manifest.save()
+    print(f"Rebuilt {len(tasks)} of {len(sources)} files")
+
+    broken = check_links(loaded)
+
+    search = SearchIndex(layout)
+    for _, filename, _, docs in loaded:
+        search.add(filename, docs)
+    search.save(SEARCH_PATH)
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(ARTIFACTS_PATH, "profile.prof"))
+    if PROFILE.enabled:
+        print_summary(PROFILE.save(os.path.join(ARTIFACTS_PATH, "profile.json"), time.perf_counter() - start))
+
+    if broken and args.strict_links:
+        exit(1)
+
+    if args.watch:
+        watch(manifest, layout, assets, args.formats, args.interval, not args.no_cache)
+
+
+
+def watch(manifest, layout, assets, formats, interval, use_cache = True):
+    """
+    Keeps the docs of every source in memory,
+    and regenerates the page of a source whenever it changes
+    """
+    loaded = {}     # key -> (source hash, page name, docs)
+
+    # Load docs of all sources
+    sources = dict(find_sources())
+    watcher = Watcher(sources.keys())
+    for file_path, filename in sources.items():
+        key, source_hash, data = read_source(file_path)
+        loaded[key] = (source_hash, filename, load_docs(key, source_hash, data, filename, use_cache))
+
+    def rebuild(file_path, filename):
+        key, source_hash, data = read_source(file_path)
+        if (key in loaded) and (loaded[key][0] == source_hash):
+            return False
+
+        # A changed source is never in the cache
+        docs = load_docs(key, source_hash, data, filename, use_cache = False)
+        loaded[key] = (source_hash, filename, docs)
+        add_images(assets, key, docs)
+
+        # If the page was split differently, links on any
+        # other page may point elsewhere, so every page is generated again
+        rebuilt = {key: loaded[key]}
+        if layout.plan(filename, docs, page_size(manifest, key, source_hash, docs, filename)):
+            rebuilt = loaded
+        manifest.render_version = render_version(layout)
+
+        for key, (source_hash, filename, docs) in rebuilt.items():
+            manifest.update(key, source_hash, commit_pages(write_pages(docs, filename, formats, layout)))
+        return True
+
+    print("Watching for changes (Ctrl+C to stop)")
+
+    error = None    # Last error from `find_sources` (so that it is only printed once)
+    try:
+        while True:
+            time.sleep(interval)
+
+            try:
+                sources = dict(find_sources())
+                error = None
+            except SourceError as e:
+                if str(e) != error:
+                    print(e)
+                error = str(e)
+                continue
+            changed, removed = watcher.poll(sources.keys())
+
+            for file_path in removed:
+                loaded.pop(source_key(file_path), None)
+
+            for file_path in changed:
+                start = time.perf_counter()
+                if rebuild(file_path, sources[file_path]):
+                    print(f"Rebuilt {sources[file_path]} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+            if changed or removed:
+                manifest.save()
+
+    except KeyboardInterrupt:
+        pass
+
+
+
+def add_images(assets, key, docs):
+    """
+    Adds the images referenced in the docs of a source to the assets
+    """
+    for path in find_images(docs):
+        if assets.add(path) is None:
+            print(f"Missing image in {key}: {path}")
+
+
+
+def check_links(loaded):
+    """
+    Indexes the pages of all sources, saves the index, and reports
+    every @link whose page or anchor does not exist
+    """
+    index = SymbolIndex()
+    for _, filename, _, docs in loaded:
+        index.add(filename, docs)
+    index.save(os.path.join(ARTIFACTS_PATH, "symbols.json"))
+
+    broken = []
+    for key, _, data, _ in loaded:
+        broken.extend(find_broken_links(index, key, data.decode("utf-8")))
+
+    with open(os.path.join(ARTIFACTS_PATH, "broken_links.json"), "w") as f:
+        json.dump(broken, f, indent = 4)
+
+    for link in broken:
+        print(f"Broken link in {link['file']}:{link['line']} -> {link['target']} ({link['reason']})")
+    if broken:
+        print(f"{len(broken)} broken links")
+
+    return broken
+
+
+
+def read_source(file_path):
+    """
+    Returns the key (path relative to `core`),
+    content hash, and raw bytes of a source file
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return source_key(file_path), hash_bytes(data), data
+
+
+
+def source_key(file_path):
+    return os.path.relpath(file_path, CORE_PATH).replace(os.sep, "/")
+
+
+
+def find_sources():
+    """
+    Returns a sorted list of (file path, page name) for every Lua file
+    that `main.lua` loads from `core` (see `SourceIndex`)
+    """
+    global SOURCE_INDEX
+    if SOURCE_INDEX is None:
+        SOURCE_INDEX = SourceIndex(CORE_PATH, MAIN_PATH, SOURCE_EXCLUDE, SOURCE_INDEX_PATH)
+    return SOURCE_INDEX.find()
+
+
+
+def run_tasks(fn, tasks, jobs):
+    """
+    Yields the result of `fn` for each task in order
+    """
+    if jobs == 1 or len(tasks) <= 1:
+        yield from map(fn, tasks)
+        return
+
+    with multiprocessing.Pool(jobs or None) as pool:
+        yield from pool.imap(fn, tasks)
+
+
+
+def parse_source(task):
+    """
+    Parses a source (updating the docs cache), capturing anything
+    printed along the way; returns (log, docs, profile)
+    """
+    key, source_hash, filename, data, profile = task
+
+    def parse():
+        print("Parsing " + filename)
+        return load_docs(key, source_hash, data, filename, use_cache = False)
+
+    return run_captured(key, profile, parse)
+
+
+
+def build_page(task):
+    """
+    Generates the pages of a source, capturing anything printed
+    along the way; returns (log, pages, profile) (see `write_pages`)
+    """
+    key, filename, docs, formats, layout, profile = task
+
+    def build():
+        print("Processing " + filename)
+        return write_pages(docs, filename, formats, layout)
+
+    return run_captured(key, profile, build)
+
+
 
-    # parse_file(core_path + "/6_General/Language.lua", "Language")
+def run_captured(key, profile, fn):
+    """
+    Runs a task of a source, capturing anything printed along the way;
+    returns (log, result, what was recorded by the profile during the task)
+    """
+    # A worker process records into its own copy of the
+    # profile, and sends what it recorded back with the results
+    if profile is not None:
+        PROFILE.enable(trace_memory = profile)
 
+    # A forked worker also starts with a copy of everything recorded before the fork,
+    # which is set aside so that only what this task records is sent back
+    earlier = PROFILE.take(key)
 
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log), PROFILE.file(key):
+        result = fn()
 
-def parse_file(file_path, filename):
+    recorded = PROFILE.take(key)
+    PROFILE.merge(key, earlier)
+    return log.getvalue(), result, (recorded if profile is not None else None)
 
-    # Log current file
-    print("Processing " + filename)
 
 
-    # Get file data
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-        lines.append("\n")  # To force last block to
-        lines.append("--")  # be added to blocks
+def write_pages(docs, filename, formats, layout):
+    """
+    Generates the pages of each format to temporary files, and returns
+    {output: (page path, temporary file path, hash) or `None` if there is no page}
+
+    The output of a page is its format, or `<format>:<subpage>`
+    for the subpages of a split page
+    """
+    pages = {}
+    for format in formats:
+        path, extension, generate, paginate = FORMATS[format]
+
+        # Every format resolves links and images through the layout
+        # (so that no `@image` marker is left in any output)
+        renders = [(filename, lambda out: generate(docs, filename, LinkRewriter(out, layout)))]
+        if paginate:
+            renders = paginate(docs, filename, layout)
+
+        for page, render in renders:
+            with PageWriter(path, page, extension) as out:
+                with PROFILE.phase("generate"):
+                    render(out)
+                with PROFILE.phase("write"):
+                    output_hash = out.close()
+
+            output = format if (page == filename) else f"{format}:{page}"
+            pages[output] = None
+            if output_hash:
+                pages[output] = (out.path, out.temp_path, output_hash)
+
+    return pages
+
+
+
+def commit_pages(pages):
+    """
+    Moves generated pages into place,
+    and returns {output: hash or `None`}
+    """
+    output_hashes = {}
+    for output, page in pages.items():
+        output_hashes[output] = None
+        if page:
+            path, temp_path, output_hashes[output] = page
+            commit_page(path, temp_path, output_hashes[output])
+    return output_hashes
+
+
+
+def load_docs(key, source_hash, data, filename, use_cache = True):
+    """
+    Returns the cached docs for a source if they are current,
+    and parses it (updating the cache) otherwise
+    """
+    docs = None
+    if use_cache:
+        docs = load_cached_docs(key, source_hash)
+
+    if docs is None:
+        docs = parse_file(data, filename)
+        with PROFILE.phase("cache"):
+            DocsCache(CACHE_PATH, PARSER_VERSION).save(key, source_hash, docs)
+
+    return docs
+
+
+
+def load_cached_docs(key, source_hash):
+    """
+    Returns the cached docs for a source, or `None` if they are not current
+    """
+    with PROFILE.phase("cache"):
+        return DocsCache(CACHE_PATH, PARSER_VERSION).load(key, source_hash)
+
+
+
+def parse_file(data, filename):
+    """
+    Parses the raw bytes of a source file
+    and returns the docs for it
+    """
+    docs = new_docs()
+    for block in PROFILE.iterate("split", split_blocks(split_lines(data))):
+        with PROFILE.phase("parse_block"):
+            parse_block(block, docs)
+
+    return docs
+
+
+
+def split_lines(data):
+    """
+    Returns the lines of the raw bytes of a source file
+    (with universal newlines)
+    """
+    return io.StringIO(data.decode("utf-8"), newline = None).readlines()
+
+
+
+def new_docs():
+    return {
+        "section"       : None,
+        "sections"      : {
+            None: []
+        }
+    }
+
+
+
+def split_blocks(lines):
+    """
+    Yields the blocks of the lines of a source file,
+    each being a comment followed by the code after it
+    """
 
     # Initialize variables
-    blocks = []
     current_block = []
     in_multiline = False
     in_code = True
@@ -87,11 +541,7 @@ def parse_file(file_path, filename):
             if line.startswith("--"):
                 in_code = False
                 if current_block:
-                    # Remove trailing newlines from block
-                    while current_block and (current_block[-1] == ""):
-                        current_block.pop(-1)
-
-                    blocks.append(current_block)
+                    yield trim_block(current_block)
                     current_block = []
 
                 # Start multiline
@@ -132,22 +582,18 @@ def parse_file(file_path, filename):
                 in_code = True
                 current_block.append(line)
 
+    # End of file; flush the last block
+    # (unless it is in a multiline comment that is never closed)
+    if not in_multiline:
+        yield trim_block(current_block)
 
-    # Initialize variables
-    docs = {
-        "section"       : None,
-        "sections"      : {
-            None: []
-        }
-    }
-
-    # Parse blocks
-    for block in blocks:
-        parse_block(block, docs)
 
 
-    # Generate md files
-    generate(docs, filename)
+def trim_block(block):
+    # Remove trailing newlines from block
+    while block and (block[-1] == ""):
+        block.pop(-1)
+    return block
 
 
 
@@ -159,14 +605,17 @@ def parse_block(block, docs):
 
 
     # Loop through lines
-    while len(block) > 0:
-        line = block.pop(0)
-        tokens = line.split()
-    
-        if len(tokens) <= 0:
+    i = 0
+    while i < len(block):
+        line = block[i]
+        i += 1
+
+        m = KEYWORD_PATTERN.match(line)
+        if not m:
             continue
+        keyword, arg = m.groups()
 
-        match tokens[0]:
+        match keyword:
 
             # Set current section; if empty, default to None
             case "@section":
@@ -191,7 +640,7 @@ def parse_block(block, docs):
                 if not docs["element"]:
                     docs["element"] = Text()
                 
-                docs["element"].text = parse_text(block, docs)
+                docs["element"].text, i = parse_text(block, i)
 
 
             # Start new constants
@@ -227,25 +676,24 @@ def parse_block(block, docs):
 
             # Set name; if empty, autofinds
             case "@name":
-                _type = typeof(docs["element"])
-                match _type:
+                match docs["element"]:
 
-                    case "Enum":
-                        docs["element"].name = tokens[1]
+                    case Enum():
+                        docs["element"].name = intern(arg)
 
-                    case "Method":
-                        docs["element"].signatures[-1].name = tokens[1]
+                    case Method():
+                        docs["element"].signatures[-1].name = intern(arg)
 
 
             # Set href; if empty, autosets based on name
             case "@href":
-                docs["element"].href = tokens[1]
+                docs["element"].href = intern(arg)
 
 
             # Set return; if empty, will be `nil`
             case "@return":
                 ret = line.split(None, 1)
-                docs["element"].signatures[-1].ret = ret[1]
+                docs["element"].signatures[-1].ret = intern(ret[1])
 
 
             # Add required parameter
@@ -268,12 +716,12 @@ def parse_block(block, docs):
 
 
     # Autofind unset properties from code
-    parse_code(code, docs)
+    with PROFILE.phase("parse_code"):
+        parse_code(code, docs)
 
 
     # Constants, Enum : Parse text into value pairs
-    _type = typeof(docs["element"])
-    if (_type == "Constants") or (_type == "Enum"):
+    if type(docs["element"]) in (Constants, Enum):
         docs["element"].values = convert_text_to_pairs(docs["element"].text)
 
 
@@ -284,13 +732,18 @@ def parse_block(block, docs):
 
 
 
-def parse_text(block, docs):
+def parse_text(block, i):
+    """
+    Parses multiline text starting at line `i` of the block,
+    and returns the text and the index of the line after `@mlend`
+    """
     text = []
     in_codeblock = False
 
     # Loop through lines
-    while len(block) > 0:
-        line = block.pop(0)
+    while i < len(block):
+        line = block[i]
+        i += 1
         line_stripped = line.strip()
 
         # Toggle in_codeblock
@@ -304,76 +757,109 @@ def parse_text(block, docs):
 
         # End text
         if "@mlend" in parsed:
-            return text
+            return text, i
 
         # Add parsed line to element.text
         text.append(parsed)
 
+    return None, i
+
 
 
 def parse_line(line):
-    parsed = ""
+    parsed = []
 
-    tokens = line.split()
-    while len(tokens) > 0:
-        token = tokens.pop(0)
+    # Normalize whitespace so that every
+    # part of the line is separated by one space
+    line = " ".join(line.split())
+
+    pos = 0
+    while True:
+        m = TOKEN_PATTERN.search(line, pos)
+        if not m:
+            break
+        token = m.group()
+        pos = m.end()
 
         if token.startswith("<br>"):
-            parsed += "<br>"
+            parsed.append("<br>")
             token = token[4:]
 
         match token:
 
             # Add link
             case "@link":
-                
-                # Join remaining tokens together
-                remainder = " ".join(tokens).lstrip(" {")
 
-                # Split by | and } to get three parts
-                parts = [p.strip() for p in remainder.replace("}", "|", 1).split("|", 2)]
+                # Skip to the start of the first part
+                start = pos
+                while (start < len(line)) and (line[start] in " {"):
+                    start += 1
+
+                # Split by | and the first } to get three parts
+                d1 = LINK_DELIMITER.search(line, start)
+                d2 = None
+                if d1:
+                    if d1.group() == "}":
+                        d2 = line.find("|", d1.end())
+                        d2 = d2 if d2 >= 0 else None
+                    else:
+                        d2 = LINK_DELIMITER.search(line, d1.end())
+                        d2 = d2.start() if d2 else None
 
                 # Add link-formatted part
-                if len(parts) >= 2:
-                    parsed += f"[{parts[0]}]({WIKI}/{parts[1]})"
+                if d1:
+                    end = d2 if (d2 is not None) else len(line)
+                    text = line[start:d1.start()].strip()
+                    url = line[d1.end():end].strip()
+                    parsed.append(f"[{text}]({WIKI}/{url})")
                 else:
+                    remainder = line[start:]
                     print("\n@link parsing error")
                     print(f"remainder:  {remainder}")
-                    print(parts)
+                    print([remainder.strip()])
                     print("")
 
-                # Place last part back into remaining tokens
-                if len(parts) >= 3:
-                    tokens = parts[2].split()
-                else:
-                    tokens = []
+                # Continue after the last part
+                if d2 is None:
+                    break
+                pos = d2 + 1
+
+                # If the link was not closed by a }, the
+                # first } after it is still treated as a |
+                if d1.group() == "|" and line[d2] == "|":
+                    line = line[:pos] + line[pos:].replace("}", "|", 1)
 
                 # Add space if the first character of the next token is *not* punctuation
                 # This is very goofy but whatever
-                if len(tokens) > 0:
+                m = TOKEN_PATTERN.search(line, pos)
+                if m:
                     punc = ".)]"
-                    if tokens[0] not in punc:
-                        parsed += " "
+                    if m.group() not in punc:
+                        parsed.append(" ")
 
 
             # Add image
+            # (the marker is replaced by the URL of the asset when the page is written)
             case "@image":
-                pass
+                m = TOKEN_PATTERN.search(line, pos)
+                if m:
+                    pos = m.end()
+                    path = m.group()
+                    parsed.append(f"![{path.split('/')[-1].split('.')[0]}]({IMAGE_MARKER}{path}) ")
 
             
             # Add line to text
             case _:
-                parsed += token + " "
+                parsed.append(token + " ")
 
-    return parsed.strip()
+    return "".join(parsed).strip()
 
 
 
 def parse_code(code, docs):
-    _type = typeof(docs["element"])
-    match _type:
+    match docs["element"]:
     
-        case "Enum":
+        case Enum():
 
             # Name
             if not docs["element"].name:
@@ -384,7 +870,7 @@ def parse_code(code, docs):
                 if "." in name:
                     name = name.split(".")[1]
 
-                docs["element"].name = name
+                docs["element"].name = intern(name)
 
 
             # href
@@ -402,7 +888,7 @@ def parse_code(code, docs):
                         break
 
 
-        case "Method":
+        case Method():
             if len(code) > 0:
             
                 # Name
@@ -412,6 +898,7 @@ def parse_code(code, docs):
                 name = line.split("=")[0].strip()
                 if "." in name:
                     name = name.split(".")[1]
+                name = intern(name)
 
                 # Set name for all unassigned signatures
                 for signature in docs["element"].signatures:
@@ -447,7 +934,104 @@ def convert_text_to_pairs(text):
 
 
 
-def generate(docs, filename):
+def generate(docs, filename, out):
+    """
+    Streams the page to `out` (any object with a `write` method)
+
+    Separators are decided before anything is written,
+    so nothing written ever has to be taken back
+    """
+    sections = ordered_sections(docs)
+    generate_index(docs, sections, filename, out)
+    for section_id, section in sections:
+        render_section(section_id, section, filename, out)
+
+
+
+def generate_index(docs, sections, filename, out):
+    """
+    Streams the top of the page (class description and index) to `out`;
+    this is the whole page if it is split into subpages
+    """
+
+    # Class top description
+    section = docs["sections"].get(None)
+    if len(section) > 0:
+        for line in section[0].text:
+            out.write(line + "  \n")
+        out.write("  \n<br><br>\n\n---")
+
+        if sections:
+            out.write("\n\n")
+
+
+    # Index
+    for i in range(len(sections)):
+        if i > 0:
+            out.write("\n\n")
+        render_index(sections[i][0], sections[i][1], filename, out)
+
+
+
+def generate_subpage(section_id, section, filename, out):
+    """
+    Streams a subpage holding one section of a split page to `out`
+    """
+    out.write(f"[**← {filename}**]({WIKI}/{filename})  ")
+    render_section(section_id, section, filename, out)
+
+
+
+def paginate(docs, filename, layout):
+    """
+    Returns (page name, render function) for each Markdown page of a source:
+    the page itself, or an index page and a subpage per section if it is split
+
+    Links are rewritten to the subpages of their anchors (see `Layout`)
+    """
+    def rewritten(render, *args):
+        return lambda out: render(*args, LinkRewriter(out, layout))
+
+    subpages = layout.subpages(filename)
+    if not subpages:
+        return [(filename, rewritten(generate, docs, filename))]
+
+    sections = ordered_sections(docs)
+    pages = [(filename, rewritten(generate_index, docs, sections, filename))]
+    for section_id, section in sections:
+        pages.append((subpages[section_id], rewritten(generate_subpage, section_id, section, filename)))
+    return pages
+
+
+
+def markdown_size(docs, filename):
+    """
+    Returns the size in bytes of the unsplit Markdown page
+    """
+    counter = SizeCounter()
+    generate(docs, filename, counter)
+    return counter.size
+
+
+
+def page_size(manifest, key, source_hash, docs, filename):
+    """
+    Returns the size in bytes of the unsplit Markdown page of a source,
+    only generating it if the manifest has no size for the source's content
+    """
+    size = manifest.size(key, source_hash, RENDER_VERSION)
+    if size is None:
+        size = markdown_size(docs, filename)
+        manifest.update_size(key, source_hash, RENDER_VERSION, size)
+    return size
+
+
+
+def ordered_sections(docs):
+    """
+    Returns (section ID, elements) for each section
+    with elements, in the order they are displayed
+    """
     section_order = [
         "Constants",
         "Enums",
@@ -461,244 +1045,274 @@ def generate(docs, filename):
         if key and (key not in section_order):
             section_order.append(key)
 
+    # Only display sections with elements
+    sections = []
+    for section_id in section_order:
+        section = docs["sections"].get(section_id)
+        if section:
+            sections.append((section_id, section))
+    return sections
+
+
+
+def render_section(section_id, section, filename, out):
+
+    # Section name
+    out.write(f"\n\n<br><br>\n\n---\n\n## {section_id}  ")
+
+    # Loop through section elements in order
+    for i in range(len(section)):
+        element = section[i]
+        _type = type(element)
+
+        # Insert <br> for consecutive elements,
+        # unless the element joins onto the previous one
+        if i > 0:
+            prev_type = type(section[i - 1])
+            if prev_type not in JOINS_ONTO.get(_type, ()):
+                out.write("\n\n<br><br>")
+
+        RENDERERS[_type](element, filename, out)
+
+
+
+def render_index(section_id, section, filename, out):
+
+    # Section name
+    out.write(f"* [**{section_id}**]({WIKI}/{filename}#{section_href(section_id)})  ")
+
+    # Element names
+    for element in section:
+
+        # Get name
+        name = ""
+        prefix = f"{filename}."
+        if type(element) is Enum:
+            name = element.name
+        elif type(element) is Method:
+            name = element.signatures[0].name
+            if element.is_instance:
+                prefix = f"{filename[0].lower() + filename[1:]}:"
+
+        # Add if name is valid
+        if name:
+            out.write(f"\n  * [`{prefix}{name}`]({WIKI}/{filename}#{element.href})  ")
+
+
+
+def render_text(element, filename, out):
+    if not element.text:
+        out.write("\n")
+        return
+
+    out.write("\n\n")
+    for i in range(len(element.text)):
+        if i > 0:
+            out.write("  \n")
+        out.write(element.text[i])
+    out.write("  ")
+
+
+
+def render_constants(element, filename, out):
+
+    # Code block opener
+    out.write("\n\n```lua\n")
+
+    # Get longest constant name
+    length = 0
+    for pair in element.values:
+        length = max(len(pair[0]), length)
+
+    # Add pairs
+    for pair in element.values:
+        if pair[0]:
+            out.write(f"{filename}.{pair[0].ljust(length)}    = {pair[1]}  \n")
+        else:
+            out.write("  \n")
     
-    out = ""
+    # Code block closer
+    out.write("```")
 
 
-    # Class top description
-    section = docs["sections"].get(None)
-    if len(section) > 0:
-        for line in section[0].text:
-            out += line + "  \n"
-        out += "  \n<br><br>\n\n---\n\n"
 
+def render_enum(element, filename, out):
 
-    # Index
-    for section_id in section_order:
-        section = docs["sections"].get(section_id)
+    # <a>
+    out.write(f"\n\n<a name=\"{element.href}\"></a>")
 
-        if not section:
-            continue
+    # Code block opener
+    out.write("\n```lua\n")
+    out.write(filename + "." + element.name + " = {\n")
 
-        # Section name
-        href = "-".join([p.strip("()`").lower() for p in section_id.split()])
-        out += f"* [**{section_id}**]({WIKI}/{filename}#{href})  \n"
+    # Get longest constant name
+    length = 0
+    for pair in element.values:
+        length = max(len(pair[0]), length)
 
-        # Element names
-        for element in section:
+    # Add pairs
+    for pair in element.values:
+        if pair[0]:
+            out.write(f"    {pair[0].ljust(length)}    = {pair[1]}  \n")
+        else:
+            out.write("  \n")
+    
+    # Code block closer
+    out.write("}\n```")
 
-            # Get name
-            name = ""
-            prefix = f"{filename}."
-            if hasattr(element, "name"):
-                name = element.name
-            elif typeof(element) == "Method":
-                name = element.signatures[0].name
-                if element.is_instance:
-                    prefix = f"{filename[0].lower() + filename[1:]}:"
 
-            # Add if name is valid
-            if name:
-                out += f"  * [`{prefix}{name}`]({WIKI}/{filename}#{element.href})  \n"
 
-        out += "\n"
+def render_method(element, filename, out):
 
-    out = out[:-2]  # Remove 2 \n
+    # Prefix
+    prefix = filename + "."
+    if element.is_instance:
+        prefix = filename[0].lower() + filename[1:] + ":"
 
+    # <a>
+    out.write(f"\n\n<a name=\"{element.href}\"></a>")
 
-    # Loop through sections in order
-    for section_id in section_order:
-        section = docs["sections"].get(section_id)
+    # Code block opener
+    out.write("\n```lua\n")
 
-        if not section:
-            continue
-
-        # Section name
-        if section_id:
-            out += f"\n\n<br><br>\n\n---\n\n## {section_id}  "
-
-        # Loop through section elements in order
-        for i in range(len(section)):
-            element = section[i]
-
-            # Insert <br> for consecutive elements
-            if i > 0:
-                out += "\n\n<br><br>"
-
-
-            # Get element type
-            _type = typeof(element)
-            match _type:
-
-                case "Text":
-                    # If previous element is Text
-                    # remove the <br>
-                    if i > 0:
-                        remove_for = ["Text"]
-                        prev_type = typeof(section[i - 1])
-                        if prev_type in remove_for:
-                            out = out[:-10]
-
-                    out += "\n\n"
-
-                    for line in element.text:
-                        out += line + "  \n"
-
-                    out = out[:-1]  # Remove a \n
+    # Method signature(s)
+    for signature in element.signatures:
+
+        # Name
+        out.write(prefix + signature.name + "(")
+
+        # Params
+        has_one = False
+
+        for p in signature.params:
+            if has_one:
+                out.write(", ")
+            out.write(p.name)
+            has_one = True
+
+        for p in signature.optional:
+            if has_one:
+                out.write(", ")
+            out.write(f"[{p.name}]")
+            has_one = True
+
+        # Return
+        out.write(f") -> {signature.ret}  \n")
+
+    # Code block closer
+    out.write("```\n\n")
+
+
+    # If the parameter table is displayed somewhere in the description,
+    # the last line of the description ends the method;
+    # otherwise, the table is displayed after the description
+    ptable_shown = False
+    for line in element.text:
+        if "@ptable" in line:
+            ptable_shown = True
+            break
+
+
+    # Description
+    for i in range(len(element.text)):
+        line = element.text[i]
+
+        # Parameters
+        if "@ptable" in line:
+            out.write(parameter_table(element))
+
+        elif "@findinfo" in line:
+            out.write("If no namespace is provided, searches globally in a non-deterministic* order.  \n\\* Guaranteed to check in your mod's namespace first.")
+        
+        else:
+            out.write(line)
+
+        if ptable_shown and (i == len(element.text) - 1):
+            out.write(" ")
+        else:
+            out.write("  \n")
+
+    # Display parameter table if not already shown
+    if not ptable_shown:
+        out.write("\n" + parameter_table(element))
+
+
+
+def parameter_table(element):
+    string = "**Parameters**  "
+    has_one = False
+    for signature in element.signatures:
+        if has_one:
+            string += "\n"
+        has_one = True
+        if len(signature.params) + len(signature.optional) > 0:
+            string += "\nParameter | Type | Description\n| - | - | -"
+            for p in signature.params:
+                string += f"\n`{p.name}` | {p.type} | {p.text}"
+            for p in signature.optional:
+                string += f"\n`[{p.name}]` | {p.type} | *Optional.* {p.text}"
+        else:
+            string += "\nNone"
+    return string
+
+
+
+# Renderer of each element type
+RENDERERS = {
+    Text        : render_text,
+    Constants   : render_constants,
+    Enum        : render_enum,
+    Method      : render_method
+}
+
+# Element types that are displayed directly after
+# the previous element (without a <br>) for each element type
+JOINS_ONTO = {
+    Text        : (Text,),
+    Constants   : (Text, Constants, Enum),
+    Enum        : (Text, Constants, Enum)
+}
+
+
+
+def page_path(filename, format = "md"):
+    path, extension, *_ = FORMATS[format]
+    return os.path.join(path, filename + extension)
+
+
+
+def render_version(layout):
+    return f"{RENDER_VERSION}:{layout.hash()}"
+
+
+
+def page_paths(filename, formats, layout):
+    """
+    Returns {output: path} for every page of a source (see `write_pages`)
+    """
+    paths = {}
+    for format in formats:
+        paths[format] = page_path(filename, format)
+        if FORMATS[format][3]:
+            for subpage in layout.subpages(filename).values():
+                paths[f"{format}:{subpage}"] = page_path(subpage, format)
+    return paths
 
 
-                case "Constants":
-                    # If previous element is Text, Constants, or Enum,
-                    # remove the <br>
-                    if i > 0:
-                        remove_for = ["Text", "Constants", "Enum"]
-                        prev_type = typeof(section[i - 1])
-                        if prev_type in remove_for:
-                            out = out[:-10]
-
-                    # Code block opener
-                    out += "\n\n```lua\n"
-
-                    # Get longest constant name
-                    length = 0
-                    for pair in element.values:
-                        length = max(len(pair[0]), length)
-
-                    # Add pairs
-                    for pair in element.values:
-                        if pair[0]:
-                            out += f"{filename}.{pair[0].ljust(length)}    = {pair[1]}  \n"
-                        else:
-                            out += "  \n"
-                    
-                    # Code block closer
-                    out += "```"
-
-
-                case "Enum":
-                    # If previous element is Text, Constants, or Enum,
-                    # remove the <br>
-                    if i > 0:
-                        remove_for = ["Text", "Constants", "Enum"]
-                        prev_type = typeof(section[i - 1])
-                        if prev_type in remove_for:
-                            out = out[:-10]
-
-                    # <a>
-                    out += f"\n\n<a name=\"{element.href}\"></a>"
-
-                    # Code block opener
-                    out += "\n```lua\n"
-                    out += filename + "." + element.name + " = {\n"
-
-                    # Get longest constant name
-                    length = 0
-                    for pair in element.values:
-                        length = max(len(pair[0]), length)
-
-                    # Add pairs
-                    for pair in element.values:
-                        if pair[0]:
-                            out += f"    {pair[0].ljust(length)}    = {pair[1]}  \n"
-                        else:
-                            out += "  \n"
-                    
-                    # Code block closer
-                    out += "}\n```"
-
-
-                case "Method":
-                    # Prefix
-                    prefix = filename + "."
-                    if element.is_instance:
-                        prefix = filename[0].lower() + filename[1:] + ":"
-
-                    # <a>
-                    out += f"\n\n<a name=\"{element.href}\"></a>"
-
-                    # Code block opener
-                    out += "\n```lua\n"
-
-                    # Method signature(s)
-                    for signature in element.signatures:
-
-                        # Name
-                        out += prefix + signature.name + "("
-
-                        # Params
-                        has_one = False
-
-                        for p in signature.params:
-                            if has_one:
-                                out += ", "
-                            out += p.name
-                            has_one = True
-
-                        for p in signature.optional:
-                            if has_one:
-                                out += ", "
-                            out += f"[{p.name}]"
-                            has_one = True
-
-                        # Return
-                        out += f") -> {signature.ret}  \n"
-
-                    # Code block closer
-                    out += "```\n\n"
-
-
-                    # Parameter table display function
-                    def parameter_table():
-                        string = "**Parameters**  "
-                        has_one = False
-                        for signature in element.signatures:
-                            if has_one:
-                                string += "\n"
-                            has_one = True
-                            if len(signature.params) + len(signature.optional) > 0:
-                                string += "\nParameter | Type | Description\n| - | - | -"
-                                for p in signature.params:
-                                    string += f"\n`{p.name}` | {p.type} | {p.text}"
-                                for p in signature.optional:
-                                    string += f"\n`[{p.name}]` | {p.type} | *Optional.* {p.text}"
-                            else:
-                                string += "\nNone"
-                        return string
-                    
-                    ptable_shown = False
-
-
-                    # Description
-                    for line in element.text:
-                        # Parameters
-                        if "@ptable" in line:
-                            out += parameter_table() + "  \n"
-                            ptable_shown = True
-
-                        elif "@findinfo" in line:
-                            out += "If no namespace is provided, searches globally in a non-deterministic* order.  \n\\* Guaranteed to check in your mod's namespace first.  \n"
-                        
-                        else:
-                            out += line + "  \n"
-
-                    # Display parameter table if not already shown
-                    if not ptable_shown:
-                        out += "\n" + parameter_table()
-                    else:
-                        out = out[:-2]  # Remove a \n
 
+# Output formats
+# Each renders the docs of a source to one file in its directory,
+# or to several if it has a `paginate` function (see `paginate`)
+FORMATS = {}
 
-    # Write to file
-    if out:
-        # Make directory if existn't
-        path = os.path.join(os.path.dirname(__file__), "out")
-        if not os.path.exists(path):
-            os.makedirs(path)
+def register_format(name, path, extension, generate, paginate = None):
+    FORMATS[name] = (path, extension, generate, paginate)
 
-        path = os.path.join(path, f"{filename}.md")
-        with open(path, "w") as f:
-            f.write(out)
+register_format("md",   OUT_PATH,  ".md",   generate, paginate)
+register_format("json", JSON_PATH, ".json", render_json.generate)
+register_format("html", HTML_PATH, ".html", functools.partial(render_html.generate, wiki = WIKI))
 
 
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
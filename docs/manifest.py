@@ -0,0 +1,130 @@
+# Build Manifest
+
+import hashlib
+import json
+import os
+
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+
+def hash_file(path):
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return hash_bytes(f.read())
+
+
+
+class Manifest():
+    """
+    Records the state of the last build for each source file
+    (source path -> content hash, parser and renderer versions, output hash of each format)
+
+    A source is only built again if its content hash or either version
+    changed, or if any of its output pages is missing or was modified
+
+    Also records the size of the unsplit Markdown page of each source
+    (used to lay out pages), so that it is only measured when the source changes
+    """
+
+    def __init__(self, path, parser_version, render_version):
+        self.path = path
+        self.parser_version = parser_version
+        self.render_version = render_version
+        self.entries = {}
+        self.sizes = {}
+        self.seen = set()
+
+        # Load previous manifest (if it exists and is valid)
+        if os.path.isfile(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                self.entries = data.get("entries", {})
+                self.sizes = data.get("sizes", {})
+            except (OSError, ValueError, AttributeError):
+                self.entries = {}
+                self.sizes = {}
+
+
+    def is_current(self, key, source_hash, out_paths):
+        """
+        `out_paths` is {format: path} for every format being built
+        """
+        self.seen.add(key)
+
+        entry = self.entries.get(key)
+        if not entry:
+            return False
+
+        if (entry["source"] != source_hash) or (entry.get("parser") != self.parser_version) or (entry.get("render") != self.render_version):
+            return False
+
+        outputs = entry.get("output")
+        if not isinstance(outputs, dict):
+            return False
+
+        for format, path in out_paths.items():
+            if format not in outputs:
+                return False
+
+            # Source produced no page
+            if outputs[format] is None:
+                continue
+
+            if hash_file(path) != outputs[format]:
+                return False
+
+        return True
+
+
+    def update(self, key, source_hash, output_hashes):
+        self.seen.add(key)
+        self.entries[key] = {
+            "source" : source_hash,
+            "parser" : self.parser_version,
+            "render" : self.render_version,
+            "output" : output_hashes
+        }
+
+
+    def size(self, key, source_hash, render_version):
+        """
+        Returns the recorded size of the unsplit Markdown page of a source,
+        or `None` if the source or either version changed since it was recorded
+        """
+        self.seen.add(key)
+
+        entry = self.sizes.get(key)
+        if (not entry) or (entry["source"] != source_hash) or (entry.get("parser") != self.parser_version) or (entry.get("render") != render_version):
+            return None
+        return entry["size"]
+
+
+    def update_size(self, key, source_hash, render_version, size):
+        self.seen.add(key)
+        self.sizes[key] = {
+            "source" : source_hash,
+            "parser" : self.parser_version,
+            "render" : render_version,
+            "size"   : size
+        }
+
+
+    def clear(self):
+        self.entries = {}
+        self.sizes = {}
+
+
+    def save(self):
+        # Drop sources that no longer exist
+        self.entries = {k: v for k, v in self.entries.items() if k in self.seen}
+        self.sizes = {k: v for k, v in self.sizes.items() if k in self.seen}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok = True)
+        with open(self.path, "w") as f:
+            json.dump({"entries": self.entries, "sizes": self.sizes}, f, indent = 4, sort_keys = True)
@@ -0,0 +1,112 @@
+# Element memory report
+# Compares the memory used by the slotted element model against
+# the previous dict-based model on a synthetic corpus of methods
+#
+# Usage: python docs/memory_report.py [number of methods]
+
+import sys
+import tracemalloc
+
+import element_types
+
+
+
+# ==================================================
+
+# Previous element model (plain classes with per-instance dicts)
+
+class DictMethod():
+    def __init__(self):
+        self.is_instance = False
+        self.signatures = [ DictSignature() ]
+        self.href = ""
+        self.text = []
+
+
+class DictSignature():
+    def __init__(self):
+        self.name = ""
+        self.ret = "nil"
+        self.params = []
+        self.optional = []
+
+
+class DictParam():
+    def __init__(self, name = "", type = "", text = ""):
+        self.name = name
+        self.type = type
+        self.text = text
+
+
+
+# ==================================================
+
+def build_corpus(count, Method, Signature, Param, intern):
+    """
+    Builds `count` methods the same way the parser does,
+    with names, types, and returns passed through `intern`
+    """
+    types = ["number", "string", "bool", "table", "Item", "Actor", "Instance", "function"]
+    corpus = []
+
+    for i in range(count):
+        method = Method()
+        method.is_instance = (i % 2 == 0)
+        method.text = [f"Description line {j} of method {i}." for j in range(2)]
+
+        # Every 4th method has an overload
+        for s in range(1 + (i % 4 == 0)):
+            signature = method.signatures[-1]
+            if s > 0:
+                signature = Signature()
+                method.signatures.append(signature)
+
+            signature.name = intern(f"method_{i % 2000}")
+            signature.ret = intern(f"{types[i % len(types)]}")
+
+            for p in range(i % 4):
+                param = Param(intern(f"arg{p}"), intern(types[(i + p) % len(types)]), f"Parameter {p} of method {i}.")
+                signature.params.append(param)
+
+            if i % 3 == 0:
+                signature.optional.append(Param(intern("namespace"), intern("string"), "The namespace to search in."))
+
+        method.href = intern(method.signatures[0].name)
+        corpus.append(method)
+
+    return corpus
+
+
+
+def measure(count, *model):
+    tracemalloc.start()
+    corpus = build_corpus(count, *model)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del corpus
+    return size, peak
+
+
+
+def main():
+    count = 100000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+
+    results = [
+        ("dict",    measure(count, DictMethod, DictSignature, DictParam, lambda s: s)),
+        ("slotted", measure(count, element_types.Method, element_types.Signature, element_types.Param, sys.intern))
+    ]
+
+    print(f"Synthetic corpus: {count} methods\n")
+    print(f"{'Model':<10}{'Retained':>14}{'Peak':>14}{'Per method':>14}")
+    for name, (size, peak) in results:
+        print(f"{name:<10}{size / 2**20:>11.1f} MB{peak / 2**20:>11.1f} MB{size / count:>12.0f} B")
+
+    saved = results[0][1][0] - results[1][1][0]
+    print(f"\nSaved {saved / 2**20:.1f} MB ({saved / results[0][1][0]:.0%})")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# PNG Codec
+# Reads and writes PNG files with only the standard library (zlib),
+# for the docs image assets and the palette tools
+
+import math
+import struct
+import zlib
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Channels of each color type (grayscale, RGB, indexed, grayscale + alpha, RGBA)
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# Ancillary chunks that change how the pixels look
+# (every other ancillary chunk is dropped when re-encoding)
+COLOR_CHUNKS = {b"PLTE", b"tRNS", b"sRGB", b"gAMA", b"cHRM", b"iCCP", b"sBIT"}
+
+
+
+class PNGError(Exception):
+    pass
+
+
+
+class Image():
+    """
+    Decoded PNG, with the unfiltered bytes of each row
+    """
+
+    __slots__ = ("width", "height", "bit_depth", "color_type", "rows", "chunks")
+
+    def __init__(self, width, height, bit_depth, color_type, rows = None, chunks = None):
+        self.width = width
+        self.height = height
+        self.bit_depth = bit_depth
+        self.color_type = color_type
+        self.rows = rows or []
+        self.chunks = chunks or []  # (type, data) of the color chunks, in file order
+
+
+    def pixel_size(self):
+        # Bytes per complete pixel (at least 1, as used by the filters)
+        return max(1, CHANNELS[self.color_type] * self.bit_depth // 8)
+
+
+    def row_size(self):
+        return (self.width * CHANNELS[self.color_type] * self.bit_depth + 7) // 8
+
+
+
+# ========== Chunks ==========
+
+def read_chunks(data):
+    """
+    Returns the (type, data) of every chunk up to IEND, checking their CRCs
+    """
+    if not data.startswith(SIGNATURE):
+        raise PNGError("not a PNG file")
+
+    chunks = []
+    pos = len(SIGNATURE)
+    while pos < len(data):
+        if pos + 8 > len(data):
+            raise PNGError("truncated chunk")
+        length, type = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        crc = data[pos + 8 + length:pos + 12 + length]
+        if (len(body) != length) or (len(crc) != 4):
+            raise PNGError(f"truncated {type.decode('latin-1')} chunk")
+        if zlib.crc32(type + body) != struct.unpack(">I", crc)[0]:
+            raise PNGError(f"bad CRC in {type.decode('latin-1')} chunk")
+
+        chunks.append((type, body))
+        pos += 12 + length
+        if type == b"IEND":
+            break
+
+    return chunks
+
+
+
+def write_chunk(type, body):
+    return struct.pack(">I", len(body)) + type + body + struct.pack(">I", zlib.crc32(type + body))
+
+
+
+# ========== Decoding ==========
+
+def decode(data):
+    """
+    Returns the Image of the bytes of a (non-interlaced) PNG file
+    """
+    chunks = read_chunks(data)
+    if (not chunks) or (chunks[0][0] != b"IHDR"):
+        raise PNGError("missing IHDR chunk")
+
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", chunks[0][1])
+    if color_type not in CHANNELS:
+        raise PNGError(f"unknown color type {color_type}")
+    if interlace:
+        raise PNGError("interlaced PNGs are not supported")
+
+    image = Image(width, height, bit_depth, color_type)
+    image.chunks = [(type, body) for type, body in chunks if type in COLOR_CHUNKS]
+
+    try:
+        raw = zlib.decompress(b"".join(body for type, body in chunks if type == b"IDAT"))
+    except zlib.error as e:
+        raise PNGError(f"bad image data ({e})")
+    image.rows = unfilter(raw, image.row_size(), image.pixel_size(), height)
+    return image
+
+
+
+def unfilter(raw, row_size, bpp, height):
+    rows = []
+    prior = bytearray(row_size)
+    pos = 0
+
+    for _ in range(height):
+        if pos + 1 + row_size > len(raw):
+            raise PNGError("truncated image data")
+        filter_type = raw[pos]
+        row = bytearray(raw[pos + 1:pos + 1 + row_size])
+        pos += 1 + row_size
+
+        match filter_type:
+            case 0:
+                pass
+            case 1:     # Sub
+                for i in range(bpp, row_size):
+                    row[i] = (row[i] + row[i - bpp]) & 0xFF
+            case 2:     # Up
+                for i in range(row_size):
+                    row[i] = (row[i] + prior[i]) & 0xFF
+            case 3:     # Average
+                for i in range(row_size):
+                    left = row[i - bpp] if i >= bpp else 0
+                    row[i] = (row[i] + ((left + prior[i]) >> 1)) & 0xFF
+            case 4:     # Paeth
+                for i in range(row_size):
+                    left = row[i - bpp] if i >= bpp else 0
+                    upper_left = prior[i - bpp] if i >= bpp else 0
+                    row[i] = (row[i] + paeth(left, prior[i], upper_left)) & 0xFF
+            case _:
+                raise PNGError(f"unknown filter type {filter_type}")
+
+        rows.append(bytes(row))
+        prior = row
+
+    return rows
+
+
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if (pa <= pb) and (pa <= pc):
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+
+def to_rgba(image):
+    """
+    Returns the pixels of an 8-bit image as RGBA bytes (row-major)
+    """
+    if image.bit_depth != 8:
+        raise PNGError(f"bit depth {image.bit_depth} is not supported (only 8)")
+
+    data = b"".join(image.rows)
+    match image.color_type:
+        case 6:
+            return data
+        case 2:
+            rgba = bytearray(len(data) // 3 * 4)
+            for i in range(3):
+                rgba[i::4] = data[i::3]
+            rgba[3::4] = b"\xff" * (len(data) // 3)
+            return bytes(rgba)
+        case 0 | 4:
+            step = CHANNELS[image.color_type]
+            rgba = bytearray(len(data) // step * 4)
+            for i in range(3):
+                rgba[i::4] = data[0::step]
+            rgba[3::4] = data[1::2] if step == 2 else b"\xff" * len(data)
+            return bytes(rgba)
+        case 3:
+            chunks = dict(image.chunks)
+            palette = chunks.get(b"PLTE", b"")
+            alpha = chunks.get(b"tRNS", b"")
+            colors = [palette[i * 3:i * 3 + 3] + (alpha[i:i + 1] or b"\xff") for i in range(len(palette) // 3)]
+            try:
+                return b"".join(colors[index] for index in data)
+            except IndexError:
+                raise PNGError("pixel index outside of the palette")
+
+
+
+def from_rgba(width, height, rgba):
+    """
+    Returns the Image of RGBA bytes (row-major)
+    """
+    row_size = width * 4
+    return Image(width, height, 8, 6, [rgba[y * row_size:(y + 1) * row_size] for y in range(height)])
+
+
+
+# ========== Encoding ==========
+
+def encode(image, adaptive = True, level = 9):
+    """
+    Returns the bytes of a PNG file of the image; `adaptive` picks
+    the filter of each row by the minimum sum of absolute differences
+    (otherwise no rows are filtered, which is often smaller for pixel art)
+    """
+    header = struct.pack(">IIBBBBB", image.width, image.height, image.bit_depth, image.color_type, 0, 0, 0)
+    raw = filter_rows(image.rows, image.pixel_size(), adaptive)
+
+    data = SIGNATURE + write_chunk(b"IHDR", header)
+    for type, body in image.chunks:
+        data += write_chunk(type, body)
+    data += write_chunk(b"IDAT", zlib.compress(raw, level))
+    data += write_chunk(b"IEND", b"")
+    return data
+
+
+
+def filter_rows(rows, bpp, adaptive):
+    raw = bytearray()
+    prior = bytes(len(rows[0])) if rows else b""
+
+    for row in rows:
+        if adaptive:
+            candidates = [filter_row(filter_type, row, prior, bpp) for filter_type in range(5)]
+            raw += min(candidates, key = lambda filtered: sum(b if b < 128 else 256 - b for b in filtered[1:]))
+        else:
+            raw += b"\0" + row
+        prior = row
+
+    return bytes(raw)
+
+
+
+def filter_row(filter_type, row, prior, bpp):
+    filtered = bytearray([filter_type]) + row
+    if filter_type == 0:
+        return filtered
+
+    for i in range(len(row)):
+        left = row[i - bpp] if i >= bpp else 0
+        match filter_type:
+            case 1: predicted = left
+            case 2: predicted = prior[i]
+            case 3: predicted = (left + prior[i]) >> 1
+            case 4: predicted = paeth(left, prior[i], prior[i - bpp] if i >= bpp else 0)
+        filtered[i + 1] = (row[i] - predicted) & 0xFF
+
+    return filtered
+
+
+
+# ========== Optimization ==========
+
+def downscale(image, factor):
+    """
+    Returns the image shrunk by an integer factor (nearest neighbor,
+    which keeps pixel art sharp); only for bit depths of 8 and 16
+    """
+    bpp = image.pixel_size()
+    columns = range(0, image.width, factor)
+    rows = []
+    for row in image.rows[::factor]:
+        rows.append(b"".join(row[x * bpp:(x + 1) * bpp] for x in columns))
+    return Image(len(columns), len(rows), image.bit_depth, image.color_type, rows, list(image.chunks))
+
+
+
+def optimize(data, max_side = None):
+    """
+    Returns the smallest of the PNG and its lossless re-encodings,
+    after downscaling it if a side is longer than `max_side`
+    (returns the data unchanged if it cannot be decoded)
+    """
+    try:
+        image = decode(data)
+    except PNGError:
+        return data
+
+    candidates = [data]
+    if max_side and (max(image.width, image.height) > max_side) and (image.bit_depth >= 8):
+        image = downscale(image, math.ceil(max(image.width, image.height) / max_side))
+        candidates = []
+
+    for adaptive in (False, True):
+        candidates.append(encode(image, adaptive))
+    return min(candidates, key = len)
@@ -0,0 +1,192 @@
+# Build Profile
+# Records the wall time and memory allocated per source file
+# and per phase of the docs build (`python docs/main.py --profile`)
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+
+global PROFILE_VERSION; PROFILE_VERSION = 1
+
+# Phases in pipeline order
+# `parse_code` runs within `parse_block`, so its time is counted in both
+PHASES = ["read", "cache", "split", "parse_block", "parse_code", "images", "layout", "generate", "write"]
+NESTED = {"parse_code"}
+
+NULL_PHASE = contextlib.nullcontext()
+END = object()      # Marks the end of an iterator being measured
+
+
+
+class Profile():
+    """
+    Wall time and net allocations of each phase of each file
+
+    Does nothing until enabled, so that the instrumented
+    code costs almost nothing in a normal build
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.key = None
+        self.files = {}     # Source key -> {phase: [calls, seconds, net bytes allocated]}
+        self.peaks = {}     # Source key -> peak bytes allocated while processing the file
+
+
+    def enable(self, trace_memory = True):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+    def file(self, key):
+        """
+        Attributes the phases within the context to a source file
+        (by its key, the path relative to `core`)
+        """
+        if not self.enabled:
+            return NULL_PHASE
+        return self.measure_file(key)
+
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return self.measure(name)
+
+
+    def iterate(self, name, iterable):
+        """
+        Returns the iterable, counting the time taken
+        to produce each item as the given phase
+        (for generators that are consumed a step at a time)
+        """
+        if not self.enabled:
+            return iterable
+        return self.measure_iterate(name, iterable)
+
+
+    @contextlib.contextmanager
+    def measure_file(self, key):
+        previous = self.key
+        self.key = key
+        if self.trace_memory:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - start_memory
+                self.peaks[key] = max(self.peaks.get(key, 0), peak)
+            self.key = previous
+
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        start_memory = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = (tracemalloc.get_traced_memory()[0] - start_memory) if self.trace_memory else 0
+            self.record(name, elapsed, allocated)
+
+
+    def measure_iterate(self, name, iterable):
+        iterator = iter(iterable)
+        while True:
+            with self.measure(name):
+                item = next(iterator, END)
+            if item is END:
+                return
+            yield item
+
+
+    def record(self, name, seconds, allocated, calls = 1):
+        phases = self.files.setdefault(self.key or "(none)", {})
+        entry = phases.setdefault(name, [0, 0.0, 0])
+        entry[0] += calls
+        entry[1] += seconds
+        entry[2] += allocated
+
+
+    # ========== Worker Processes ==========
+
+    def take(self, key):
+        """
+        Removes and returns what was recorded for a file,
+        so that a worker process can send it back with its results
+        """
+        return self.files.pop(key, {}), self.peaks.pop(key, None)
+
+
+    def merge(self, key, taken):
+        phases, peak = taken
+        self.key, previous = key, self.key
+        for name, (calls, seconds, allocated) in phases.items():
+            self.record(name, seconds, allocated, calls)
+        self.key = previous
+        if peak is not None:
+            self.peaks[key] = max(self.peaks.get(key, 0), peak)
+
+
+    # ========== Summary ==========
+
+    def summary(self, wall_time):
+        """
+        Returns the JSON summary of the build, with the slowest files first
+        """
+        def entry(calls, seconds, allocated):
+            return {"calls": calls, "seconds": round(seconds, 6), "net_allocated": allocated}
+
+        files = {}
+        totals = {}
+        for key, phases in self.files.items():
+            files[key] = {
+                "seconds"       : round(sum(seconds for name, (_, seconds, _) in phases.items() if name not in NESTED), 6),
+                "peak_memory"   : self.peaks.get(key),
+                "phases"        : {name: entry(*phases[name]) for name in PHASES if name in phases},
+            }
+            for name, values in phases.items():
+                total = totals.setdefault(name, [0, 0.0, 0])
+                for i in range(3):
+                    total[i] += values[i]
+
+        return {
+            "version"       : PROFILE_VERSION,
+            "wall_time"     : round(wall_time, 6),
+            "trace_memory"  : self.trace_memory,
+            "phases"        : {name: entry(*totals[name]) for name in PHASES if name in totals},
+            "files"         : dict(sorted(files.items(), key = lambda pair: (-pair[1]["seconds"], pair[0]))),
+        }
+
+
+    def save(self, path, wall_time):
+        summary = self.summary(wall_time)
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        with open(path, "w") as f:
+            json.dump(summary, f, indent = 4)
+        return summary
+
+
+
+def print_summary(summary, top = 10):
+    print(f"\nBuild took {summary['wall_time'] * 1000:.1f} ms")
+
+    print(f"\n{'Phase':<14}{'Calls':>8}{'Time':>12}{'Net alloc':>14}")
+    for name, phase in summary["phases"].items():
+        indent = "  " if name in NESTED else ""
+        print(f"{indent + name:<14}{phase['calls']:>8}{phase['seconds'] * 1000:>9.1f} ms{phase['net_allocated'] / 2**10:>11.1f} KB")
+
+    print(f"\n{'Slowest files':<36}{'Time':>12}{'Peak':>14}  Slowest phase")
+    for key, file in list(summary["files"].items())[:top]:
+        phases = {name: phase for name, phase in file["phases"].items() if name not in NESTED}
+        slowest = max(phases, key = lambda name: phases[name]["seconds"]) if phases else "-"
+        peak = f"{file['peak_memory'] / 2**10:.1f} KB" if file["peak_memory"] is not None else "-"
+        print(f"{key:<36}{file['seconds'] * 1000:>9.1f} ms{peak:>14}  {slowest}")
@@ -0,0 +1,209 @@
+# HTML Renderer
+# Static HTML page for each class
+
+import html
+import re
+
+from assets import IMAGE_MARKER
+from element_types import *
+from links import section_href
+
+LINK_PATTERN    = re.compile(r"\[([^\]]*)\]\(([^)]*)\)")
+BOLD_PATTERN    = re.compile(r"\*\*(.+?)\*\*")
+ITALIC_PATTERN  = re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])")
+CODE_PATTERN    = re.compile(r"`([^`]+)`")
+TABLE_DIVIDER   = re.compile(r"^\|?\s*-+\s*(\|\s*-+\s*)*\|?\s*$")
+IMAGE_PATTERN   = re.compile(r"!\[([^\]]*)\]\(" + re.escape(IMAGE_MARKER) + r"([^)]*)\)")
+
+
+
+def generate(docs, filename, out, wiki = ""):
+    """
+    Streams the HTML for the page to `out`;
+    links to the wiki are rewritten to the other HTML pages
+    """
+    sections = [(section_id, section) for section_id, section in docs["sections"].items() if section_id and section]
+    description = docs["sections"].get(None)
+    if not (sections or description):
+        return
+
+    def inline(line):
+        return format_inline(line, wiki)
+
+    out.write(f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{filename}</title>\n</head>\n<body>\n<h1>{filename}</h1>\n")
+
+    # Class top description
+    if description:
+        write_text(description[0].text or [], inline, out)
+
+    # Index
+    if sections:
+        out.write("<nav>\n<ul>\n")
+        for section_id, section in sections:
+            out.write(f"<li><a href=\"#{section_href(section_id)}\"><b>{html.escape(section_id)}</b></a></li>\n")
+        out.write("</ul>\n</nav>\n")
+
+    # Sections
+    for section_id, section in sections:
+        out.write(f"<hr>\n<h2 id=\"{section_href(section_id)}\">{html.escape(section_id)}</h2>\n")
+        for element in section:
+            match element:
+                case Text():
+                    write_text(element.text or [], inline, out)
+                case Constants():
+                    write_pairs(filename + ".", "", element.values, out)
+                case Enum():
+                    out.write(f"<a id=\"{element.href}\"></a>\n")
+                    write_pairs("    ", f"{filename}.{element.name} = {{\n", element.values, out, "}\n")
+                case Method():
+                    write_method(element, filename, inline, out)
+
+    out.write("</body>\n</html>\n")
+
+
+
+def format_inline(line, wiki):
+    if wiki:
+        line = line.replace(wiki + "/", "")
+
+    line = CODE_PATTERN.sub(lambda m: f"<code>{html.escape(m.group(1))}</code>", line)
+
+    # Images are shown from `core` (pages are in `docs/html`)
+    line = IMAGE_PATTERN.sub(lambda m: f"<img src=\"../../core/{m.group(2)}\" alt=\"{html.escape(m.group(1))}\">", line)
+    line = LINK_PATTERN.sub(lambda m: f"<a href=\"{local_href(m.group(2))}\">{m.group(1)}</a>", line)
+    line = BOLD_PATTERN.sub(r"<b>\1</b>", line)
+    line = ITALIC_PATTERN.sub(r"<i>\1</i>", line)
+    return line
+
+
+
+def local_href(href):
+    # e.g., "Item#find" -> "Item.html#find"
+    if href.startswith(("http://", "https://", "#")):
+        return href
+    page, hash, anchor = href.partition("#")
+    return f"{page}.html{hash}{anchor}"
+
+
+
+def write_text(lines, inline, out):
+    """
+    Writes lines of Markdown text, as paragraphs and tables
+    """
+    i = 0
+    paragraph = []
+
+    def flush():
+        if paragraph:
+            out.write("<p>" + "<br>\n".join(inline(line) for line in paragraph) + "</p>\n")
+            paragraph.clear()
+
+    while i < len(lines):
+        line = lines[i]
+
+        # Code block
+        if line.strip().startswith("```"):
+            flush()
+            i += 1
+            code = []
+            while (i < len(lines)) and not lines[i].strip().startswith("```"):
+                code.append(html.escape(lines[i]))
+                i += 1
+            out.write("<pre><code>" + "\n".join(code) + "</code></pre>\n")
+            i += 1
+            continue
+
+        # Table (header row followed by a divider row)
+        if ("|" in line) and (i + 1 < len(lines)) and TABLE_DIVIDER.match(lines[i + 1].strip()):
+            flush()
+            rows = [line]
+            i += 2
+            while (i < len(lines)) and ("|" in lines[i]):
+                rows.append(lines[i])
+                i += 1
+            write_table(rows, inline, out)
+            continue
+
+        if line.strip():
+            paragraph.append(line)
+        else:
+            flush()
+        i += 1
+
+    flush()
+
+
+
+def write_table(rows, inline, out):
+    out.write("<table>\n")
+    for r in range(len(rows)):
+        cells = [cell.strip() for cell in rows[r].strip().strip("|").split("|")]
+        tag = "th" if r == 0 else "td"
+        out.write("<tr>" + "".join(f"<{tag}>{inline(cell)}</{tag}>" for cell in cells) + "</tr>\n")
+    out.write("</table>\n")
+
+
+
+def write_pairs(prefix, opener, values, out, closer = ""):
+    length = 0
+    for pair in values:
+        length = max(len(pair[0]), length)
+
+    out.write("<pre><code>" + html.escape(opener))
+    for pair in values:
+        if pair[0]:
+            out.write(html.escape(f"{prefix}{pair[0].ljust(length)}    = {pair[1]}") + "\n")
+        else:
+            out.write("\n")
+    out.write(html.escape(closer) + "</code></pre>\n")
+
+
+
+def write_method(element, filename, inline, out):
+    prefix = filename + "."
+    if element.is_instance:
+        prefix = filename[0].lower() + filename[1:] + ":"
+
+    # Signature(s)
+    out.write(f"<a id=\"{element.href}\"></a>\n<pre><code>")
+    for signature in element.signatures:
+        params = [p.name for p in signature.params] + [f"[{p.name}]" for p in signature.optional]
+        out.write(html.escape(f"{prefix}{signature.name}({', '.join(params)}) -> {signature.ret}") + "\n")
+    out.write("</code></pre>\n")
+
+    # Description
+    ptable_shown = False
+    text = []
+    for line in element.text:
+        if "@ptable" in line:
+            write_text(text, inline, out)
+            text = []
+            write_parameter_table(element, inline, out)
+            ptable_shown = True
+
+        elif "@findinfo" in line:
+            text.extend(["If no namespace is provided, searches globally in a non-deterministic* order.", "* Guaranteed to check in your mod's namespace first."])
+
+        else:
+            text.append(line)
+    write_text(text, inline, out)
+
+    # Display parameter table if not already shown
+    if not ptable_shown:
+        write_parameter_table(element, inline, out)
+
+
+
+def write_parameter_table(element, inline, out):
+    out.write("<p><b>Parameters</b></p>\n")
+    for signature in element.signatures:
+        if len(signature.params) + len(signature.optional) <= 0:
+            out.write("<p>None</p>\n")
+            continue
+
+        out.write("<table>\n<tr><th>Parameter</th><th>Type</th><th>Description</th></tr>\n")
+        for p in signature.params:
+            out.write(f"<tr><td><code>{html.escape(p.name)}</code></td><td>{inline(p.type)}</td><td>{inline(p.text)}</td></tr>\n")
+        for p in signature.optional:
+            out.write(f"<tr><td><code>[{html.escape(p.name)}]</code></td><td>{inline(p.type)}</td><td><i>Optional.</i> {inline(p.text)}</td></tr>\n")
+        out.write("</table>\n")
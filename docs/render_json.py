@@ -0,0 +1,60 @@
+# JSON Renderer
+# API dump of each class (e.g., for editor autocompletion)
+
+import json
+
+from element_types import *
+
+
+
+def generate(docs, filename, out):
+    """
+    Streams the JSON for the page to `out`
+    """
+    sections = []
+    for section_id, section in docs["sections"].items():
+        if section:
+            sections.append({
+                "name"      : section_id,
+                "elements"  : [element_to_json(element) for element in section]
+            })
+
+    if sections:
+        json.dump({"class": filename, "sections": sections}, out, indent = 4)
+        out.write("\n")
+
+
+
+def element_to_json(element):
+    match element:
+
+        case Text():
+            return {"type": "Text", "text": element.text}
+
+        case Constants():
+            return {"type": "Constants", "values": [list(pair) for pair in element.values if pair[0]]}
+
+        case Enum():
+            return {"type": "Enum", "name": element.name, "href": element.href, "values": [list(pair) for pair in element.values if pair[0]]}
+
+        case Method():
+            return {
+                "type"          : "Method",
+                "is_instance"   : element.is_instance,
+                "href"          : element.href,
+                "text"          : element.text,
+                "signatures"    : [
+                    {
+                        "name"      : signature.name,
+                        "return"    : signature.ret,
+                        "params"    : [param_to_json(p) for p in signature.params],
+                        "optional"  : [param_to_json(p) for p in signature.optional]
+                    }
+                    for signature in element.signatures
+                ]
+            }
+
+
+
+def param_to_json(param):
+    return {"name": param.name, "type": param.type, "text": param.text}
@@ -0,0 +1,193 @@
+# Search Index
+
+import json
+import os
+import re
+import shutil
+
+from element_types import *
+from links import section_href
+
+global MAX_SHARD_BYTES; MAX_SHARD_BYTES = 16 * 1024
+
+URL_PATTERN  = re.compile(r"\]\([^)]*\)")       # Markdown link target, e.g., `](https://...)`
+WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it", "its",
+    "nil", "not", "of", "on", "or", "that", "the", "this", "to", "will", "with"
+}
+
+
+
+def tokenize(string):
+    string = URL_PATTERN.sub("]", string.lower())
+    return [word for word in WORD_PATTERN.findall(string) if (len(word) > 1) and (word not in STOP_WORDS)]
+
+
+
+class SearchIndex():
+    """
+    Search index of the wiki, built from parsed docs
+        * Documents     every searchable element (qualified name, page, anchor)
+        * Terms         inverted index of names, parameter names/types, and description words
+        * Names         prefix trie of lowercase qualified names (e.g., `item.find`, `actor:item_give`)
+
+    Terms and names are split into shards by key prefix,
+    so that a client only has to load the shards it needs
+    """
+
+    def __init__(self, layout = None):
+        self.layout = layout    # Points documents of split pages at their subpages
+        self.documents = []
+        self.terms = {}     # term -> set of document IDs
+        self.names = {}     # lowercase qualified name -> set of document IDs
+
+
+    def add_document(self, name, page, href, kind, words):
+        if self.layout:
+            page = self.layout.locate(page, href)
+
+        id = len(self.documents)
+        self.documents.append([name, page, href, kind])
+
+        self.names.setdefault(name.lower(), set()).add(id)
+        for word in tokenize(name) + words:
+            self.terms.setdefault(word, set()).add(id)
+
+
+    def add(self, page, docs):
+        static_prefix = f"{page}."
+        instance_prefix = f"{page[0].lower() + page[1:]}:"
+
+        for section_id, section in docs["sections"].items():
+            for element in section:
+                match element:
+
+                    # Class description
+                    case Text() if section_id is None:
+                        words = []
+                        for line in element.text or []:
+                            words.extend(tokenize(line))
+                        self.add_document(page, page, "", "Page", words)
+
+                    case Constants():
+                        for name, _ in element.values:
+                            if name:
+                                self.add_document(static_prefix + name, page, section_href(section_id), "Constant", [])
+
+                    case Enum():
+                        words = [word for pair in element.values for word in tokenize(pair[0])]
+                        self.add_document(static_prefix + element.name, page, element.href, "Enum", words)
+
+                    case Method():
+                        words = []
+                        for line in element.text:
+                            words.extend(tokenize(line))
+                        for signature in element.signatures:
+                            for p in signature.params + signature.optional:
+                                words.extend(tokenize(p.name) + tokenize(p.type) + tokenize(p.text))
+                            words.extend(tokenize(signature.ret))
+
+                        prefix = instance_prefix if element.is_instance else static_prefix
+                        for name in dict.fromkeys(signature.name for signature in element.signatures):
+                            self.add_document(prefix + name, page, element.href, "Method", words)
+
+
+    def save(self, path):
+        """
+        Writes the index to a directory:
+            index.json          Documents, and the shard of each key prefix
+            terms/<prefix>.json
+            names/<prefix>.json
+        """
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+        manifest = {
+            "documents" : self.documents,
+            "terms"     : write_shards(os.path.join(path, "terms"), self.terms.keys(), lambda keys: {k: sorted(self.terms[k]) for k in keys}),
+            "names"     : write_shards(os.path.join(path, "names"), self.names.keys(), lambda keys: build_trie({k: sorted(self.names[k]) for k in keys}))
+        }
+
+        with open(os.path.join(path, "index.json"), "w") as f:
+            json.dump(manifest, f, separators = (",", ":"))
+
+
+
+def write_shards(path, keys, serialize, depth = 1):
+    """
+    Groups keys by prefix and writes each group to its own shard,
+    splitting groups over `MAX_SHARD_BYTES` by a longer prefix;
+    returns the list of shard prefixes
+
+    Keys that are shorter than the longer prefix go
+    in a separate shard, named `<prefix>$`
+    """
+    groups = {}
+    for key in keys:
+        groups.setdefault(key[:depth], []).append(key)
+
+    shards = []
+    for group_prefix, keys in sorted(groups.items()):
+        data = json.dumps(serialize(sorted(keys)), separators = (",", ":"))
+
+        # Split further if too large (and if keys are long enough to split)
+        if (len(data) > MAX_SHARD_BYTES) and any(len(key) > depth for key in keys):
+            exact = [key for key in keys if len(key) <= depth]
+            if exact:
+                shards.append(write_shard(path, group_prefix + "$", serialize(exact)))
+            shards.extend(write_shards(path, [key for key in keys if len(key) > depth], serialize, depth + 1))
+            continue
+
+        shards.append(write_shard(path, group_prefix, data))
+
+    return shards
+
+
+
+def write_shard(path, prefix, data):
+    if not isinstance(data, str):
+        data = json.dumps(data, separators = (",", ":"))
+
+    os.makedirs(path, exist_ok = True)
+    filename = "".join(c if c.isalnum() or c == "_" else f"%{ord(c):02x}" for c in prefix)
+    with open(os.path.join(path, filename + ".json"), "w") as f:
+        f.write(data)
+    return prefix
+
+
+
+def build_trie(table):
+    """
+    Returns a compressed prefix trie of the keys, where each node is
+    `{"$": [document IDs], <edge label>: <child node>, ...}`
+    """
+    root = {}
+    for key, ids in table.items():
+        node = root
+        for c in key:
+            node = node.setdefault(c, {})
+        node["$"] = ids
+
+    return compress(root)
+
+
+
+def compress(node):
+    compressed = {}
+    for label, child in node.items():
+        if label == "$":
+            compressed[label] = child
+            continue
+
+        # Merge chains of single children into one edge
+        while ("$" not in child) and (len(child) == 1):
+            (next_label, next_child), = child.items()
+            label += next_label
+            child = next_child
+
+        compressed[label] = compress(child)
+    return compressed
+
@@ -0,0 +1,126 @@
+# Source Discovery
+
+import fnmatch
+import json
+import os
+import re
+
+IGNORE_PATTERN = re.compile(r"local ignore = \{(.*?)\}", re.DOTALL)
+IGNORE_ENTRY_PATTERN = re.compile(r"\[\"([^\"]+)\"\]\s*=\s*true")
+
+INDEX_VERSION = 1
+
+
+
+class SourceError(Exception):
+    pass
+
+
+
+def ignored_dirs(main_path):
+    """
+    Returns the set of `core` directories in the `ignore` table of `main.lua`
+    """
+    with open(main_path, "r", encoding = "utf-8") as f:
+        m = IGNORE_PATTERN.search(f.read())
+    if not m:
+        raise SourceError(f"{main_path} has no `local ignore = {{ ... }}` table")
+    return set(IGNORE_ENTRY_PATTERN.findall(m.group(1)))
+
+
+
+class SourceIndex():
+    """
+    Finds the Lua files in `core` that `main.lua` loads (skipping the
+    directories in its `ignore` table), minus those matching an exclude glob
+
+    Sources are sorted by key (path relative to `core`) in load order, and the
+    listing is cached against the modification times of the directories,
+    which change whenever a file is added, removed, or renamed
+    """
+
+    def __init__(self, core_path, main_path, exclude = (), cache_path = None):
+        self.core_path = core_path
+        self.main_path = main_path
+        self.exclude = list(exclude)    # Globs matched against keys (e.g., "7_Content_Classes/__template.lua")
+        self.cache_path = cache_path
+        self.stamps = None              # Modification times of `core`, `main.lua`, and each directory at the last scan
+        self.sources = None             # (key, page name) of each source
+
+        # Load previous index (if it exists and was made with the same rules)
+        if cache_path and os.path.isfile(cache_path):
+            try:
+                with open(cache_path, "r") as f:
+                    index = json.load(f)
+                if (index.get("version") == INDEX_VERSION) and (index.get("exclude") == self.exclude):
+                    self.stamps = index["stamps"]
+                    self.sources = [tuple(source) for source in index["sources"]]
+            except (OSError, ValueError, KeyError):
+                pass
+
+
+    def find(self):
+        """
+        Returns a list of (file path, page name) for every source,
+        raising SourceError if two sources would write the same page
+        """
+        stamps = self.scan_stamps()
+        if (self.sources is None) or (stamps != self.stamps):
+            self.sources = self.scan(stamps)
+            self.stamps = stamps
+            self.save()
+        return [(os.path.join(self.core_path, *key.split("/")), page) for key, page in self.sources]
+
+
+    def scan_stamps(self):
+        # `main.lua` is stamped too, since it holds the ignore set
+        stamps = {"core": mtime(self.core_path), "main.lua": mtime(self.main_path), "dirs": {}}
+        for dir in sorted(os.listdir(self.core_path)):
+            dir_path = os.path.join(self.core_path, dir)
+            if os.path.isdir(dir_path):
+                stamps["dirs"][dir] = mtime(dir_path)
+        return stamps
+
+
+    def scan(self, stamps):
+        ignore = ignored_dirs(self.main_path)
+        sources = []
+        pages = {}
+
+        # Loop through all loaded directories in `core`
+        for dir in sorted(stamps["dirs"], key = str.upper):
+            if dir in ignore:
+                continue
+
+            # Loop through all Lua files in directory
+            for filename in sorted(os.listdir(os.path.join(self.core_path, dir)), key = str.upper):
+                key = f"{dir}/{filename}"
+                if (not filename.endswith(".lua")) or any(fnmatch.fnmatchcase(key, glob) for glob in self.exclude):
+                    continue
+
+                page = filename.split(".")[0]
+                if page in pages:
+                    raise SourceError(f"{pages[page]} and {key} would both write the page '{page}'")
+                pages[page] = key
+                sources.append((key, page))
+
+        return sources
+
+
+    def save(self):
+        if not self.cache_path:
+            return
+        index = {
+            "version"   : INDEX_VERSION,
+            "exclude"   : self.exclude,
+            "stamps"    : self.stamps,
+            "sources"   : self.sources,
+        }
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok = True)
+        with open(self.cache_path, "w") as f:
+            json.dump(index, f, indent = 4)
+
+
+
+def mtime(path):
+    return os.stat(path).st_mtime_ns
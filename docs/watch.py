@@ -0,0 +1,43 @@
+# Source Watcher
+
+import os
+
+
+
+class Watcher():
+    """
+    Polls a set of files for changes using their
+    modification times and sizes (no extra services needed)
+    """
+
+    def __init__(self, paths):
+        self.stats = {path: stat(path) for path in paths}
+
+
+    def poll(self, paths):
+        """
+        Takes the current list of files, and returns
+        (changed or added paths, removed paths)
+        """
+        changed = []
+        for path in paths:
+            current = stat(path)
+            if current != self.stats.get(path):
+                self.stats[path] = current
+                changed.append(path)
+
+        paths = set(paths)
+        removed = [path for path in self.stats if path not in paths]
+        for path in removed:
+            del self.stats[path]
+
+        return changed, removed
+
+
+
+def stat(path):
+    try:
+        result = os.stat(path)
+        return (result.st_mtime_ns, result.st_size)
+    except OSError:
+        return None
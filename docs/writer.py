@@ -0,0 +1,79 @@
+# Page Writer
+
+import hashlib
+import os
+import tempfile
+
+from manifest import hash_file
+
+global BUFFER_SIZE; BUFFER_SIZE = 64 * 1024
+
+
+
+class PageWriter():
+    """
+    Streams a page to a temporary file through a write buffer,
+    hashing it as it goes
+
+    The page only replaces the existing one when `commit` is called,
+    and only if its bytes changed
+    """
+
+    def __init__(self, out_path, filename, extension = ".md"):
+        self.path = os.path.join(out_path, filename + extension)
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+        os.makedirs(out_path, exist_ok = True)
+        fd, self.temp_path = tempfile.mkstemp(prefix = f".{filename}{extension}.", suffix = ".tmp", dir = out_path)
+        self.file = os.fdopen(fd, "wb", buffering = BUFFER_SIZE)
+
+
+    def write(self, chunk):
+        data = chunk.encode("utf-8")
+        self.hash.update(data)
+        self.size += len(data)
+        self.file.write(data)
+
+
+    def close(self):
+        """
+        Finishes writing, and returns the hash of the page
+        (or `None` if nothing was written)
+        """
+        if not self.file.closed:
+            self.file.close()
+
+        if self.size <= 0:
+            self.discard()
+            return None
+        return self.hash.hexdigest()
+
+
+    def discard(self):
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type:
+            self.discard()
+
+
+
+def commit_page(path, temp_path, output_hash):
+    """
+    Moves a finished page into place,
+    unless the existing page has the same bytes
+    """
+    if hash_file(path) == output_hash:
+        os.remove(temp_path)
+    else:
+        os.chmod(temp_path, 0o644)  # `mkstemp` creates files readable only by the owner
+        os.replace(temp_path, path)
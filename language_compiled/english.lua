@@ -0,0 +1,15 @@
+-- Compiled language: english
+-- Generated by tools/compile_language.py from language; do not edit
+-- sources: 95aa0fcce57989bc0a0a60cc1c15c4c1b52d9539f9f1ba0f9f2eadbe722535a9
+
+return {
+    ["achievement.unlock_commando.description"] = "And so it begins.",
+    ["achievement.unlock_commando.name"] = "Genesis",
+    ["achievement.unlock_huntress.description"] = "What dangers lie ahead?",
+    ["achievement.unlock_huntress.name"] = "Predator",
+    ["ui.options.rapi.disableMPBlock"] = "Disable Online Button Block",
+    ["ui.options.rapi.disableMPBlock.desc"] = "Allows for accessing online multiplayer even if there are incompatible mods.",
+    ["ui.options.rapi.header"] = "RETURNSAPI",
+    ["ui.options.rapi.simplerConsoleBind"] = "Simpler Console Bind",
+    ["ui.options.rapi.simplerConsoleBind.desc"] = "Require only <y>`</c> to open the console instead of <y>Shift + `</c>.",
+}
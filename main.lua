@@ -18,17 +18,27 @@ if run_on_hotload then
 end
 
 -- Load core
-local ignore = {
-    ["data"]    = true,
-    ["sprites"] = true,
-    ["unused"]  = true,
-}
-local dirs = path.get_directories(PATH.."core")
-for _, dir in ipairs(dirs) do
-    if not ignore[path.filename(dir)] then
-        local files = path.get_files(dir)
-        for _, file in ipairs(files) do
-            require(file)
+-- Release builds ship `core_bundle.lua`, which contains every core file in the same
+-- order as below, along with the `core_bundle.release` marker (both written by
+-- `tools/bundle.py --release`); without the marker, the bundle is never loaded,
+-- so that a bundle left over in a dev checkout cannot shadow edits to `core`
+local bundle = PATH.."core_bundle.lua"
+if path.exists(PATH.."core_bundle.release") and path.exists(bundle) then
+    require(bundle)
+
+else
+    local ignore = {
+        ["data"]    = true,
+        ["sprites"] = true,
+        ["unused"]  = true,
+    }
+    local dirs = path.get_directories(PATH.."core")
+    for _, dir in ipairs(dirs) do
+        if not ignore[path.filename(dir)] then
+            local files = path.get_files(dir)
+            for _, file in ipairs(files) do
+                require(file)
+            end
         end
     end
 end
@@ -0,0 +1,194 @@
+# Core bundler
+# Strips comments from every file that `main.lua` loads from `core`,
+# and joins them into one chunk (`core_bundle.lua`) in the same load order
+#
+# Usage:
+#   python tools/bundle.py              Write the bundle
+#   python tools/bundle.py --release    Write the bundle and the release marker, so that `main.lua` loads it
+#   python tools/bundle.py --check      Check that the bundle is up to date and equivalent to `core`
+#
+# `main.lua` only loads the bundle when the release marker is next to it,
+# which writing the bundle without `--release` removes
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+from lua_lexer import code_tokens, strip_comments
+
+global ROOT_PATH; ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+global BUNDLE_PATH; BUNDLE_PATH = os.path.join(ROOT_PATH, "core_bundle.lua")
+global RELEASE_PATH; RELEASE_PATH = os.path.join(ROOT_PATH, "core_bundle.release")
+
+# `main.lua`'s ignore table is parsed by the docs source discovery
+sys.path.insert(0, os.path.join(ROOT_PATH, "docs"))
+from sources import ignored_dirs
+
+MARKER = "-- [bundle] "
+
+
+
+def load_order(root = ROOT_PATH):
+    """
+    Returns the paths (relative to the root) of the core files,
+    in the order that `main.lua` loads them
+
+    Directories and files are loaded in name order (case-insensitive,
+    like `path.get_directories`/`path.get_files` on Windows),
+    skipping the directories in the `ignore` table of `main.lua`
+    """
+    ignore = ignored_dirs(os.path.join(root, "main.lua"))
+
+    order = []
+    core_path = os.path.join(root, "core")
+    for dir in sorted(os.listdir(core_path), key = str.upper):
+        dir_path = os.path.join(core_path, dir)
+        if (not os.path.isdir(dir_path)) or (dir in ignore):
+            continue
+
+        for filename in sorted(os.listdir(dir_path), key = str.upper):
+            if filename.endswith(".lua"):
+                order.append(f"core/{dir}/{filename}")
+
+    return order
+
+
+
+def sources_hash(root, order):
+    hash = hashlib.sha256()
+    for path in order:
+        hash.update(path.encode("utf-8") + b"\0")
+        with open(os.path.join(root, path), "rb") as f:
+            hash.update(f.read() + b"\0")
+    return hash.hexdigest()
+
+
+
+def build(root = ROOT_PATH):
+    """
+    Returns the bundle source
+    """
+    order = load_order(root)
+    out = [
+        "-- ReturnsAPI core bundle\n",
+        "-- Generated by tools/bundle.py; do not edit\n",
+        f"-- sources: {sources_hash(root, order)}\n"
+    ]
+
+    # Each file keeps its own scope (locals and top-level `return`)
+    # by running in its own function, like a separate chunk would
+    for path in order:
+        with open(os.path.join(root, path), "r", encoding = "utf-8") as f:
+            code = strip_comments(f.read())
+        out.append(f"\n{MARKER}{path}\n;(function(...)\n{code}end)(...)\n")
+
+    return "".join(out)
+
+
+
+def split_bundle(bundle):
+    """
+    Returns the sources hash of the bundle,
+    and {path: code} for each file in it (in order)
+    """
+    header, *sections = bundle.split("\n" + MARKER)
+    m = re.search(r"^-- sources: (\w+)$", header, re.MULTILINE)
+
+    files = {}
+    for section in sections:
+        path, _, code = section.partition("\n")
+        code = code.removeprefix(";(function(...)\n").rstrip("\n").removesuffix("end)(...)")
+        files[path] = code
+
+    return (m.group(1) if m else None), files
+
+
+
+def marker_path(bundle_path):
+    # The release marker goes next to the bundle, where `main.lua` looks for it
+    return os.path.join(os.path.dirname(os.path.abspath(bundle_path)), os.path.basename(RELEASE_PATH))
+
+
+
+def check(root = ROOT_PATH, bundle_path = BUNDLE_PATH):
+    """
+    Returns a list of problems with the bundle (empty if none)
+    """
+    if not os.path.isfile(bundle_path):
+        return [f"{bundle_path} does not exist"]
+
+    with open(bundle_path, "r", encoding = "utf-8") as f:
+        bundled_hash, files = split_bundle(f.read())
+
+    order = load_order(root)
+    problems = []
+
+    if bundled_hash != sources_hash(root, order):
+        problems.append("bundle is out of date (sources changed since it was built)")
+
+    # A release marker from an older bundle would make `main.lua` load this one
+    release_path = marker_path(bundle_path)
+    if os.path.isfile(release_path):
+        with open(release_path, "r", encoding = "utf-8") as f:
+            if f.read().strip() != f"sources: {bundled_hash}":
+                problems.append("release marker does not match the bundle")
+
+    if list(files) != order:
+        problems.append("bundle load order does not match main.lua")
+
+    # Every file must have the same code tokens as its source
+    for path in order:
+        if path not in files:
+            continue
+        with open(os.path.join(root, path), "r", encoding = "utf-8") as f:
+            if code_tokens(f.read()) != code_tokens(files[path]):
+                problems.append(f"{path}: bundled code differs from source")
+
+    return problems
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Bundle the core files that main.lua loads into one chunk")
+    parser.add_argument("--check", action = "store_true", help = "check that the bundle is up to date and equivalent to core")
+    parser.add_argument("--release", action = "store_true", help = "also write the release marker (core_bundle.release), so that main.lua loads the bundle")
+    parser.add_argument("--output", default = BUNDLE_PATH, help = "bundle path (default: core_bundle.lua)")
+    args = parser.parse_args()
+
+    if args.check:
+        problems = check(ROOT_PATH, args.output)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print("Bundle is up to date")
+        return
+
+    bundle = build()
+    with open(args.output, "w", encoding = "utf-8", newline = "\n") as f:
+        f.write(bundle)
+
+    release_path = marker_path(args.output)
+    if os.path.isfile(release_path):
+        os.remove(release_path)
+    if args.release:
+        problems = check(ROOT_PATH, args.output)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        with open(release_path, "w", encoding = "utf-8", newline = "\n") as f:
+            f.write(f"sources: {sources_hash(ROOT_PATH, load_order())}\n")
+
+    order = load_order()
+    size = sum(os.path.getsize(os.path.join(ROOT_PATH, path)) for path in order)
+    print(f"Bundled {len(order)} files ({size // 1024} KB) into {os.path.basename(args.output)} ({len(bundle.encode('utf-8')) // 1024} KB)")
+    if args.release:
+        print(f"Wrote the release marker ({os.path.basename(release_path)}); main.lua will load the bundle")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# Data compiler
+# Compiles the TOML files in `core/data` into Lua table literals (`core/data/compiled.lua`),
+# so that the core does not have to decode them and build tables on every load
+#
+# Usage:
+#   python tools/compile_data.py            Write compiled.lua
+#   python tools/compile_data.py --check    Check that compiled.lua is up to date
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import tomllib
+
+global ROOT_PATH; ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+global DATA_PATH; DATA_PATH = os.path.join(ROOT_PATH, "core", "data")
+global COMPILED_PATH; COMPILED_PATH = os.path.join(DATA_PATH, "compiled.lua")
+
+# Compiled in this order
+SOURCES = [
+    "class_name_mapping.txt",
+    "class_array.txt",
+    "callback_constants.txt",
+]
+
+NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+LUA_KEYWORDS = {
+    "and", "break", "do", "else", "elseif", "end", "false", "for", "function", "goto", "if",
+    "in", "local", "nil", "not", "or", "repeat", "return", "then", "true", "until", "while"
+}
+
+
+
+def load_data(data_path = DATA_PATH):
+    """
+    Returns {filename: decoded TOML} for every source
+    """
+    data = {}
+    for filename in SOURCES:
+        with open(os.path.join(data_path, filename), "rb") as f:
+            data[filename] = tomllib.load(f)
+    return data
+
+
+
+def sources_hash(data_path = DATA_PATH):
+    hash = hashlib.sha256()
+    for filename in SOURCES:
+        hash.update(filename.encode("utf-8") + b"\0")
+        with open(os.path.join(data_path, filename), "rb") as f:
+            hash.update(f.read() + b"\0")
+    return hash.hexdigest()
+
+
+
+# ========== Lua Literals ==========
+
+def lua_key(key):
+    if isinstance(key, str) and NAME_PATTERN.match(key) and (key not in LUA_KEYWORDS):
+        return key
+    return f"[{lua_value(key)}]"
+
+
+
+def lua_value(value):
+    match value:
+        case bool():
+            return "true" if value else "false"
+        case int() | float():
+            return repr(value)
+        case str():
+            return '"' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r") + '"'
+    raise TypeError(f"cannot compile {type(value).__name__} to Lua")
+
+
+
+def lua_table(name, pairs, indent = 1):
+    """
+    Returns the lines of `name = { ... },` with one pair per line
+    (`pairs` is a list of (key, value) tuples, or a list of values for an array)
+    """
+    pad = "    " * indent
+    lines = [f"{pad}{name} = {{"]
+    for pair in pairs:
+        if isinstance(pair, tuple):
+            lines.append(f"{pad}    {lua_key(pair[0])} = {lua_value(pair[1])},")
+        else:
+            lines.append(f"{pad}    {lua_value(pair)},")
+    lines.append(f"{pad}}},")
+    return lines
+
+
+
+def callback_identifier(name):
+    # E.g., ON_STAGE_START -> onStageStart
+    return re.sub(r"_(.?)", lambda m: m.group(1).upper(), name.lower())
+
+
+
+# ========== Compile ==========
+
+def compile_data(data_path = DATA_PATH):
+    """
+    Returns the source of `compiled.lua`
+    """
+    data = load_data(data_path)
+    mapping = data["class_name_mapping.txt"]["mapping"]
+    arrays = data["class_array.txt"]["array"]
+    callbacks = data["callback_constants.txt"]
+
+    for name_rapi, name_global in mapping.items():
+        if name_global not in arrays:
+            raise ValueError(f"class_array.txt has no [array.{name_global}] (for {name_rapi})")
+
+    vanilla = sorted(callbacks["vanilla"].items(), key = lambda pair: pair[1])
+    if [id for _, id in vanilla] != list(range(len(vanilla))):
+        raise ValueError("vanilla callback IDs in callback_constants.txt must be 0, 1, 2, ...")
+
+    lines = [
+        "-- ReturnsAPI compiled data",
+        "-- Generated by tools/compile_data.py from core/data; do not edit",
+        f"-- sources: {sources_hash(data_path)}",
+        "",
+        "return {",
+    ]
+
+    # RAPI <-> Global class names
+    lines += lua_table("class_name_r2g", list(mapping.items()))
+    lines += lua_table("class_name_g2r", [(name_global, name_rapi) for name_rapi, name_global in mapping.items()])
+
+    # `Property` enum of each class array
+    # e.g., NAMESPACE = 0 and [0] = "namespace"
+    lines.append("    class_properties = {")
+    for name_global in mapping.values():
+        properties = arrays[name_global]
+        lines += lua_table(name_global, [(k.upper(), v) for k, v in properties.items()] + [(v, k) for k, v in properties.items()], 2)
+    lines.append("    },")
+
+    # Property name -> array index of each class array,
+    # for the getter and setter of content class wrappers
+    # (so that `item.name` does not have to be uppercased to look up `Property`)
+    lines.append("    class_accessors = {")
+    for name_global in mapping.values():
+        properties = arrays[name_global]
+        for k in properties:
+            if k != k.lower():
+                raise ValueError(f"class_array.txt: property '{k}' of {name_global} is not lowercase")
+        lines += lua_table(name_global, list(properties.items()), 2)
+    lines.append("    },")
+
+    # Callback types
+    lines += lua_table("callback_constants", [name for name, _ in vanilla])
+    lines += lua_table("callback_identifiers", [callback_identifier(name) for name, _ in vanilla])
+    lines += lua_table("callback_ids", vanilla + sorted(callbacks["custom"].items(), key = lambda pair: pair[1]))
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+
+def check(data_path = DATA_PATH, compiled_path = COMPILED_PATH):
+    """
+    Returns a list of problems with the compiled file (empty if none)
+    """
+    if not os.path.isfile(compiled_path):
+        return [f"{compiled_path} does not exist"]
+
+    with open(compiled_path, "r", encoding = "utf-8") as f:
+        compiled = f.read()
+
+    m = re.search(r"^-- sources: (\w+)$", compiled, re.MULTILINE)
+    if (not m) or (m.group(1) != sources_hash(data_path)):
+        return ["compiled.lua is out of date (core/data changed since it was compiled)"]
+
+    if compiled != compile_data(data_path):
+        return ["compiled.lua differs from what tools/compile_data.py generates (edited by hand?)"]
+
+    return []
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compile the TOML files in core/data into Lua")
+    parser.add_argument("--check", action = "store_true", help = "check that compiled.lua is up to date")
+    parser.add_argument("--output", default = COMPILED_PATH, help = "output path (default: core/data/compiled.lua)")
+    args = parser.parse_args()
+
+    if args.check:
+        problems = check(DATA_PATH, args.output)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print("Compiled data is up to date")
+        return
+
+    compiled = compile_data()
+    with open(args.output, "w", encoding = "utf-8", newline = "\n") as f:
+        f.write(compiled)
+    print(f"Compiled {len(SOURCES)} data files into {os.path.basename(args.output)}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+# Language compiler
+# Flattens the translation tables of a `language` folder (loaded by `core/6_General/Language.lua`)
+# into one token -> text table per language (`<folder>_compiled/<language>.lua`),
+# so that loading a language does not have to walk the folder and merge nested tables,
+# and reports tokens that are defined more than once
+#
+# Usage:
+#   python tools/compile_language.py                            Compile the `language` folder of ReturnsAPI
+#   python tools/compile_language.py <folder> [<folder> ...]    Compile the `language` folders of mods
+#   python tools/compile_language.py --check                    Check that the compiled tables are up to date
+#
+# A table is compiled for every name that `Language.lua` would match a language against
+# (every file and folder name in the tree, e.g., `folder/subfolder/french/`), and English
+#
+# Language files are evaluated statically, so their values may only be literals,
+# constants (`RAPI_NAMESPACE`, or given with `--define`), and `..` of those
+
+import argparse
+import hashlib
+import math
+import os
+import re
+import sys
+
+from compile_data import lua_value
+from lua_lexer import LexError, string_value, tokenize
+
+global ROOT_PATH; ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+global LANGUAGE_PATH; LANGUAGE_PATH = os.path.join(ROOT_PATH, "language")
+
+HEADER = "-- Generated by tools/compile_language.py"
+FALLBACK = "english"    # Loaded when the current language is not found anywhere
+
+NAMESPACE_PATTERN = re.compile(r"^RAPI_NAMESPACE\s*=\s*\"([^\"]*)\"", re.MULTILINE)
+
+
+
+class LanguageError(Exception):
+    pass
+
+
+
+def default_constants():
+    with open(os.path.join(ROOT_PATH, "main.lua"), "r", encoding = "utf-8") as f:
+        m = NAMESPACE_PATTERN.search(f.read())
+    return {"RAPI_NAMESPACE": m.group(1)} if m else {}
+
+
+
+# ========== Discovery ==========
+
+def find_files(folder):
+    """
+    Returns a list of (path relative to the folder, lowercase filename without extension,
+    lowercase names of the folders it is in) for every Lua file, in the order that
+    `Language.lua` loads them (the files of a folder, then each of its subfolders)
+    """
+    files = []
+
+    def walk(relative, folders):
+        entries = sorted(os.listdir(os.path.join(folder, relative)), key = str.upper)
+        for entry in entries:
+            if entry.lower().endswith(".lua") and os.path.isfile(os.path.join(folder, relative, entry)):
+                files.append((os.path.join(relative, entry).replace(os.sep, "/"), entry[:-4].lower(), folders))
+        for entry in entries:
+            if os.path.isdir(os.path.join(folder, relative, entry)):
+                walk(os.path.join(relative, entry), folders + [entry.lower()])
+
+    walk("", [])
+    return files
+
+
+
+def is_loaded(file, language):
+    """
+    Returns `True` if a file is loaded for a language: if it is named after the
+    language, or the nearest of its folders named after the language or English is
+    """
+    _, stem, folders = file
+    if stem == language:
+        return True
+    for folder in reversed(folders):
+        if folder in (language, FALLBACK):
+            return folder == language
+    return False
+
+
+
+def find_languages(files):
+    """
+    Returns the languages that files are loaded for, out of
+    the names of every file and folder in the tree, and English
+    """
+    names = {FALLBACK}
+    for _, stem, folders in files:
+        names.add(stem)
+        names.update(folders)
+    return sorted(language for language in names if any(is_loaded(file, language) for file in files))
+
+
+
+# ========== Evaluation ==========
+
+def lua_tostring(value):
+    match value:
+        case bool():
+            return "true" if value else "false"
+        case int():
+            return str(value)
+        case float():
+            if math.isinf(value):
+                return "inf" if value > 0 else "-inf"
+            text = f"{value:.14g}"
+            return text if any(c in text for c in ".en") else text + ".0"
+    return value
+
+
+
+class Parser():
+    """
+    Evaluates `return { ... }` of a language file into a list of
+    (token, text, line), flattened the way `Language.lua` does it
+    """
+
+    def __init__(self, source, constants):
+        self.tokens = [t for t in tokenize(source) if t.kind != "comment"]
+        self.constants = constants
+        self.pos = 0
+        self.entries = []
+
+
+    def peek(self, offset = 0):
+        pos = self.pos + offset
+        return self.tokens[pos] if pos < len(self.tokens) else None
+
+
+    def next(self):
+        token = self.peek()
+        if not token:
+            raise LanguageError("unexpected end of file")
+        self.pos += 1
+        return token
+
+
+    def error(self, token, message):
+        return LanguageError(f"line {token.line}: {message}" if token else message)
+
+
+    def expect(self, value):
+        token = self.next()
+        if (token.kind not in ("op", "name")) or (token.value != value):
+            raise self.error(token, f"expected '{value}', found '{token.value}'")
+        return token
+
+
+    def parse(self):
+        self.expect("return")
+        self.table(None)
+        if self.peek() and (self.peek().value == ";"):
+            self.next()
+        if self.peek():
+            raise self.error(self.peek(), "expected the end of the file after the returned table")
+        return self.entries
+
+
+    def table(self, prefix):
+        self.expect("{")
+        index = 1
+        while self.peek() and (self.peek().value != "}"):
+            token = self.peek()
+            if token.value == "[":
+                self.next()
+                key = self.expression()
+                self.expect("]")
+                self.expect("=")
+            elif (token.kind == "name") and self.peek(1) and (self.peek(1).value == "="):
+                key = self.next().value
+                self.next()
+            else:
+                key = index
+                index += 1
+
+            if (key is None) or isinstance(key, bool):
+                raise self.error(token, f"a key of {lua_tostring(key) if key is not None else 'nil'} cannot be a token")
+            token_name = lua_tostring(key) if prefix is None else f"{prefix}.{lua_tostring(key)}"
+
+            value_token = self.peek()
+            if value_token and (value_token.value == "{"):
+                self.table(token_name)
+            else:
+                value = self.expression()
+                if value is not None:
+                    self.entries.append((token_name, lua_tostring(value), value_token.line))
+
+            if self.peek() and (self.peek().value in (",", ";")):
+                self.next()
+            elif self.peek() and (self.peek().value != "}"):
+                raise self.error(self.peek(), f"expected ',' or '}}', found '{self.peek().value}'")
+        self.expect("}")
+
+
+    def expression(self):
+        parts = [self.atom()]
+        while self.peek() and (self.peek().value == ".."):
+            token = self.next()
+            parts.append(self.atom())
+            if any((part is None) or isinstance(part, bool) for part in parts):
+                raise self.error(token, "cannot concatenate nil or a boolean")
+        if len(parts) == 1:
+            return parts[0]
+        return "".join(lua_tostring(part) for part in parts)
+
+
+    def atom(self):
+        token = self.next()
+        match token.kind:
+            case "string":
+                try:
+                    return string_value(token.value)
+                except LexError as e:
+                    raise self.error(token, str(e))
+            case "number":
+                return parse_number(token.value)
+            case "op" if token.value == "(":
+                value = self.expression()
+                self.expect(")")
+                return value
+            case "op" if (token.value == "-") and self.peek() and (self.peek().kind == "number"):
+                return -parse_number(self.next().value)
+            case "name" if token.value in ("true", "false", "nil"):
+                return {"true": True, "false": False, "nil": None}[token.value]
+            case "name" if token.value in self.constants:
+                return self.constants[token.value]
+            case "name":
+                raise self.error(token, f"'{token.value}' is not a known constant (use --define {token.value}=<value>)")
+        raise self.error(token, f"cannot evaluate '{token.value}' (only literals, constants, and '..' are supported)")
+
+
+
+def parse_number(text):
+    if text.lower().startswith("0x"):
+        return int(text, 16) if all(c not in text.lower() for c in ".p") else float.fromhex(text)
+    if any(c in text for c in ".eE"):
+        return float(text)
+    return int(text)
+
+
+
+def parse_file(path, constants):
+    with open(path, "r", encoding = "utf-8") as f:
+        source = f.read()
+    try:
+        return Parser(source, constants).parse()
+    except (LanguageError, LexError) as e:
+        raise LanguageError(f"{path}: {e}")
+
+
+
+# ========== Compile ==========
+
+def sources_hash(folder, files, constants):
+    hash = hashlib.sha256()
+    for name, value in sorted(constants.items()):
+        hash.update(f"{name}={value}\0".encode("utf-8"))
+    for relative, _, _ in files:
+        hash.update(relative.encode("utf-8") + b"\0")
+        with open(os.path.join(folder, relative), "rb") as f:
+            hash.update(f.read() + b"\0")
+    return hash.hexdigest()
+
+
+
+def merge(entries):
+    """
+    Returns ({token: text}, duplicates, conflicts) of the entries of files in load order,
+    where later definitions win (as in-game); a token defined again with the same text
+    is a duplicate, and with different text a conflict
+    """
+    tokens = {}
+    where = {}
+    duplicates, conflicts = [], []
+    for relative, file_entries in entries:
+        for token, text, line in file_entries:
+            location = f"{relative}:{line}"
+            if token in tokens:
+                if tokens[token] == text:
+                    duplicates.append(f"{token} ({where[token]}, {location})")
+                else:
+                    conflicts.append(f"{token} ({where[token]}: {lua_value(tokens[token])}, {location}: {lua_value(text)})")
+            tokens[token] = text
+            where[token] = location
+    return tokens, duplicates, conflicts
+
+
+
+def compile_folder(folder, constants):
+    """
+    Returns ({language: source of its compiled table}, duplicates, conflicts)
+    (duplicates and conflicts are lists of "<language>: <token> (<locations>)")
+    """
+    files = find_files(folder)
+    parsed = {file[0]: parse_file(os.path.join(folder, file[0]), constants) for file in files}
+    hash = sources_hash(folder, files, constants)
+
+    outputs = {}
+    duplicates, conflicts = [], []
+    for language in find_languages(files):
+        tokens, language_duplicates, language_conflicts = merge([(file[0], parsed[file[0]]) for file in files if is_loaded(file, language)])
+        duplicates += [f"{language}: {duplicate}" for duplicate in language_duplicates]
+        conflicts += [f"{language}: {conflict}" for conflict in language_conflicts]
+
+        lines = [
+            f"-- Compiled language: {language}",
+            f"{HEADER} from {os.path.basename(os.path.normpath(folder))}; do not edit",
+            f"-- sources: {hash}",
+            "",
+            "return {",
+        ]
+        for token in sorted(tokens):
+            lines.append(f"    [{lua_value(token)}] = {lua_value(tokens[token])},")
+        lines.append("}")
+        outputs[language] = "\n".join(lines) + "\n"
+
+    return outputs, duplicates, conflicts
+
+
+
+def compiled_path(folder):
+    return os.path.normpath(folder) + "_compiled"
+
+
+
+def generated_files(out_path):
+    """
+    Returns the names of the files in the output folder that were written by the compiler
+    """
+    names = []
+    if os.path.isdir(out_path):
+        for name in os.listdir(out_path):
+            path = os.path.join(out_path, name)
+            if name.endswith(".lua") and os.path.isfile(path):
+                with open(path, "r", encoding = "utf-8") as f:
+                    if HEADER in f.read(256):
+                        names.append(name)
+    return names
+
+
+
+def check(folder, outputs):
+    """
+    Returns a list of problems with the compiled tables of a folder (empty if none)
+    """
+    out_path = compiled_path(folder)
+    problems = []
+    for language, source in outputs.items():
+        path = os.path.join(out_path, language + ".lua")
+        if not os.path.isfile(path):
+            problems.append(f"{path} does not exist")
+            continue
+        with open(path, "r", encoding = "utf-8") as f:
+            if f.read() != source:
+                problems.append(f"{path} is out of date")
+    for name in generated_files(out_path):
+        if name[:-4] not in outputs:
+            problems.append(f"{os.path.join(out_path, name)} is no longer generated")
+    return problems
+
+
+
+def write(folder, outputs):
+    out_path = compiled_path(folder)
+    os.makedirs(out_path, exist_ok = True)
+    for name in generated_files(out_path):
+        if name[:-4] not in outputs:
+            os.remove(os.path.join(out_path, name))
+    for language, source in outputs.items():
+        with open(os.path.join(out_path, language + ".lua"), "w", encoding = "utf-8", newline = "\n") as f:
+            f.write(source)
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compile language folders into flat token tables")
+    parser.add_argument("folders", nargs = "*", default = [LANGUAGE_PATH], help = "language folders (default: the one of ReturnsAPI)")
+    parser.add_argument("--check", action = "store_true", help = "check that the compiled tables are up to date")
+    parser.add_argument("--define", nargs = "+", default = [], metavar = "NAME=VALUE", help = "string constants used by language files")
+    args = parser.parse_args()
+
+    constants = default_constants()
+    for define in args.define:
+        name, _, value = define.partition("=")
+        constants[name] = value
+
+    failed = False
+    try:
+        for folder in args.folders:
+            if not os.path.isdir(folder):
+                raise LanguageError(f"{folder} is not a folder")
+            outputs, duplicates, conflicts = compile_folder(folder, constants)
+
+            for duplicate in duplicates:
+                print(f"Duplicate token {duplicate}")
+            for conflict in conflicts:
+                print(f"Conflicting token {conflict}")
+            if conflicts:
+                print(f"{folder}: {len(conflicts)} conflicting token(s); not compiled")
+                failed = True
+                continue
+
+            if args.check:
+                problems = check(folder, outputs)
+                for problem in problems:
+                    print(problem)
+                failed = failed or bool(problems)
+                if not problems:
+                    print(f"{folder}: compiled languages are up to date")
+            else:
+                write(folder, outputs)
+                print(f"{folder}: compiled {', '.join(outputs) or 'no languages'} into {os.path.basename(compiled_path(folder))}")
+
+    except LanguageError as e:
+        print(e)
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+# Packet compiler
+# Compiles the packet schemas in `core/data/packets.txt` into
+# straight-line Lua serializers and deserializers (`core/data/packets.lua`)
+#
+# Usage:
+#   python tools/compile_packets.py             Write packets.lua
+#   python tools/compile_packets.py --check     Check that packets.lua is up to date, and
+#                                               that it matches the wire format in tools/fixtures/packets.txt
+#   python tools/compile_packets.py --sizes     Print the encoding and worst-case size of every field
+
+import argparse
+import hashlib
+import math
+import os
+import re
+import struct
+import sys
+import tomllib
+
+from compile_data import DATA_PATH, LUA_KEYWORDS, NAME_PATTERN
+
+global SCHEMA_PATH; SCHEMA_PATH = os.path.join(DATA_PATH, "packets.txt")
+global PACKETS_PATH; PACKETS_PATH = os.path.join(DATA_PATH, "packets.lua")
+global FIXTURES_PATH; FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "packets.txt")
+
+# Size of each Buffer type in bytes (None if it depends on the value or is not known)
+SIZES = {
+    "bool"          : 1,    # Written as a byte
+    "byte"          : 1,
+    "short"         : 2,
+    "ushort"        : 2,
+    "int"           : 4,
+    "uint"          : 4,
+    "uint_packed"   : None, # 7 bits per byte
+    "half"          : 2,
+    "float"         : 4,
+    "double"        : 8,
+    "color"         : 4,
+    "instance"      : None, # Encoded by the engine (`write_instance_direct`)
+    "string"        : None, # Null-terminated
+}
+
+# Locals of the generated functions
+RESERVED_NAMES = {"buffer", "buffer_id"}
+
+HALF_MAX = 65504
+SEND_TYPE_SIZE = 2      # `ushort` written by `Packet` before the fields
+
+
+
+class SchemaError(Exception):
+    pass
+
+
+
+class Field():
+    """
+    Field of a packet, and how it is encoded
+    """
+
+    __slots__ = ("name", "encoding", "size", "max_length")
+
+    def __init__(self, name, encoding, size):
+        self.name = name
+        self.encoding = encoding    # Buffer type
+        self.size = size            # Worst-case size in bytes, or None if unbounded or not known
+        self.max_length = None      # Enforced by `serialize` (strings only)
+
+
+
+# ========== Encodings ==========
+
+def int_encoding(low, high):
+    """
+    Returns the smallest encoding that can hold every integer in [low, high],
+    and its worst-case size
+    """
+    if (low is None) or (high is None):
+        return ("uint", 4) if (low is not None) and (low >= 0) else ("int", 4)
+
+    if low > high:
+        raise SchemaError(f"min ({low}) is greater than max ({high})")
+
+    if low >= 0:
+        if high <= 0xFF:        return "byte", 1
+        if high <= 0xFFFF:      return "ushort", 2
+        if high < 2 ** 21:      return "uint_packed", packed_size(high)     # At most 3 bytes
+        if high <= 0xFFFFFFFF:  return "uint", 4
+    else:
+        if (low >= -2 ** 15) and (high < 2 ** 15):  return "short", 2
+        if (low >= -2 ** 31) and (high < 2 ** 31):  return "int", 4
+
+    raise SchemaError(f"range [{low}, {high}] does not fit in 32 bits")
+
+
+
+def packed_size(high):
+    return max(1, math.ceil(high.bit_length() / 7))
+
+
+
+def number_encoding(max_abs, step):
+    """
+    Returns half precision if it can represent values up to `max_abs`
+    to within `step`, otherwise float
+    """
+    if (max_abs is not None) and (step is not None) and (0 < max_abs <= HALF_MAX):
+        spacing = 2 ** (math.floor(math.log2(max_abs)) - 10)    # Distance between halfs near `max_abs`
+        if step >= spacing:
+            return "half", 2
+    return "float", 4
+
+
+
+def compile_field(packet, name, spec):
+    if (not NAME_PATTERN.match(name)) or (name in LUA_KEYWORDS):
+        raise SchemaError(f"[{packet}] '{name}' is not a valid Lua name")
+    if name in RESERVED_NAMES:
+        raise SchemaError(f"[{packet}] '{name}' is used by the generated code")
+
+    if isinstance(spec, str):
+        spec = {"type": spec}
+    type = spec.get("type")
+
+    match type:
+        case "int":
+            encoding, size = int_encoding(spec.get("min"), spec.get("max"))
+        case "number":
+            encoding, size = number_encoding(spec.get("max"), spec.get("step"))
+        case "string":
+            encoding = "string"
+            size = (spec["max_length"] + 1) if "max_length" in spec else None
+        case "uint_packed":
+            encoding = "uint_packed"
+            size = packed_size(spec["max"]) if "max" in spec else 5
+        case _ if type in SIZES:
+            encoding, size = type, SIZES[type]
+        case _:
+            raise SchemaError(f"[{packet}] '{name}' has unknown type '{type}'")
+
+    field = Field(name, encoding, size)
+    if type == "string":
+        field.max_length = spec.get("max_length")
+    return field
+
+
+
+def load_schemas(path = SCHEMA_PATH):
+    """
+    Returns {packet identifier: [Field, ...]}
+    """
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+
+    schemas = {}
+    for packet, fields in data.items():
+        schemas[packet] = [compile_field(packet, name, spec) for name, spec in fields.items()]
+    return schemas
+
+
+
+def max_size(fields):
+    """
+    Returns the worst-case size of the fields in bytes,
+    or None if any of them is unbounded or not known
+    """
+    if any(field.size is None for field in fields):
+        return None
+    return sum(field.size for field in fields)
+
+
+
+# ========== Lua ==========
+
+def length_check(packet, field):
+    """
+    Returns the statement that enforces the `max_length` of a string field (None if it has none)
+    """
+    if field.max_length is None:
+        return None
+    return (f"if #{field.name} > {field.max_length} then "
+            f"log.error(\"{packet}: '{field.name}' is longer than {field.max_length} bytes\") end")
+
+
+
+def write_statement(field):
+    value = field.name
+    match field.encoding:
+        case "bool":        return f"gm.writebyte_direct(buffer_id, ({value} and 1) or 0)"
+        case "instance":    return f"gm.write_instance_direct(buffer_id, Wrap.unwrap({value}))"
+        case "color":       return f"gm.write_color_direct(buffer_id, Wrap.unwrap({value}))"
+    return f"gm.write{field.encoding}_direct(buffer_id, Wrap.unwrap({value}))"
+
+
+
+def read_expression(field):
+    # Wrapped the same way as the `Buffer.read_*` methods
+    match field.encoding:
+        case "bool":        return "Util.bool(gm.readbyte_direct(buffer_id))"
+        case "instance":    return "Instance.wrap(gm.read_instance_direct(buffer_id))"
+        case "color":       return "Wrap.wrap(gm.read_color_direct(buffer_id))"
+    return f"Wrap.wrap(gm.read{field.encoding}_direct(buffer_id))"
+
+
+
+def compile_packets(path = SCHEMA_PATH):
+    """
+    Returns the source of `packets.lua`
+    """
+    with open(path, "rb") as f:
+        hash = hashlib.sha256(f.read()).hexdigest()
+    schemas = load_schemas(path)
+
+    lines = [
+        "-- ReturnsAPI packet serializers",
+        "-- Generated by tools/compile_packets.py from core/data/packets.txt; do not edit",
+        f"-- sources: {hash}",
+        "",
+        "-- `serialize(buffer, <fields>)` and `deserialize(buffer) -> <fields>` for each packet",
+        "-- `max_size` is the worst-case size of the fields in bytes (`nil` if unbounded or not known);",
+        "-- `serialize` raises an error for strings longer than their `max_length`",
+        "",
+        "return {",
+    ]
+
+    for packet, fields in schemas.items():
+        names = ", ".join(field.name for field in fields)
+        size = max_size(fields)
+
+        lines.append(f"    {packet} = {{")
+        lines.append(f"        -- " + ", ".join(f"{field.name}: {field.encoding}" for field in fields))
+        lines.append(f"        max_size = {size if size is not None else 'nil'},")
+
+        lines.append(f"        serialize = function(buffer{', ' if fields else ''}{names})")
+        for field in fields:
+            statement = length_check(packet, field)
+            if statement:
+                lines.append(f"            {statement}")
+        lines.append(f"            local buffer_id = buffer.value")
+        for field in fields:
+            lines.append(f"            {write_statement(field)}")
+        lines.append(f"        end,")
+
+        # Read into locals first, since the order in which
+        # expressions of a `return` list are evaluated is not defined
+        lines.append(f"        deserialize = function(buffer)")
+        lines.append(f"            local buffer_id = buffer.value")
+        for field in fields:
+            lines.append(f"            local {field.name} = {read_expression(field)}")
+        lines.append(f"            return {names}" if fields else "            return")
+        lines.append(f"        end,")
+        lines.append(f"    }},")
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+
+# ========== Fixtures ==========
+
+# Byte layout of each Buffer type in the simulated buffer (GameMaker buffers are little-endian)
+STRUCT_FORMATS = {
+    "byte"      : "<B",
+    "short"     : "<h",
+    "ushort"    : "<H",
+    "int"       : "<i",
+    "uint"      : "<I",
+    "half"      : "<e",
+    "float"     : "<f",
+    "double"    : "<d",
+    "color"     : "<I",
+}
+
+# How the `Buffer.read_*` methods wrap what they read (core/6_General/Buffer.lua);
+# every other type goes through `Wrap.wrap`
+READ_WRAPPERS = {
+    "instance"  : "Instance.wrap",
+    "bool"      : "Util.bool",
+}
+
+
+class LuaError(Exception):
+    pass
+
+
+
+class SimulatedBuffer():
+    """
+    Stand-in for a GameMaker buffer, holding the writes as
+    "<type> <hex bytes>" entries (instances are encoded
+    by the engine, so they are held as "instance <value>")
+    """
+
+    def __init__(self, wire = None):
+        self.wire = list(wire or [])
+        self.position = 0
+
+
+    def write(self, type, value):
+        match type:
+            case "instance":
+                self.wire.append(f"instance {value}")
+                return
+            case "string":
+                data = value.encode("utf-8") + b"\0"
+            case "uint_packed":
+                data = bytearray()
+                while True:
+                    byte, value = value & 0x7F, value >> 7
+                    data.append(byte | (0x80 if value else 0))
+                    if not value: break
+            case _:
+                data = struct.pack(STRUCT_FORMATS[type], value)
+        self.wire.append(f"{type} {bytes(data).hex()}")
+
+
+    def read(self, type):
+        if self.position >= len(self.wire):
+            raise LuaError(f"read {type} past the end of the buffer")
+        written, _, data = self.wire[self.position].partition(" ")
+        self.position += 1
+        if written != type:
+            raise LuaError(f"read {type} where {written} was written")
+
+        match type:
+            case "instance":    return int(data)
+            case "string":      return bytes.fromhex(data)[:-1].decode("utf-8")
+            case "uint_packed":
+                value = 0
+                for i, byte in enumerate(bytes.fromhex(data)):
+                    value |= (byte & 0x7F) << (7 * i)
+                return value
+        return struct.unpack(STRUCT_FORMATS[type], bytes.fromhex(data))[0]
+
+
+
+def function_body(compiled, packet, function):
+    """
+    Returns the statements of `packets.lua`'s `<packet>.<function>`
+    """
+    m = re.search(rf"^    {packet} = {{\n(.*?)^    }},$", compiled, re.MULTILINE | re.DOTALL)
+    if not m:
+        raise LuaError(f"{packet} is not in packets.lua")
+    m = re.search(rf"^        {function} = function\(.*?\)\n(.*?)^        end,$", m.group(1), re.MULTILINE | re.DOTALL)
+    if not m:
+        raise LuaError(f"{packet}.{function} is not in packets.lua")
+    return [line.strip() for line in m.group(1).splitlines()]
+
+
+
+def run_serialize(statements, names, values):
+    """
+    Runs the statements of a generated `serialize` and returns its writes
+    """
+    locals = dict(zip(names, values))
+    buffer = SimulatedBuffer()
+
+    for statement in statements:
+        if statement == "local buffer_id = buffer.value":
+            continue
+
+        if m := re.fullmatch(r'if #(\w+) > (\d+) then log\.error\("(.*)"\) end', statement):
+            if len(locals[m.group(1)].encode("utf-8")) > int(m.group(2)):
+                raise LuaError(m.group(3))
+
+        elif m := re.fullmatch(r"gm\.write_?(\w+)_direct\(buffer_id, (.+)\)", statement):
+            type, argument = m.groups()
+            if a := re.fullmatch(r"Wrap\.unwrap\((\w+)\)", argument):
+                value = locals[a.group(1)]
+            elif a := re.fullmatch(r"\((\w+) and 1\) or 0", argument):
+                value = 1 if locals[a.group(1)] else 0
+            else:
+                raise LuaError(f"cannot simulate '{statement}'")
+            buffer.write(type, value)
+
+        else:
+            raise LuaError(f"cannot simulate '{statement}'")
+
+    return buffer.wire
+
+
+
+def run_deserialize(statements, wire):
+    """
+    Runs the statements of a generated `deserialize`,
+    and returns what it returns as (wrapper, value) pairs
+    """
+    locals = {}
+    buffer = SimulatedBuffer(wire)
+
+    for statement in statements:
+        if statement == "local buffer_id = buffer.value":
+            continue
+
+        if m := re.fullmatch(r"local (\w+) = (?:([\w.]+)\()?gm\.read_?(\w+)_direct\(buffer_id\)\)?", statement):
+            name, wrapper, type = m.groups()
+            locals[name] = (wrapper, buffer.read(type))
+
+        elif m := re.fullmatch(r"return ?(.*)", statement):
+            if buffer.position != len(buffer.wire):
+                raise LuaError(f"{len(buffer.wire) - buffer.position} writes were not read")
+            return [locals[name] for name in re.findall(r"\w+", m.group(1))]
+
+        else:
+            raise LuaError(f"cannot simulate '{statement}'")
+
+    raise LuaError("deserialize does not return")
+
+
+
+def check_fixtures(compiled, schemas, fixtures_path = FIXTURES_PATH):
+    """
+    Runs the compiled serializers of each packet on its fixture,
+    and returns a list of problems (empty if none)
+    """
+    with open(fixtures_path, "rb") as f:
+        fixtures = tomllib.load(f)
+
+    problems = [f"[{packet}] has a fixture but no schema" for packet in fixtures if packet not in schemas]
+    for packet, fields in schemas.items():
+        if packet not in fixtures:
+            problems.append(f"[{packet}] has no fixture in {os.path.basename(fixtures_path)}")
+            continue
+
+        names = [field.name for field in fields]
+        values = fixtures[packet]["values"]
+        wire = fixtures[packet]["wire"]
+        try:
+            serialize = function_body(compiled, packet, "serialize")
+            deserialize = function_body(compiled, packet, "deserialize")
+
+            written = run_serialize(serialize, names, values)
+            if written != wire:
+                problems.append(f"[{packet}] serialize wrote {written}, expected {wire}")
+
+            read = run_deserialize(deserialize, wire)
+            for field, value, (wrapper, result) in zip(fields, values, read):
+                expected = READ_WRAPPERS.get(field.encoding, "Wrap.wrap")
+                if wrapper != expected:
+                    problems.append(f"[{packet}] '{field.name}' is read with {wrapper or 'no wrapper'}, but Buffer uses {expected}")
+                if result != value:
+                    problems.append(f"[{packet}] '{field.name}' reads back as {result!r}, expected {value!r}")
+
+            # Strings must be rejected one byte past `max_length`
+            for i, field in enumerate(fields):
+                if field.max_length is None: continue
+                long_values = values[:i] + ["x" * (field.max_length + 1)] + values[i + 1:]
+                try:
+                    run_serialize(serialize, names, long_values)
+                    problems.append(f"[{packet}] serialize accepts '{field.name}' longer than {field.max_length} bytes")
+                except LuaError:
+                    pass
+
+        except (LuaError, KeyError, struct.error) as e:
+            problems.append(f"[{packet}] {e}")
+
+    return problems
+
+
+
+def check(schema_path = SCHEMA_PATH, packets_path = PACKETS_PATH, fixtures_path = FIXTURES_PATH):
+    """
+    Returns a list of problems with the compiled file (empty if none)
+    """
+    if not os.path.isfile(packets_path):
+        return [f"{packets_path} does not exist"]
+
+    with open(packets_path, "r", encoding = "utf-8") as f:
+        compiled = f.read()
+    with open(schema_path, "rb") as f:
+        hash = hashlib.sha256(f.read()).hexdigest()
+
+    m = re.search(r"^-- sources: (\w+)$", compiled, re.MULTILINE)
+    if (not m) or (m.group(1) != hash):
+        return ["packets.lua is out of date (packets.txt changed since it was compiled)"]
+
+    if compiled != compile_packets(schema_path):
+        return ["packets.lua differs from what tools/compile_packets.py generates (edited by hand?)"]
+
+    return check_fixtures(compiled, load_schemas(schema_path), fixtures_path)
+
+
+
+def describe_size(field):
+    if field.size is not None:
+        return field.size
+    if field.encoding == "instance":
+        return "not known (encoded by the engine)"
+    return "unbounded"
+
+
+
+def print_sizes(schemas):
+    for packet, fields in schemas.items():
+        size = max_size(fields)
+        total = f"{size + SEND_TYPE_SIZE} bytes" if size is not None else "no worst case"
+        print(f"{packet} ({total}, including the {SEND_TYPE_SIZE}-byte send type)")
+        for field in fields:
+            print(f"    {field.name.ljust(24)} {field.encoding.ljust(12)} {describe_size(field)}")
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compile packet schemas into Lua serializers")
+    parser.add_argument("--check", action = "store_true", help = "check that packets.lua is up to date")
+    parser.add_argument("--sizes", action = "store_true", help = "print the encoding and worst-case size of every field")
+    parser.add_argument("--output", default = PACKETS_PATH, help = "output path (default: core/data/packets.lua)")
+    args = parser.parse_args()
+
+    try:
+        if args.sizes:
+            print_sizes(load_schemas())
+            return
+
+        if args.check:
+            problems = check(SCHEMA_PATH, args.output)
+            for problem in problems:
+                print(problem)
+            if problems:
+                sys.exit(1)
+            print("Packet serializers are up to date")
+            return
+
+        compiled = compile_packets()
+
+    except SchemaError as e:
+        print(f"packets.txt: {e}")
+        sys.exit(1)
+
+    with open(args.output, "w", encoding = "utf-8", newline = "\n") as f:
+        f.write(compiled)
+    print(f"Compiled {len(load_schemas())} packet schemas into {os.path.basename(args.output)}")
+
+
+
+if __name__ == "__main__":
+    main()
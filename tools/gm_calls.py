@@ -0,0 +1,466 @@
+# gm call inventory
+# Maps every function in the loaded core files to the `gm` calls it makes,
+# flags the ones reachable from hooks and per-frame callbacks,
+# and points out calls that could be memoized
+#
+# Usage:
+#   python tools/gm_calls.py                        Print a summary and write docs/artifacts/gm_calls.json
+#   python tools/gm_calls.py --compare old.json     Also show how hot gm calls changed since an older report
+
+import argparse
+import json
+import os
+import sys
+
+from bundle import ROOT_PATH
+from lua_lexer import tokenize
+
+sys.path.insert(0, os.path.join(ROOT_PATH, "docs"))
+import main as docs_main
+
+global REPORT_PATH; REPORT_PATH = os.path.join(docs_main.ARTIFACTS_PATH, "gm_calls.json")
+
+REPORT_VERSION = 1
+
+# Registering a function with these runs it from a hook
+HOOK_CALLS = {
+    "gm.pre_script_hook", "gm.post_script_hook",
+    "gm.pre_code_execute", "gm.post_code_execute",
+    "gm.event_hook_pre_add", "gm.event_hook_post_add",
+    "Hook.add_pre", "Hook.add_post",
+}
+
+# Registering a function with these runs it on the callback type passed
+CALLBACK_CALLS = {"Callback.add", "Callback.add_SO"}
+
+# Callback types that run every frame
+PER_FRAME_CALLBACKS = {
+    "ON_STEP", "PRE_STEP", "POST_STEP",
+    "ON_DRAW", "PRE_HUD_DRAW", "ON_HUD_DRAW", "POST_HUD_DRAW",
+    "ON_PLAYER_STEP", "PRE_PLAYER_HUD_DRAW", "ON_PLAYER_HUD_DRAW",
+    "CAMERA_ON_VIEW_CAMERA_UPDATE", "ON_SCREEN_REFRESH",
+}
+
+# Scripts whose result only depends on their arguments
+# (during a run), and so can be cached by argument
+PURE_PREFIXES = (
+    "object_is_ancestor", "object_get_", "asset_get_", "sprite_get_",
+    "string_", "lang_get", "ds_map_find_value", "script_exists",
+)
+
+BLOCK_OPENERS = {"if", "do", "repeat", "function"}
+
+
+
+class Function():
+    """
+    Function found in the source
+    """
+
+    def __init__(self, name, file, line, parent = None, anonymous = False):
+        self.name = name
+        self.file = file
+        self.line = line
+        self.parent = parent
+        self.anonymous = anonymous
+        self.gm_calls = []      # {script, line, in_loop, cached, args}
+        self.calls = []         # Call chains (e.g., "Wrap.wrap", ":get")
+        self.roots = []         # Why this function is a hot path root
+        self.nested = []        # Anonymous functions passed as arguments (assumed to be called)
+        self.hot = None         # Chain of functions from a root, if reachable
+
+
+
+# ========== Scan ==========
+
+def chain_before(tokens, i):
+    """
+    Returns the name chain that ends right before index `i`
+    (e.g., "gm.post_script_hook", "Hook.internal.manage_pre_hook", ":get"),
+    and the index of its first token
+    """
+    parts = []
+    j = i - 1
+    while j >= 0:
+        kind, value = tokens[j].kind, tokens[j].value
+        if kind == "name" and value not in BLOCK_OPENERS | {"end", "local", "return", "then", "else", "and", "or", "not", "in", "until", "elseif", "while", "for"}:
+            parts.append(value)
+            if (j > 0) and (tokens[j - 1].value in (".", ":")):
+                parts.append(tokens[j - 1].value)
+                j -= 2
+                continue
+            return "".join(reversed(parts)), j
+        break
+
+    # Method call on an expression (e.g., `foo():bar`, `t[1]:bar`)
+    if parts and parts[-1] == ":":
+        return "".join(reversed(parts)), j + 1
+    return None, i
+
+
+
+def scan_file(key, source, functions):
+    """
+    Adds the functions of the file to `functions` (keyed by qualified name),
+    and returns the file's top-level chunk as a Function
+    """
+    tokens = [t for t in tokenize(source) if t.kind != "comment"]
+    chunk = Function(f"{key}::<main>", key, 1)
+
+    blocks = [("function", chunk)]     # Open blocks ("function", Function), ("loop", None), or ("block", None)
+    parens = []                        # Open calls (callee chain, token index, is cached assignment)
+    braces = []                        # Open table constructors (table name or None)
+    loop_pending = False
+
+    def current():
+        for kind, fn in reversed(blocks):
+            if kind == "function":
+                return fn
+
+    def in_loop():
+        for kind, fn in reversed(blocks):
+            if kind == "function":
+                return False
+            if kind == "loop":
+                return True
+
+    def unique(name):
+        base, n = name, 2
+        while name in functions:
+            name = f"{base}#{n}"
+            n += 1
+        return name
+
+    for i, token in enumerate(tokens):
+        value = token.value
+
+        # Blocks
+        if token.kind == "name":
+            if value in ("while", "for"):
+                loop_pending = True
+            elif value == "do":
+                blocks.append(("loop" if loop_pending else "block", None))
+                loop_pending = False
+            elif value == "repeat":
+                blocks.append(("loop", None))
+            elif value == "if":
+                blocks.append(("block", None))
+            elif value in ("end", "until"):
+                if len(blocks) > 1:
+                    blocks.pop()
+
+            elif value == "function":
+                fn = define_function(tokens, i, key, current(), parens, braces, unique)
+                functions[fn.name] = fn
+                blocks.append(("function", fn))
+
+        # Table constructors
+        elif value == "{":
+            name = None
+            if (i >= 2) and tokens[i - 1].value == "=":
+                name, _ = chain_before(tokens, i - 1)
+            elif (i >= 2) and tokens[i - 1].value == "," and tokens[i - 2].kind == "string":
+                name = tokens[i - 2].value.strip("\"'")     # e.g., make_table_once("metatable_actor", {
+            braces.append(name)
+        elif value == "}":
+            if braces:
+                braces.pop()
+
+        # Calls
+        elif value == "(":
+            callee, start = chain_before(tokens, i)
+            if callee and tokens[start - 1].value != "function":
+                parens.append((callee, i, is_cached(tokens, start)))
+            else:
+                parens.append((None, i, False))
+        elif value == ")":
+            if parens:
+                callee, start, cached = parens.pop()
+                if callee:
+                    record_call(current(), callee, tokens, start, i, in_loop(), cached)
+
+    return chunk
+
+
+
+def is_cached(tokens, start):
+    """
+    Returns whether the call starting at `start` is stored in a table by key
+    (e.g., `ancestor_cache[obj_index] = (gm.object_is_ancestor(...) == 1)`)
+    """
+    j = start - 1
+    while (j >= 0) and tokens[j].value == "(":
+        j -= 1
+    return (j >= 1) and (tokens[j].value == "=") and (tokens[j - 1].value == "]")
+
+
+
+def define_function(tokens, i, key, parent, parens, braces, unique):
+    line = tokens[i].line
+    after = tokens[i + 1] if i + 1 < len(tokens) else None
+
+    # `function a.b:c(` or `local function f(`
+    if after and after.kind == "name":
+        j = i + 1
+        parts = []
+        while tokens[j].value != "(":
+            parts.append(tokens[j].value)
+            j += 1
+        name = "".join(parts)
+        if tokens[i - 1].value == "local":
+            name = f"{key}::{name}"
+        return Function(unique(name), key, line, parent)
+
+    # `a.b = function(` or `local f = function(` or `name = function(` in a table constructor
+    if tokens[i - 1].value == "=":
+        target, start = chain_before(tokens, i - 1)
+        if target:
+            if tokens[start - 1].value == "local":
+                target = f"{key}::{target}"
+            elif braces and (tokens[start - 1].value in ("{", ",")) and braces[-1]:
+                target = f"{braces[-1]}.{target}"
+            return Function(unique(target), key, line, parent)
+
+    # Anonymous function passed to a call, e.g., `gm.post_script_hook(..., function(`
+    callee = parens[-1][0] if parens else None
+    fn = Function(unique(f"{parent.name}/{callee or 'function'}"), key, line, parent, anonymous = True)
+
+    if callee in HOOK_CALLS:
+        fn.roots.append(f"hook ({callee})")
+    elif callee in CALLBACK_CALLS:
+        args = [t.value for t in tokens[parens[-1][1]:i]]
+        for j in range(len(args) - 2):
+            if args[j] == "Callback" and args[j + 1] == "." and args[j + 2] in PER_FRAME_CALLBACKS:
+                fn.roots.append(f"callback ({args[j + 2]})")
+    if not fn.roots:
+        parent.nested.append(fn)
+
+    return fn
+
+
+
+def record_call(fn, callee, tokens, start, end, in_loop, cached):
+    args = " ".join(t.value for t in tokens[start + 1:end])
+    line = tokens[start].line
+
+    script = None
+    if callee.startswith("gm.") and callee.count(".") == 1:
+        script = callee[3:]
+        if (script == "call") and (start + 1 < end) and tokens[start + 1].kind == "string":
+            script = tokens[start + 1].value.strip("\"'")
+    elif callee.startswith("GM.") and callee.count(".") == 1:
+        script = callee[3:]
+    elif callee.startswith("GM.SO.") and callee.count(".") == 2:
+        script = callee[6:]
+
+    if script:
+        fn.gm_calls.append({"script": script, "line": line, "in_loop": in_loop, "cached": cached, "args": args})
+    else:
+        fn.calls.append(callee)
+
+
+
+# ========== Analysis ==========
+
+def resolve(functions):
+    """
+    Returns {function name: [names of functions it may call]}
+
+    Chains are matched by qualified name (then as a local in the same file);
+    method calls (`x:name`) match every method with that name
+    """
+    by_method = {}
+    for name, fn in functions.items():
+        if fn.anonymous:
+            continue
+        base = name.split("#")[0]
+        for separator in (":", "."):
+            if separator in base:
+                method = base.rsplit(separator, 1)[1]
+                if separator == ":" or base.startswith("methods_") or ".methods_" in base:
+                    by_method.setdefault(method, []).append(name)
+                break
+
+    edges = {}
+    for name, fn in functions.items():
+        targets = []
+        for callee in fn.calls:
+            if callee.startswith(":"):
+                targets.extend(by_method.get(callee[1:], []))
+            elif callee in functions:
+                targets.append(callee)
+            elif f"{fn.file}::{callee}" in functions:
+                targets.append(f"{fn.file}::{callee}")
+            elif ":" in callee:
+                targets.extend(by_method.get(callee.rsplit(":", 1)[1], []))
+        targets.extend(nested.name for nested in fn.nested)
+        edges[name] = list(dict.fromkeys(targets))
+    return edges
+
+
+
+def mark_hot(functions, edges):
+    """
+    Marks every function reachable from a root with the path to it (breadth-first)
+    """
+    queue = []
+    for name, fn in functions.items():
+        if fn.roots:
+            fn.hot = [name]
+            queue.append(name)
+
+    while queue:
+        name = queue.pop(0)
+        for target in edges[name]:
+            fn = functions[target]
+            if fn.hot is None:
+                fn.hot = functions[name].hot + [target]
+                queue.append(target)
+
+
+
+def memoization_candidates(functions):
+    """
+    Returns hot gm calls that look like they could be cached:
+        * pure      Result only depends on the arguments, and is not stored in a cache table
+        * repeated  Same script with the same arguments more than once in a function
+        * loop      Called inside of a loop
+    """
+    candidates = []
+    for name, fn in functions.items():
+        if fn.hot is None:
+            continue
+
+        seen = {}
+        for call in fn.gm_calls:
+            reasons = []
+            if call["script"].startswith(PURE_PREFIXES) and not call["cached"]:
+                reasons.append("pure")
+            signature = (call["script"], call["args"])
+            if signature in seen:
+                reasons.append("repeated")
+            seen[signature] = True
+            if call["in_loop"]:
+                reasons.append("loop")
+
+            if reasons:
+                candidates.append({
+                    "function"  : name,
+                    "file"      : fn.file,
+                    "line"      : call["line"],
+                    "script"    : call["script"],
+                    "reasons"   : reasons,
+                })
+
+    candidates.sort(key = lambda c: (c["file"], c["line"], c["script"]))
+    return candidates
+
+
+
+def analyze():
+    """
+    Returns the report for the core files that `main.lua` loads
+    """
+    functions = {}
+    files = 0
+
+    # Sources already skip the directories in the `ignore` table of `main.lua`
+    for file_path, _ in sorted(docs_main.find_sources()):
+        key = docs_main.source_key(file_path)
+        with open(file_path, "r", encoding = "utf-8") as f:
+            chunk = scan_file(key, f.read(), functions)
+        functions[chunk.name] = chunk
+        files += 1
+
+    edges = resolve(functions)
+    mark_hot(functions, edges)
+
+    scripts = {}
+    for name, fn in functions.items():
+        for call in fn.gm_calls:
+            script = scripts.setdefault(call["script"], {"calls": 0, "hot_calls": 0, "functions": []})
+            script["calls"] += 1
+            if fn.hot is not None:
+                script["hot_calls"] += 1
+            if name not in script["functions"]:
+                script["functions"].append(name)
+
+    return {
+        "version"       : REPORT_VERSION,
+        "files"         : files,
+        "functions"     : {
+            name: {
+                "file"      : fn.file,
+                "line"      : fn.line,
+                "gm_calls"  : [{k: v for k, v in call.items() if k != "args"} for call in fn.gm_calls],
+                "calls"     : edges[name],
+                "roots"     : fn.roots,
+                "hot_path"  : fn.hot,
+            }
+            for name, fn in sorted(functions.items())
+            if fn.gm_calls or fn.roots or edges[name]
+        },
+        "scripts"       : dict(sorted(scripts.items())),
+        "memoization_candidates" : memoization_candidates(functions),
+        "cached_calls"  : [
+            {"function": name, "file": fn.file, "line": call["line"], "script": call["script"]}
+            for name, fn in sorted(functions.items())
+            for call in fn.gm_calls
+            if call["cached"]
+        ],
+    }
+
+
+
+def compare(old, new):
+    """
+    Returns (script, old hot calls, new hot calls) for every script whose hot call count changed
+    """
+    changes = []
+    for script in sorted(set(old["scripts"]) | set(new["scripts"])):
+        before = old["scripts"].get(script, {}).get("hot_calls", 0)
+        after = new["scripts"].get(script, {}).get("hot_calls", 0)
+        if before != after:
+            changes.append((script, before, after))
+    return changes
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Inventory gm calls on per-frame hot paths of core")
+    parser.add_argument("--output", default = REPORT_PATH, help = "report path (default: docs/artifacts/gm_calls.json)")
+    parser.add_argument("--compare", help = "older report to compare hot gm calls with")
+    parser.add_argument("--top", type = int, default = 15, help = "scripts to list (default: 15)")
+    args = parser.parse_args()
+
+    report = analyze()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok = True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent = 4)
+
+    hot = [name for name, fn in report["functions"].items() if fn["hot_path"]]
+    roots = [name for name, fn in report["functions"].items() if fn["roots"]]
+    print(f"Scanned {report['files']} files: {len(report['functions'])} functions that call or hook something, "
+          f"{len(roots)} hot path roots, {len(hot)} functions on hot paths")
+
+    print("\nMost called gm scripts on hot paths:")
+    ranked = sorted(report["scripts"].items(), key = lambda pair: (-pair[1]["hot_calls"], pair[0]))
+    for script, info in ranked[:args.top]:
+        if info["hot_calls"] > 0:
+            print(f"    {script.ljust(40)} {info['hot_calls']} of {info['calls']} call sites")
+
+    print(f"\n{len(report['memoization_candidates'])} memoization candidates (see {os.path.relpath(args.output)})")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            old = json.load(f)
+        changes = compare(old, report)
+        print(f"\nHot call sites changed since {args.compare}:" if changes else "\nNo hot call site changes")
+        for script, before, after in changes:
+            print(f"    {script.ljust(40)} {before} -> {after}")
+
+
+
+if __name__ == "__main__":
+    main()
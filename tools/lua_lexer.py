@@ -0,0 +1,148 @@
+# Lua Lexer
+# Minimal Lua tokenizer for the build tools
+# (comments, strings, and long brackets are handled the way Lua does)
+
+import re
+
+TOKEN_PATTERN = re.compile(r"""
+      (?P<space>    [ \t\r\f\v]+ )
+    | (?P<newline>  \n )
+    | (?P<long>     --\[=*\[ | \[=*\[ )
+    | (?P<comment>  --[^\n]* )
+    | (?P<name>     [A-Za-z_][A-Za-z0-9_]* )
+    | (?P<number>   0[xX][0-9a-fA-F]*(?:\.[0-9a-fA-F]*)?(?:[pP][+-]?[0-9]+)?[uUlLi]*
+                  | (?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?[uUlLi]* )
+    | (?P<string>   "(?:\\.|\\\n|[^"\\\n])*" | '(?:\\.|\\\n|[^'\\\n])*' )
+    | (?P<op>       \.\.\.|\.\.|==|~=|<=|>=|::|//|<<|>>|[-+*/%^#&~|<>=(){}\[\];:,.] )
+""", re.VERBOSE)
+
+
+
+class Token():
+    """
+    Token of Lua source
+    """
+
+    __slots__ = ("kind", "value", "line")
+
+    def __init__(self, kind, value, line):
+        self.kind = kind    # "name", "number", "string", "op", "comment", "space", or "newline"
+        self.value = value
+        self.line = line
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r}, {self.line})"
+
+
+
+class LexError(Exception):
+    pass
+
+
+
+def tokenize(source, keep_whitespace = False):
+    """
+    Returns the list of tokens of the source;
+    long strings are "string" tokens, and long comments are "comment" tokens
+    """
+    tokens = []
+    pos = 0
+    line = 1
+
+    while pos < len(source):
+        m = TOKEN_PATTERN.match(source, pos)
+        if not m:
+            raise LexError(f"line {line}: unexpected character {source[pos]!r}")
+
+        kind = m.lastgroup
+        value = m.group()
+        end = m.end()
+
+        # Long string or long comment (e.g., [[ ]], --[==[ ]==])
+        if kind == "long":
+            level = value.count("=")
+            close = source.find("]" + "=" * level + "]", end)
+            if close < 0:
+                raise LexError(f"line {line}: unfinished long string or comment")
+            end = close + level + 2
+            value = source[pos:end]
+            kind = "comment" if value.startswith("--") else "string"
+
+        if keep_whitespace or (kind not in ("space", "newline")):
+            tokens.append(Token(kind, value, line))
+
+        line += value.count("\n")
+        pos = end
+
+    return tokens
+
+
+
+def code_tokens(source):
+    """
+    Returns the (kind, value) of every token that is not a comment
+    """
+    return [(t.kind, t.value) for t in tokenize(source) if t.kind != "comment"]
+
+
+
+def strip_comments(source):
+    """
+    Returns the source without comments, blank lines, or trailing whitespace
+    (whitespace inside of strings is kept as is)
+    """
+    out = []
+
+    for token in tokenize(source, keep_whitespace = True):
+        kind, value = token.kind, token.value
+
+        # Keep tokens on either side of a comment apart
+        if kind == "comment":
+            kind, value = ("newline", "\n") if "\n" in value else ("space", " ")
+
+        if kind == "newline":
+            while out and out[-1].isspace() and (out[-1] != "\n"):
+                out.pop()
+            if (not out) or (out[-1] == "\n"):
+                continue
+
+        out.append(value)
+
+    return "".join(out).strip("\n") + "\n"
+
+
+
+ESCAPES = {"a": "\a", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v", "\\": "\\", '"': '"', "'": "'", "\n": "\n"}
+ESCAPE_PATTERN = re.compile(r"\\(?:(\d{1,3})|x([0-9a-fA-F]{2})|u\{([0-9a-fA-F]+)\}|z\s*|(.))", re.DOTALL)
+
+
+
+def string_value(literal):
+    """
+    Returns the value of a string token (quoted or long string)
+    """
+    if literal.startswith("["):
+        level = literal.index("[", 1) - 1
+        value = literal[level + 2:-level - 2]
+        # A newline right after the opening bracket is skipped
+        if value.startswith("\r\n"):
+            return value[2:]
+        return value[1:] if value.startswith("\n") else value
+
+    def escape(m):
+        decimal, hex, codepoint, char = m.groups()
+        if decimal:
+            if int(decimal) > 255:
+                raise LexError(f"escape \\{decimal} is too large")
+            return chr(int(decimal))
+        if hex:
+            return chr(int(hex, 16))
+        if codepoint:
+            return chr(int(codepoint, 16))
+        if char is None:
+            return ""   # \z skips the whitespace after it
+        if char not in ESCAPES:
+            raise LexError(f"invalid escape \\{char}")
+        return ESCAPES[char]
+
+    return ESCAPE_PATTERN.sub(escape, literal[1:-1])
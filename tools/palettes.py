@@ -0,0 +1,388 @@
+# Palette extraction
+# Builds the survivor palettes in `core/sprites/*_palettes` from sprite strips
+# exported by `core/unused/palette_strips.lua` (replaces the in-game palette generator)
+#
+# Each palette has one row per color of the default sprite that differs in
+# any alt sprite: the default color, followed by its color in each alt
+# (`_PAL1`, `_PAL2`, ..., with `_PROV` as the last column)
+#
+# Usage:
+#   python tools/palettes.py build <strips>             Write the palettes of every survivor
+#   python tools/palettes.py build <strips> --check     Compare against the palettes in core/sprites instead
+#   python tools/palettes.py synth <strips>             Write strips that reproduce the current palettes (for trying out the tool)
+#
+# NumPy is used if it is installed (it is much faster for large strips)
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+global ROOT_PATH; ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+sys.path.insert(0, os.path.join(ROOT_PATH, "docs"))
+import png
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+global SPRITES_PATH; SPRITES_PATH = os.path.join(ROOT_PATH, "core", "sprites")
+
+# Survivor identifier -> (loadout sprite name, portrait sprite name)
+# `None` if there is no such palette (Drifter's loadout palette is made by hand,
+# and Sniper has no portrait palette)
+SURVIVORS = {
+    "commando"  : ("Commando", "Commando"),
+    "huntress"  : ("Huntress", "Huntress"),
+    "enforcer"  : ("Enforcer", "Enforcer"),
+    "bandit"    : ("Bandit", "Bandit"),
+    "hand"      : ("HAND", "HAND"),
+    "engineer"  : ("Engi", "Engi"),
+    "miner"     : ("Miner", "Miner"),
+    "sniper"    : ("Sniper", None),
+    "acrid"     : ("Acrid", "Acrid"),
+    "mercenary" : ("Mercenary", "Merc"),
+    "loader"    : ("Loader", "Loader"),
+    "chef"      : ("Chef", "Chef"),
+    "pilot"     : ("Pilot", "Pilot"),
+    "arti"      : ("Arti", "Arti"),
+    "drifter"   : (None, "Drifter"),
+    "robomando" : ("Robomando", "Robomando"),
+}
+
+# Kind -> (sprite name format, palette directory, palette filename format)
+KINDS = {
+    "loadout"   : ("sSelect{}", "loadout_palettes", "{}PaletteLoadout.png"),
+    "portrait"  : ("s{}Portrait", "portrait_palettes", "{}PalettePortrait.png"),
+}
+
+# Sprites whose last `_PAL` alt is unused
+UNUSED_LAST_ALT = {"sSelectEngi"}
+
+
+
+class PaletteError(Exception):
+    pass
+
+
+
+# ========== Strips ==========
+
+def strip_path(strips, name):
+    return os.path.join(strips, name + ".png")
+
+
+
+def alt_names(strips, name):
+    """
+    Returns the names of the alt sprites of a sprite, in palette column order
+    """
+    count = 1
+    while os.path.isfile(strip_path(strips, f"{name}_PAL{count}")):
+        count += 1
+    if name in UNUSED_LAST_ALT:
+        count -= 1
+    return [f"{name}_PAL{i}" for i in range(1, count)] + [f"{name}_PROV"]
+
+
+
+def read_pixels(path):
+    """
+    Returns (width, height, RGBA bytes) of a PNG
+    """
+    try:
+        with open(path, "rb") as f:
+            image = png.decode(f.read())
+        return image.width, image.height, png.to_rgba(image)
+    except OSError as e:
+        raise PaletteError(f"Could not read {path} ({e.strerror})")
+    except png.PNGError as e:
+        raise PaletteError(f"Could not decode {path} ({e})")
+
+
+
+def write_pixels(path, width, height, rgba):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "wb") as f:
+        f.write(png.optimize(png.encode(png.from_rgba(width, height, rgba))))
+
+
+
+# ========== Extraction ==========
+
+def extract(default, alts):
+    """
+    Returns the palette rows of a default strip and its alt strips
+    (RGBA bytes of the same size), as lists of 0xRRGGBB colors
+
+    Colors are matched the way the game reads surfaces (by RGB, with
+    transparent pixels as black), each at the first pixel it appears on,
+    and rows are in the order their colors first appear
+    """
+    for alt in alts:
+        if len(alt) != len(default):
+            raise PaletteError("alt strip is not the same size as the default strip")
+    if numpy:
+        return extract_numpy(default, alts)
+    return extract_python(default, alts)
+
+
+
+def extract_numpy(default, alts):
+    def colors(rgba):
+        pixels = numpy.frombuffer(rgba, dtype = numpy.uint8).reshape(-1, 4).astype(numpy.uint32)
+        packed = (pixels[:, 0] << 16) | (pixels[:, 1] << 8) | pixels[:, 2]
+        packed[pixels[:, 3] == 0] = 0
+        return packed
+
+    base = colors(default)
+    unique, first = numpy.unique(base, return_index = True)
+    order = numpy.argsort(first)
+    first = first[order]
+
+    table = numpy.stack([unique[order]] + [colors(alt)[first] for alt in alts], axis = 1)
+    changed = (table[:, 1:] != table[:, :1]).any(axis = 1)
+    return table[changed].tolist()
+
+
+
+def extract_python(default, alts):
+    def colors(rgba):
+        return [(rgba[i] << 16 | rgba[i + 1] << 8 | rgba[i + 2]) if rgba[i + 3] else 0 for i in range(0, len(rgba), 4)]
+
+    first = {}
+    for pos, color in enumerate(colors(default)):
+        if color not in first:
+            first[color] = pos
+
+    columns = [colors(alt) for alt in alts]
+    rows = []
+    for color, pos in first.items():
+        row = [color] + [column[pos] for column in columns]
+        if any(alt != color for alt in row[1:]):
+            rows.append(row)
+    return rows
+
+
+
+def encode_rows(rows):
+    """
+    Returns (width, height, RGBA bytes) of palette rows
+    """
+    rgba = bytearray()
+    for row in rows:
+        for color in row:
+            rgba += bytes([color >> 16 & 0xFF, color >> 8 & 0xFF, color & 0xFF, 0xFF])
+    return (len(rows[0]) if rows else 0), len(rows), bytes(rgba)
+
+
+
+def decode_rows(width, height, rgba):
+    rows = []
+    for y in range(height):
+        row = rgba[y * width * 4:(y + 1) * width * 4]
+        rows.append([row[i] << 16 | row[i + 1] << 8 | row[i + 2] for i in range(0, len(row), 4)])
+    return rows
+
+
+
+def compare(rows, expected):
+    """
+    Returns a list of the differences between two palettes
+    (rows are matched by default color, since the order of
+    the rows of the palettes made in-game is arbitrary)
+    """
+    problems = []
+    if rows and expected and (len(rows[0]) != len(expected[0])):
+        return [f"{len(rows[0]) - 1} alts instead of {len(expected[0]) - 1}"]
+
+    mapping = {row[0]: row[1:] for row in rows}
+    expected_mapping = {row[0]: row[1:] for row in expected}
+    for color in expected_mapping.keys() - mapping.keys():
+        problems.append(f"missing #{color:06X}")
+    for color in mapping.keys() - expected_mapping.keys():
+        problems.append(f"extra #{color:06X}")
+    for color in mapping.keys() & expected_mapping.keys():
+        if mapping[color] != expected_mapping[color]:
+            alts = " ".join(f"#{alt:06X}" for alt in mapping[color])
+            expected_alts = " ".join(f"#{alt:06X}" for alt in expected_mapping[color])
+            problems.append(f"#{color:06X} -> {alts} instead of {expected_alts}")
+    return sorted(problems)
+
+
+
+# ========== Jobs ==========
+
+def find_jobs(kinds, survivors):
+    """
+    Returns a list of (kind, survivor, sprite name, palette path)
+    """
+    jobs = []
+    for survivor in survivors:
+        if survivor not in SURVIVORS:
+            raise PaletteError(f"Unknown survivor '{survivor}' (known: {', '.join(SURVIVORS)})")
+        for kind in kinds:
+            sprite_format, dir, palette_format = KINDS[kind]
+            char = SURVIVORS[survivor][list(KINDS).index(kind)]
+            if char:
+                jobs.append((kind, survivor, sprite_format.format(char), os.path.join(dir, palette_format.format(survivor))))
+    return jobs
+
+
+
+def build(task):
+    """
+    Builds one palette, and writes or checks it;
+    returns (palette path, list of problems, seconds)
+    """
+    strips, out, check, (kind, survivor, name, palette) = task
+    start = time.perf_counter()
+
+    default_path = strip_path(strips, name)
+    if not os.path.isfile(default_path):
+        return palette, [f"no strip {os.path.basename(default_path)}"], 0.0
+
+    try:
+        width, height, default = read_pixels(default_path)
+        alts = []
+        for alt_name in alt_names(strips, name):
+            alt_width, alt_height, alt = read_pixels(strip_path(strips, alt_name))
+            if (alt_width, alt_height) != (width, height):
+                raise PaletteError(f"{alt_name} is {alt_width}x{alt_height}, but {name} is {width}x{height}")
+            alts.append(alt)
+        rows = extract(default, alts)
+
+        path = os.path.join(out, palette)
+        if check:
+            problems = compare(rows, decode_rows(*read_pixels(path)))
+        else:
+            write_pixels(path, *encode_rows(rows))
+            problems = []
+    except PaletteError as e:
+        problems = [str(e)]
+
+    return palette, problems, time.perf_counter() - start
+
+
+
+def run_jobs(tasks, jobs):
+    if jobs > 1 and len(tasks) > 1:
+        with multiprocessing.Pool(min(jobs, len(tasks))) as pool:
+            return pool.map(build, tasks)
+    return [build(task) for task in tasks]
+
+
+
+# ========== Synthetic Strips ==========
+
+def synthesize(strips, out, jobs, seed):
+    """
+    Writes strips that the current palettes would be extracted from:
+    every default color of a palette on a shuffled strip with unchanging
+    colors and transparent pixels, and one alt strip per palette column
+    """
+    rng = random.Random(seed)
+    for kind, survivor, name, palette in jobs:
+        rows = decode_rows(*read_pixels(os.path.join(out, palette)))
+        if not rows:
+            continue
+        defaults = {row[0] for row in rows}
+
+        # Pixels are (default color, index of the palette row or `None` if unchanging)
+        pixels = [(row[0], i) for i, row in enumerate(rows)]
+        while len(pixels) < len(rows) + 16:
+            color = rng.randrange(0x1000000)
+            if color not in defaults:
+                pixels.append((color, None))
+                defaults.add(color)
+        if 0 not in defaults:
+            pixels += [(None, None)] * 8
+        pixels *= 2
+        rng.shuffle(pixels)
+
+        width = 16
+        height = -(-len(pixels) // width)
+        pixels += [(None, None)] * (width * height - len(pixels))
+
+        def strip(column):
+            rgba = bytearray()
+            for color, i in pixels:
+                if color is None:
+                    rgba += b"\0\0\0\0"
+                else:
+                    color = rows[i][column] if i is not None else color
+                    rgba += bytes([color >> 16 & 0xFF, color >> 8 & 0xFF, color & 0xFF, 0xFF])
+            return bytes(rgba)
+
+        # (alt name, palette column); an unused alt is not in the palette, so it is left unchanged
+        columns = len(rows[0])
+        alts = [(f"{name}_PAL{i}", i) for i in range(1, columns - 1)]
+        if name in UNUSED_LAST_ALT:
+            alts.append((f"{name}_PAL{columns - 1}", 0))
+        alts.append((f"{name}_PROV", columns - 1))
+
+        write_pixels(strip_path(strips, name), width, height, strip(0))
+        for alt, column in alts:
+            write_pixels(strip_path(strips, alt), width, height, strip(column))
+        print(f"Wrote {name} ({len(alts)} alts)")
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Build survivor palettes from sprite strips")
+    subparsers = parser.add_subparsers(dest = "command", required = True)
+
+    build_parser = subparsers.add_parser("build", help = "build the palettes from strips")
+    build_parser.add_argument("strips", help = "directory of strips exported by core/unused/palette_strips.lua")
+    build_parser.add_argument("--check", action = "store_true", help = "compare against the existing palettes instead of writing them")
+    build_parser.add_argument("--out", default = SPRITES_PATH, help = "directory of the palette directories")
+    build_parser.add_argument("-j", "--jobs", type = int, default = os.cpu_count() or 1)
+
+    synth_parser = subparsers.add_parser("synth", help = "write strips that reproduce the current palettes")
+    synth_parser.add_argument("strips")
+    synth_parser.add_argument("--seed", type = int, default = 0)
+
+    for subparser in (build_parser, synth_parser):
+        subparser.add_argument("--kinds", nargs = "+", choices = list(KINDS), default = list(KINDS))
+        subparser.add_argument("--survivors", nargs = "+", default = list(SURVIVORS))
+
+    args = parser.parse_args()
+
+    try:
+        jobs = find_jobs(args.kinds, args.survivors)
+        match args.command:
+
+            case "build":
+                start = time.perf_counter()
+                results = run_jobs([(args.strips, args.out, args.check, job) for job in jobs], args.jobs)
+                failed = 0
+                for palette, problems, seconds in results:
+                    status = "ok" if not problems else f"{len(problems)} problem(s)"
+                    print(f"{palette:<48}{seconds * 1000:>9.1f} ms  {status}")
+                    for problem in problems[:10]:
+                        print(f"    {problem}")
+                    if len(problems) > 10:
+                        print(f"    ... and {len(problems) - 10} more")
+                    failed += bool(problems)
+
+                action = "Checked" if args.check else "Built"
+                print(f"\n{action} {len(results)} palettes in {time.perf_counter() - start:.2f} s ({'NumPy' if numpy else 'pure Python'})")
+                if failed:
+                    print(f"{failed} palette(s) failed")
+                    sys.exit(1)
+
+            case "synth":
+                synthesize(args.strips, SPRITES_PATH, jobs, args.seed)
+
+    except PaletteError as e:
+        print(e)
+        sys.exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# Profile report
+# Analyzes dumps written by `core/unused/profiler.lua`:
+# ranks the hottest `gm` scripts and calling files, and compares two runs
+#
+# Usage:
+#   python tools/profile_report.py report <dump> [<dump> ...]      Hottest calls (dumps are joined)
+#   python tools/profile_report.py diff <base> <compare>            Change in calls per frame between two runs
+#   python tools/profile_report.py synth <out> [--frames N]         Write a synthetic dump (for trying out the report)
+
+import argparse
+import json
+import random
+import sys
+
+HEADER = "rapi-profile 1"
+
+GROUPS = {
+    "script"    : lambda site: site[0],
+    "file"      : lambda site: site[1],
+    "site"      : lambda site: f"{site[0]} @ {site[1]}",
+}
+
+PERCENTILES = [50, 90, 99]
+
+
+
+class DumpError(Exception):
+    pass
+
+
+
+class Run():
+    """
+    Calls per frame of a profiled run
+    """
+
+    def __init__(self):
+        self.sites = {}     # call site ID -> (script, file)
+        self.frames = []    # {call site ID: calls} for each frame
+
+
+    def extend(self, other):
+        """
+        Appends the frames of another run
+        (its call site IDs are remapped to the IDs of this run)
+        """
+        ids = {site: id for id, site in self.sites.items()}
+        remap = {}
+        for id, site in other.sites.items():
+            if site not in ids:
+                ids[site] = len(self.sites) + 1
+                self.sites[ids[site]] = site
+            remap[id] = ids[site]
+
+        for frame in other.frames:
+            self.frames.append({remap[id]: n for id, n in frame.items()})
+
+
+
+def read_dump(path):
+    """
+    Returns the Run of a dump file
+    A truncated last line (e.g., the game closed mid-write) is ignored
+    """
+    run = Run()
+
+    with open(path, "r", encoding = "utf-8") as f:
+        lines = f.read().split("\n")
+
+    if lines[0] != HEADER:
+        raise DumpError(f"{path}: not a profiler dump (expected '{HEADER}')")
+
+    for i in range(1, len(lines)):
+        line = lines[i]
+        if not line:
+            continue
+
+        try:
+            # New call site
+            if line.startswith("k "):
+                _, id, script, file = line.split(" ", 3)
+                run.sites[int(id)] = (script, file)
+
+            # Frame
+            else:
+                frame = {}
+                for pair in line.split(" ")[1:]:
+                    id, n = pair.split(":")
+                    frame[int(id)] = int(n)
+                run.frames.append(frame)
+
+        except ValueError:
+            if i >= len(lines) - 2:
+                break
+            raise DumpError(f"{path}:{i + 1}: malformed record '{line}'")
+
+    return run
+
+
+
+# ========== Statistics ==========
+
+def percentile(values, p):
+    """
+    Returns the p-th percentile of the values (linear interpolation between ranks)
+    """
+    if not values:
+        return 0
+    values = sorted(values)
+    rank = (len(values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+
+def summarize(values):
+    summary = {
+        "total" : sum(values),
+        "mean"  : (sum(values) / len(values)) if values else 0,
+        "max"   : max(values, default = 0),
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}"] = percentile(values, p)
+    return summary
+
+
+
+def per_frame(run, by):
+    """
+    Returns {key: [calls in each frame]}, grouping call sites by "script", "file", or "site"
+    """
+    group = GROUPS[by]
+    keys = {id: group(site) for id, site in run.sites.items()}
+
+    series = {key: [0] * len(run.frames) for key in keys.values()}
+    for i, frame in enumerate(run.frames):
+        for id, n in frame.items():
+            series[keys[id]][i] += n
+    return series
+
+
+
+def report(run, by = "script", top = 20):
+    """
+    Returns the summary of the run, with the `top` hottest keys by calls per frame
+    """
+    series = per_frame(run, by)
+    ranked = sorted(series.items(), key = lambda pair: (-sum(pair[1]), pair[0]))
+
+    return {
+        "frames"    : len(run.frames),
+        "by"        : by,
+        "all"       : summarize([sum(frame.values()) for frame in run.frames]),
+        "top"       : [dict(name = key, **summarize(values)) for key, values in ranked[:top]],
+    }
+
+
+
+def diff(base, compare, by = "script", top = 20):
+    """
+    Returns the change in mean calls per frame of each key from `base` to `compare`,
+    largest changes first
+    """
+    base_series = per_frame(base, by)
+    compare_series = per_frame(compare, by)
+
+    def mean(series, key):
+        values = series.get(key)
+        return (sum(values) / len(values)) if values else 0
+
+    changes = []
+    for key in set(base_series) | set(compare_series):
+        before, after = mean(base_series, key), mean(compare_series, key)
+        changes.append({
+            "name"      : key,
+            "base"      : before,
+            "compare"   : after,
+            "change"    : after - before,
+            "percent"   : ((after - before) / before * 100) if before else None,
+        })
+    changes.sort(key = lambda change: (-abs(change["change"]), change["name"]))
+
+    base_all = summarize([sum(frame.values()) for frame in base.frames])
+    compare_all = summarize([sum(frame.values()) for frame in compare.frames])
+    return {
+        "by"        : by,
+        "base"      : base_all,
+        "compare"   : compare_all,
+        "changes"   : changes[:top],
+    }
+
+
+
+# ========== Synthetic Dumps ==========
+
+def synthesize(path, frames = 600, seed = 0, scale = 1.0):
+    """
+    Writes a dump of a made-up run, with a few hot scripts and many cold ones;
+    `scale` multiplies the calls of the hottest script (e.g., to fake a caching change)
+    """
+    rng = random.Random(seed)
+    files = ["Instance.lua", "Hook.lua", "Global.lua", "Actor.lua", "Item.lua", "Callback.lua"]
+    scripts = ["variable_global_get", "instance_exists", "array_get", "variable_instance_get",
+               "object_is_ancestor", "actor_is_alive", "ds_list_size", "item_count"]
+
+    sites = [(script, rng.choice(files)) for script in scripts for _ in range(2)]
+    rates = [40 / (i + 1) for i in range(len(sites))]     # Calls per frame, by rank
+
+    # Every call site of the hottest script is scaled
+    rates = [rate * scale if script == scripts[0] else rate for rate, (script, _) in zip(rates, sites)]
+
+    lines = [HEADER]
+    for i, (script, file) in enumerate(sites):
+        lines.append(f"k {i + 1} {script} {file}")
+    for frame in range(frames):
+        record = [str(frame)]
+        for i, rate in enumerate(rates):
+            n = max(0, round(rng.gauss(rate, rate / 4)))
+            if n > 0:
+                record.append(f"{i + 1}:{n}")
+        lines.append(" ".join(record))
+
+    with open(path, "w", encoding = "utf-8", newline = "\n") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+
+# ========== Output ==========
+
+def format_number(n):
+    if n is None:
+        return "-"
+    return f"{n:.2f}" if isinstance(n, float) else str(n)
+
+
+
+def print_table(header, rows):
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(str(cell).ljust(widths[i]) if i == 0 else str(cell).rjust(widths[i]) for i, cell in enumerate(row)))
+
+
+
+def print_report(result):
+    summary = result["all"]
+    print(f"{result['frames']} frames; gm calls per frame: mean {format_number(summary['mean'])}, "
+          + ", ".join(f"p{p} {format_number(summary[f'p{p}'])}" for p in PERCENTILES)
+          + f", max {summary['max']}\n")
+
+    stats = ["total", "mean"] + [f"p{p}" for p in PERCENTILES] + ["max"]
+    print_table([result["by"]] + stats, [[row["name"]] + [format_number(row[stat]) for stat in stats] for row in result["top"]])
+
+
+
+def print_diff(result):
+    print(f"gm calls per frame: {format_number(result['base']['mean'])} -> {format_number(result['compare']['mean'])}\n")
+    rows = []
+    for change in result["changes"]:
+        percent = change["percent"]
+        rows.append([change["name"], format_number(change["base"]), format_number(change["compare"]),
+                     f"{change['change']:+.2f}", "new" if percent is None else f"{percent:+.1f}%"])
+    print_table([result["by"], "base", "compare", "change", "%"], rows)
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Analyze dumps of core/unused/profiler.lua")
+    subparsers = parser.add_subparsers(dest = "command", required = True)
+
+    report_parser = subparsers.add_parser("report", help = "rank the hottest calls of one or more dumps")
+    report_parser.add_argument("dumps", nargs = "+")
+
+    diff_parser = subparsers.add_parser("diff", help = "compare calls per frame of two dumps")
+    diff_parser.add_argument("base")
+    diff_parser.add_argument("compare")
+
+    for sub in (report_parser, diff_parser):
+        sub.add_argument("--by", choices = list(GROUPS), default = "script", help = "group calls by script, calling file, or both (default: script)")
+        sub.add_argument("--top", type = int, default = 20, help = "rows to show (default: 20)")
+        sub.add_argument("--json", action = "store_true", help = "print JSON instead of a table")
+
+    synth_parser = subparsers.add_parser("synth", help = "write a synthetic dump")
+    synth_parser.add_argument("out")
+    synth_parser.add_argument("--frames", type = int, default = 600)
+    synth_parser.add_argument("--seed", type = int, default = 0)
+    synth_parser.add_argument("--scale", type = float, default = 1.0, help = "multiplier for the calls of the hottest script")
+
+    args = parser.parse_args()
+
+    try:
+        match args.command:
+
+            case "report":
+                run = read_dump(args.dumps[0])
+                for path in args.dumps[1:]:
+                    run.extend(read_dump(path))
+                result = report(run, args.by, args.top)
+                if args.json:   print(json.dumps(result, indent = 4))
+                else:           print_report(result)
+
+            case "diff":
+                result = diff(read_dump(args.base), read_dump(args.compare), args.by, args.top)
+                if args.json:   print(json.dumps(result, indent = 4))
+                else:           print_diff(result)
+
+            case "synth":
+                synthesize(args.out, args.frames, args.seed, args.scale)
+                print(f"Wrote {args.frames} frames to {args.out}")
+
+    except DumpError as e:
+        print(e)
+        sys.exit(1)
+
+
+
+if __name__ == "__main__":
+    main()